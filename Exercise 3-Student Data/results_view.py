@@ -0,0 +1,109 @@
+import tkinter as tk
+
+from instrument import count, span  # StudentData puts the repository root on sys.path
+
+ROW_LINES = 8   # Lines taken by one student_to_string block
+OVERSCAN = 2    # Extra rows rendered below the visible window
+
+
+# ------------------ RESULTS VIEW ------------------
+
+class ResultsView(tk.Frame):
+    """Read-only text area that only formats the rows currently on screen.
+
+    `show_rows` takes a row count and a function that formats one row, so
+    the roster is never turned into one big string. Scrolling moves a row
+    offset and re-renders the visible window (plus a small overscan). A
+    footer line under the text stays fixed while the rows scroll.
+    """
+
+    def __init__(self, master, width=65, height=30, font=("Segoe UI", 11)):
+        super().__init__(master)
+
+        self.text = tk.Text(self, width=width, height=height, bd=2, relief="groove",
+                            font=font, wrap="word")
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.footer = tk.Label(self, anchor="w", font=(font[0], font[1], "bold"))
+
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.footer.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(5, 0))
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.text.bind(sequence, self.on_wheel)
+
+        self.visible_rows = max(1, height // ROW_LINES)
+        self.count = 0
+        self.first = 0
+        self.row_text = None
+        self.show_text("")
+
+    # ------------------ CONTENT ------------------
+
+    def show_rows(self, count, row_text, footer=""):
+        """Display `count` rows, formatting row i with row_text(i) when it is on screen"""
+        self.count = count
+        self.row_text = row_text
+        self.first = 0
+        self.footer.config(text=footer)
+        self.render()
+
+    def show_text(self, text, footer=""):
+        """Display a fixed block of text with no virtual rows"""
+        self.count = 0
+        self.row_text = None
+        self.first = 0
+        self.footer.config(text=footer)
+        self.set_text(text)
+        self.scrollbar.set(0, 1)
+
+    def render(self):
+        last = min(self.count, self.first + self.visible_rows + OVERSCAN)
+        with span("students.render"):
+            self.set_text("".join(self.row_text(row) for row in range(self.first, last)))
+        count("students.rendered_rows", last - self.first)
+
+        if self.count:
+            self.scrollbar.set(self.first / self.count,
+                               min(1, (self.first + self.visible_rows) / self.count))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def set_text(self, text):
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", text)
+        self.text.yview_moveto(0)
+        self.text.config(state="disabled")
+
+    def set_colors(self, bg, fg, footer_bg):
+        self.configure(bg=footer_bg)
+        self.text.configure(bg=bg, fg=fg, insertbackground=fg)
+        self.footer.configure(bg=footer_bg, fg=fg)
+
+    # ------------------ SCROLLING ------------------
+
+    def scroll_to(self, first):
+        first = max(0, min(first, self.count - self.visible_rows))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if self.row_text is None:
+            return
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.count))
+        elif unit == "pages":
+            self.scroll_to(self.first + int(amount) * self.visible_rows)
+        else:
+            self.scroll_to(self.first + int(amount))
+
+    def on_wheel(self, event):
+        if self.row_text is None:
+            return None
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first - 1)
+        else:
+            self.scroll_to(self.first + 1)
+        return "break"
@@ -0,0 +1,431 @@
+"""Storage backends for student records.
+
+Every backend has the same methods, so the app and student_core don't
+care how records are kept on disk:
+
+    iter_batches(report)     (positions, records) batches, as iter_student_batches
+    iter_edits()             lists of journalled edits to apply after the batches
+    load(report)             the whole roster as a StudentStore, edits applied
+    open(students)           start saving edits to a loaded roster one at a time
+    put(students, sid)       save an added or changed student
+    put_many(students, sids) save many students in one write
+    delete(students, sid)    save a removal
+    get(sid)                 one student as a dict, or None
+    save(students)           replace everything on disk with `students`
+    needs_snapshot()         True when the edits so far should be folded into a snapshot
+    snapshot(columns)        write one from copied (ids, names, cw1, cw2, cw3, exam)
+    close()
+
+Only save() rewrites the whole roster; put() and delete() cost the same
+however many students there are. A text backend opened with
+defer_snapshots=True never rewrites the file by itself: put() and
+delete() only append to the journal and whoever owns the roster is asked
+for a snapshot through needs_snapshot(). Together with iter_edits(),
+which only parses the journal, that lets a worker thread load and save
+without ever touching a roster the Tk thread is changing; open(None) is
+fine there.
+"""
+import mmap
+import os
+import sqlite3
+import struct
+
+from student_journal import StudentJournal, apply_edits, copy_columns, write_snapshot
+from student_loader import BATCH_SIZE, LoadReport, add_batch, iter_student_batches
+from student_store import CW_MAX, EXAM_MAX, StudentStore, check_id, check_marks
+
+
+def load_all(backend, report=None):
+    students = StudentStore()
+    if report is None:
+        report = LoadReport()
+    for batch in backend.iter_batches(report):
+        add_batch(students, batch, report)
+    return students
+
+
+# ------------------ TEXT ------------------
+
+class TextBackend:
+    """The original 'count header + id,name,cw1,cw2,cw3,exam' text file.
+
+    Edits go to a StudentJournal next to the file (or, with journal=False,
+    rewrite the whole file every time).
+    """
+
+    def __init__(self, path, journal=True, defer_snapshots=False):
+        self.path = path
+        self.defer_snapshots = defer_snapshots
+        self.journal = StudentJournal(path) if journal else None
+        self.students = None
+        self.dirty = False  # Edits waiting for a deferred snapshot (journal=False)
+
+    def iter_batches(self, report):
+        return iter_student_batches(self.path, report=report)
+
+    def iter_edits(self):
+        """Edits journalled since the last snapshot, read without touching any roster"""
+        if self.journal is None:
+            return iter(())
+        return self.journal.iter_edits()
+
+    def load(self, report=None):
+        students = load_all(self, report)
+        for edits in self.iter_edits():
+            apply_edits(students, edits)
+        return students
+
+    def open(self, students):
+        """`students` must already hold iter_edits(); the journal is not replayed again"""
+        self.students = students
+        if self.journal is not None:
+            self.journal.open()
+            if self.journal.recovering and not self.defer_snapshots:
+                self.journal.compact(copy_columns(students))
+
+    def put(self, students, sid):
+        if self.journal is not None:
+            self.journal.record_put(students.get(sid))
+        self._edited(students)
+
+    def put_many(self, students, sids):
+        if self.journal is not None:
+            self.journal.record_puts(map(students.get, sids))
+        self._edited(students)
+
+    def delete(self, students, sid):
+        if self.journal is not None:
+            self.journal.record_delete(sid)
+        self._edited(students)
+
+    def _edited(self, students):
+        if self.defer_snapshots:
+            self.dirty = self.journal is None
+        elif self.journal is None:
+            self.save(students)
+        else:
+            self.journal.maybe_compact(students)
+
+    def needs_snapshot(self):
+        if self.journal is None:
+            return self.dirty
+        return self.journal.should_compact()
+
+    def snapshot(self, columns):
+        if self.journal is None:
+            write_snapshot(self.path, columns)
+            self.dirty = False
+        else:
+            self.journal.compact(columns)
+
+    def get(self, sid):
+        """Only answers once a roster is open: the text file has no index to search"""
+        return None if self.students is None else self.students.get(sid)
+
+    def save(self, students):
+        reopen = self.journal is not None and self.journal.file is not None
+        if reopen:
+            self.journal.close()
+        write_snapshot(self.path, students.columns())
+        # The snapshot now holds every journalled edit
+        for path in (self.path + ".journal.old", self.path + ".journal"):
+            if os.path.exists(path):
+                os.remove(path)
+        if reopen:
+            self.journal.open()
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+
+
+# ------------------ SQLITE ------------------
+
+PERCENT_SQL = "round((cw1 + cw2 + cw3 + exam) * 100.0 / 160, 2)"
+COLUMNS_SQL = "id, name, cw1, cw2, cw3, exam"
+
+INDEX_SQL = f"CREATE INDEX IF NOT EXISTS students_percentage ON students ({PERCENT_SQL})"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS students (
+    id   INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    cw1  INTEGER NOT NULL CHECK (cw1 BETWEEN 0 AND {CW_MAX}),
+    cw2  INTEGER NOT NULL CHECK (cw2 BETWEEN 0 AND {CW_MAX}),
+    cw3  INTEGER NOT NULL CHECK (cw3 BETWEEN 0 AND {CW_MAX}),
+    exam INTEGER NOT NULL CHECK (exam BETWEEN 0 AND {EXAM_MAX})
+);
+{INDEX_SQL};
+"""
+
+
+def record_dict(record):
+    sid, name, c1, c2, c3, exam = record
+    return {"id": sid, "name": name, "cw1": c1, "cw2": c2, "cw3": c3,
+            "cw": c1 + c2 + c3, "exam": exam}
+
+
+class SqliteBackend:
+    """A SQLite database: id is the primary key and percentage has an expression index.
+
+    Each put or delete is its own small transaction. The database runs in
+    WAL mode, so a commit appends to the log instead of rewriting pages.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def iter_batches(self, report):
+        cursor = self.db.execute(f"SELECT {COLUMNS_SQL} FROM students ORDER BY id")
+        position = 0
+        while True:
+            records = cursor.fetchmany(BATCH_SIZE)
+            if not records:
+                return
+            report.rows += len(records)
+            yield range(position, position + len(records)), records
+            position += len(records)
+
+    def iter_edits(self):
+        return iter(())  # Edits are saved in place, never journalled
+
+    def load(self, report=None):
+        return load_all(self, report)
+
+    def open(self, students):
+        pass
+
+    def put(self, students, sid):
+        s = students.get(sid)
+        with self.db:
+            self.db.execute(f"INSERT OR REPLACE INTO students ({COLUMNS_SQL}) VALUES (?, ?, ?, ?, ?, ?)",
+                            (s["id"], s["name"], s["cw1"], s["cw2"], s["cw3"], s["exam"]))
+
+    def put_many(self, students, sids):
+        rows = [(s["id"], s["name"], s["cw1"], s["cw2"], s["cw3"], s["exam"])
+                for s in map(students.get, sids)]
+        with self.db:
+            self.db.executemany(f"INSERT OR REPLACE INTO students ({COLUMNS_SQL}) "
+                                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def delete(self, students, sid):
+        with self.db:
+            self.db.execute("DELETE FROM students WHERE id = ?", (sid,))
+
+    def get(self, sid):
+        record = self.db.execute(f"SELECT {COLUMNS_SQL} FROM students WHERE id = ?", (sid,)).fetchone()
+        return None if record is None else record_dict(record)
+
+    def top(self, n, lowest=False):
+        """The n best (or worst) students by percentage, read through the index"""
+        order = "ASC" if lowest else "DESC"
+        cursor = self.db.execute(f"SELECT {COLUMNS_SQL} FROM students "
+                                 f"ORDER BY {PERCENT_SQL} {order} LIMIT ?", (n,))
+        return [record_dict(record) for record in cursor]
+
+    def save(self, students):
+        # Loading in id order and building the percentage index afterwards
+        # is much faster than keeping both b-trees up to date row by row.
+        # One explicit transaction, so a crash leaves the old table intact
+        # (executescript() would commit halfway).
+        self.db.execute("BEGIN")
+        try:
+            self.db.execute("DROP INDEX IF EXISTS students_percentage")
+            self.db.execute("DELETE FROM students")
+            self.db.executemany(f"INSERT INTO students ({COLUMNS_SQL}) VALUES (?, ?, ?, ?, ?, ?)",
+                                sorted(zip(*students.columns())))
+            self.db.execute(INDEX_SQL)
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+
+    def needs_snapshot(self):
+        return False
+
+    def snapshot(self, columns):
+        pass
+
+    def close(self):
+        self.db.close()
+
+
+# ------------------ BINARY ------------------
+
+BINARY_MAGIC = b"STB1"
+BINARY_HEADER = struct.Struct("<4sI")       # magic, slots in use
+RECORD = struct.Struct("<iBBBBB55s")        # id, live flag, cw1, cw2, cw3, exam, UTF-8 name
+NAME_BYTES = 55
+
+
+def pack_record(s):
+    name = s["name"].encode("utf-8")
+    if len(name) > NAME_BYTES:
+        raise ValueError(f"Names are limited to {NAME_BYTES} bytes in the binary format.")
+    return RECORD.pack(s["id"], 1, s["cw1"], s["cw2"], s["cw3"], s["exam"], name)
+
+
+class BinaryBackend:
+    """Fixed-width 64-byte records that are memory-mapped to load.
+
+    Because every record is the same size, a student is saved by
+    overwriting its own slot. A deleted student's slot is marked dead and
+    reused by the next new student.
+    """
+
+    def __init__(self, path, durable=True):
+        self.path = path
+        self.durable = durable
+        self.slots = {}   # id -> slot number
+        self.free = []    # Dead slots ready for reuse
+        self.count = 0
+        if not os.path.exists(path):
+            self._write_all([])
+        self.file = open(path, "r+b")
+        magic, self.count = BINARY_HEADER.unpack(self.file.read(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is not a student binary file.")
+
+    def _write_all(self, records):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, len(records)))
+            file.writelines(records)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+    def iter_batches(self, report):
+        self.slots, self.free = {}, []
+        if self.count == 0:
+            return
+        with mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # One batch of records is copied out of the mapping at a time
+            for first in range(0, self.count, BATCH_SIZE):
+                last = min(first + BATCH_SIZE, self.count)
+                chunk = data[BINARY_HEADER.size + first * RECORD.size:
+                             BINARY_HEADER.size + last * RECORD.size]
+                positions, records = [], []
+                for slot, (sid, live, c1, c2, c3, exam, name) in enumerate(
+                        RECORD.iter_unpack(chunk), start=first):
+                    if not live:
+                        self.free.append(slot)
+                        continue
+                    self.slots.setdefault(sid, slot)  # A bad record is overwritten by a later put
+                    # A corrupt slot is reported like a bad text row, not loaded
+                    try:
+                        check_id(sid)
+                        if not (c1 <= CW_MAX and c2 <= CW_MAX and c3 <= CW_MAX and exam <= EXAM_MAX):
+                            check_marks(c1, c2, c3, exam)  # Raises with the right message
+                        name = name.rstrip(b"\0").decode("utf-8")
+                    except ValueError as e:
+                        report.reject(slot, str(e))
+                        continue
+                    positions.append(slot)
+                    records.append((sid, name, c1, c2, c3, exam))
+                report.rows += len(records)
+                yield positions, records
+
+    def iter_edits(self):
+        return iter(())  # Edits are saved in place, never journalled
+
+    def load(self, report=None):
+        return load_all(self, report)
+
+    def open(self, students):
+        pass
+
+    def _write_slot(self, slot, data):
+        self.file.seek(BINARY_HEADER.size + slot * RECORD.size)
+        self.file.write(data)
+
+    def _sync(self):
+        self.file.flush()
+        if self.durable:
+            os.fsync(self.file.fileno())
+
+    def _put(self, s):
+        data = pack_record(s)
+        slot = self.slots.get(s["id"])
+        if slot is None:
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = self.count
+                self.count += 1
+                self.file.seek(0)
+                self.file.write(BINARY_HEADER.pack(BINARY_MAGIC, self.count))
+            self.slots[s["id"]] = slot
+        self._write_slot(slot, data)
+
+    def put(self, students, sid):
+        self._put(students.get(sid))
+        self._sync()
+
+    def put_many(self, students, sids):
+        records = [students.get(sid) for sid in sids]
+        for s in records:
+            pack_record(s)  # Check every name fits before writing anything
+        for s in records:
+            self._put(s)
+        self._sync()
+
+    def delete(self, students, sid):
+        slot = self.slots.pop(sid, None)
+        if slot is None:
+            return  # Added and removed again before it was ever saved
+        self._write_slot(slot, bytes(RECORD.size))  # Zeroed = dead
+        self.free.append(slot)
+        self._sync()
+
+    def get(self, sid):
+        slot = self.slots.get(sid)
+        if slot is None:
+            return None
+        self.file.seek(BINARY_HEADER.size + slot * RECORD.size)
+        sid, _, c1, c2, c3, exam, name = RECORD.unpack(self.file.read(RECORD.size))
+        return record_dict((sid, name.rstrip(b"\0").decode("utf-8"), c1, c2, c3, exam))
+
+    def save(self, students):
+        records = [pack_record(students.row(row)) for row in range(len(students))]
+        self.file.close()
+        self._write_all(records)
+        self.file = open(self.path, "r+b")
+        self.count = len(records)
+        self.slots = {sid: slot for slot, sid in enumerate(students.ids)}
+        self.free = []
+
+    def needs_snapshot(self):
+        return False
+
+    def snapshot(self, columns):
+        pass
+
+    def close(self):
+        self.file.close()
+
+
+# ------------------ CHOOSING A BACKEND ------------------
+
+BACKENDS = {"text": TextBackend, "sqlite": SqliteBackend, "binary": BinaryBackend}
+EXTENSIONS = {".db": "sqlite", ".sqlite": "sqlite", ".bin": "binary"}
+
+
+def backend_kind(path):
+    """Backend name for a file, from its extension; anything unknown is text"""
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower(), "text")
+
+
+def open_backend(path, kind=None):
+    if kind is None:
+        kind = backend_kind(path)
+    try:
+        backend = BACKENDS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown storage backend {kind!r}; use one of {', '.join(BACKENDS)}.")
+    return backend(path)
@@ -0,0 +1,224 @@
+"""Headless batch jobs over student mark files.
+
+Examples, run from the repository root:
+
+    python "Exercise 3-Student Data/student_cli.py" report cohorts/*.txt
+    python "Exercise 3-Student Data/student_cli.py" top -n 5 cohorts/*.txt
+    python "Exercise 3-Student Data/student_cli.py" export --format csv --output out/ cohorts/*.txt
+    python "Exercise 3-Student Data/student_cli.py" import --into roster.txt cohorts/
+
+Input files are processed in parallel, one per worker process, and each
+file's output is written as soon as it is finished.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import struct
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from student_core import FILE_PATH, load_students, save_students
+from student_import import import_files
+from student_loader import LoadReport, iter_student_batches
+from student_stats import GRADE_LETTERS, grade_codes, percentages, summarize, top_n
+from student_store import StudentStore
+
+EXPORT_COLUMNS = ["id", "name", "cw1", "cw2", "cw3", "exam", "percentage", "grade"]
+
+
+# ------------------ WORKERS ------------------
+# These run in worker processes, so they take and return plain values.
+
+def report_file(path):
+    report = LoadReport()
+    summary = summarize(load_students(path, report))
+    summary.pop("percentages", None)
+    summary.pop("grades", None)
+    summary.pop("highest", None)
+    summary.pop("lowest", None)
+    summary["bad_rows"] = len(report.bad_rows)
+    return summary
+
+
+def top_file(path, n, lowest):
+    students = load_students(path)
+    summary = summarize(students)
+    rows = []
+    for row in top_n(students, n, lowest).tolist():
+        s = students.row(row)
+        s["percentage"] = float(summary["percentages"][row])
+        s["grade"] = str(summary["grades"][row])
+        rows.append(s)
+    return rows
+
+
+def export_file(path, output_dir, fmt):
+    """Write every row of `path` with its percentage and grade, one batch at a time"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    out_path = os.path.join(output_dir, f"{name}.{'csv' if fmt == 'csv' else 'jsonl'}")
+    report = LoadReport()
+    with open(out_path, "w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out) if fmt == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+
+        for _, records in iter_student_batches(path, report=report):
+            marks = np.array([record[2:] for record in records], dtype=np.int16)
+            percentage = percentages(marks.sum(axis=1))
+            grade = GRADE_LETTERS[grade_codes(percentage)]
+
+            for record, p, g in zip(records, percentage.tolist(), grade.tolist()):
+                if writer:
+                    writer.writerow(record + (p, g))
+                else:
+                    out.write(json.dumps(dict(zip(EXPORT_COLUMNS, record + (p, g)))) + "\n")
+
+    return out_path, report.rows, len(report.bad_rows)
+
+
+# ------------------ COMMANDS ------------------
+
+def run_parallel(jobs, fn, paths, *args):
+    """Yield (path, result or exception) as each file finishes; one bad file never stops the rest"""
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(fn, path, *args): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except (OSError, ValueError, sqlite3.Error, struct.error) as e:
+                yield futures[future], e
+
+
+def cmd_report(args, out):
+    for path, summary in run_parallel(args.jobs, report_file, args.files):
+        if isinstance(summary, Exception):
+            print(f"{path}: {summary}", file=sys.stderr)
+            continue
+
+        if args.json:
+            out.write(json.dumps({"file": path, **summary}) + "\n")
+        elif summary["count"] == 0:
+            out.write(f"== {path} ==\nNo students loaded.\n\n")
+        else:
+            grades = "  ".join(f"{g}: {c}" for g, c in summary["histogram"].items())
+            out.write(
+                f"== {path} ==\n"
+                f"Students: {summary['count']}  (skipped rows: {summary['bad_rows']})\n"
+                f"Mean: {summary['mean']}%  Median: {summary['median']}%  "
+                f"Std: {summary['std']}\n"
+                f"Min: {summary['min']}%  Max: {summary['max']}%\n"
+                f"Grades  {grades}\n\n"
+            )
+        out.flush()
+
+
+def cmd_top(args, out):
+    for path, rows in run_parallel(args.jobs, top_file, args.files, args.n, args.lowest):
+        if isinstance(rows, Exception):
+            print(f"{path}: {rows}", file=sys.stderr)
+            continue
+
+        if args.json:
+            out.write(json.dumps({"file": path, "students": rows}) + "\n")
+        else:
+            out.write(f"== {path} ==\n")
+            for rank, s in enumerate(rows, start=1):
+                out.write(f"{rank:>3}. {s['name']} ({s['id']})  {s['percentage']}%  {s['grade']}\n")
+            out.write("\n")
+        out.flush()
+
+
+def cmd_export(args, out):
+    os.makedirs(args.output, exist_ok=True)
+    for path, result in run_parallel(args.jobs, export_file, args.files, args.output, args.format):
+        if isinstance(result, Exception):
+            print(f"{path}: {result}", file=sys.stderr)
+            continue
+
+        out_path, rows, bad = result
+        out.write(f"{path} -> {out_path}  ({rows} rows, {bad} skipped)\n")
+        out.flush()
+
+
+def cmd_import(args, out):
+    """Merge every student from the input files into the roster and save it once"""
+    roster_report = LoadReport()
+    try:
+        roster = load_students(args.into, roster_report)
+    except FileNotFoundError:
+        roster = StudentStore()
+    for line_no, reason in roster_report.bad_rows:
+        print(f"{args.into}:{line_no}: {reason}", file=sys.stderr)
+
+    report = import_files(roster, args.files, args.jobs, replace=args.replace)
+
+    for path, reason in report.errors:
+        print(f"{path}: {reason}", file=sys.stderr)
+    for path, line_no, reason in report.bad_rows:
+        print(f"{path}:{line_no}: {reason}", file=sys.stderr)
+    for path, line_no, _, reason in report.conflicts:
+        print(f"{path}:{line_no}: {reason}", file=sys.stderr)
+
+    # Saving rewrites the roster, which would silently drop its own rejected rows
+    if report.changed and roster_report.bad_rows and not args.force:
+        print(f"{args.into} has {len(roster_report.bad_rows)} rows that could not be loaded and "
+              f"would be lost by saving; fix them or pass --force. Nothing was saved.",
+              file=sys.stderr)
+        sys.exit(1)
+    if report.changed:
+        save_students(roster, args.into)
+    out.write(f"Imported {len(report.added)} students into {args.into} from {report.files} files "
+              f"({len(report.replaced)} replaced, {report.identical} already present, "
+              f"{len(report.conflicts)} conflicts, {len(report.bad_rows)} invalid rows; "
+              f"{len(roster_report.bad_rows)} invalid rows in {args.into})\n")
+
+
+# ------------------ ENTRY POINT ------------------
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Batch jobs over student mark files.")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    report = commands.add_parser("report", help="grade statistics per file")
+    report.add_argument("files", nargs="+")
+    report.add_argument("--json", action="store_true", help="one JSON object per line")
+    report.set_defaults(run=cmd_report)
+
+    top = commands.add_parser("top", help="best (or worst) N students per file")
+    top.add_argument("files", nargs="+")
+    top.add_argument("-n", type=int, default=10)
+    top.add_argument("--lowest", action="store_true")
+    top.add_argument("--json", action="store_true", help="one JSON object per line")
+    top.set_defaults(run=cmd_top)
+
+    export = commands.add_parser("export", help="write each file as CSV or JSON lines")
+    export.add_argument("files", nargs="+")
+    export.add_argument("--format", choices=["csv", "json"], default="csv")
+    export.add_argument("--output", default="export", help="output directory")
+    export.set_defaults(run=cmd_export)
+
+    imp = commands.add_parser("import", help="merge mark files (or directories of them) into a roster")
+    imp.add_argument("files", nargs="+")
+    imp.add_argument("--into", default=FILE_PATH, help="roster file to update (.txt, .db or .bin)")
+    imp.add_argument("--replace", action="store_true",
+                     help="overwrite roster students whose imported marks differ")
+    imp.add_argument("--force", action="store_true",
+                     help="save even if rows of the roster itself could not be loaded (they are dropped)")
+    imp.set_defaults(run=cmd_import)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.run(args, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Student records without any GUI: file handling, marks and grades.
+
+StudentData.py builds the Tk app on top of this module, and student_cli.py
+uses it for headless batch jobs.
+"""
+import os
+
+from student_backends import BACKENDS, TextBackend, open_backend
+from student_loader import LoadReport
+
+FILE_PATH = "Assessment 1 - Skills Portfolio/A1 - Resources/studentMarks.txt"
+STORAGE_KIND = os.environ.get("STUDENT_STORAGE", "text")  # text, sqlite or binary
+
+
+# ------------------ DATA HANDLING ------------------
+
+def load_students(path=FILE_PATH, report=None):
+    """Read a whole roster into a StudentStore; the backend is picked from the extension.
+
+    Raises FileNotFoundError if a text file is missing; rows that cannot be
+    loaded are recorded on `report`.
+    """
+    backend = open_backend(path)
+    try:
+        return backend.load(report if report is not None else LoadReport())
+    finally:
+        backend.close()
+
+
+def save_students(students, path=FILE_PATH):
+    backend = open_backend(path)
+    try:
+        backend.save(students)
+    finally:
+        backend.close()
+
+
+def storage_path(kind):
+    """Where each backend keeps the roster: next to the text file, with its own extension"""
+    base = os.path.splitext(FILE_PATH)[0]
+    return {"text": FILE_PATH, "sqlite": base + ".db", "binary": base + ".bin"}[kind]
+
+
+def open_storage(kind=STORAGE_KIND, journal=True, defer_snapshots=False):
+    """Open the configured backend, copying the text roster into it on first use"""
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown STUDENT_STORAGE {kind!r}; use one of {', '.join(BACKENDS)}.")
+    path = storage_path(kind)
+    if kind == "text":
+        return TextBackend(path, journal=journal, defer_snapshots=defer_snapshots)
+
+    first_use = not os.path.exists(path)
+    backend = open_backend(path, kind)
+    if first_use and os.path.exists(FILE_PATH):
+        backend.save(load_students(FILE_PATH))
+    return backend
+
+
+# ------------------ CALCULATIONS ------------------
+
+def calculate_percentage(cw, exam):
+    return round((cw + exam) / 160 * 100, 2)
+
+
+def grade_from_percentage(p):
+    if p >= 70: return "A"
+    if p >= 60: return "B"
+    if p >= 50: return "C"
+    if p >= 40: return "D"
+    return "F"
+
+
+def student_to_string(s, percentage=None, grade=None):
+    if percentage is None:
+        percentage = calculate_percentage(s["cw"], s["exam"])
+    if grade is None:
+        grade = grade_from_percentage(percentage)
+    return (
+        f"Name: {s['name']}\n"
+        f"ID: {s['id']}\n"
+        f"Coursework Total: {s['cw']} / 60\n"
+        f"Exam Mark: {s['exam']} / 100\n"
+        f"Overall %: {percentage}%\n"
+        f"Grade: {grade}\n"
+        "~~~~~~~~~~~~~~~~~~~~~~~~~~~~\n\n"
+    )
@@ -0,0 +1,159 @@
+"""Bulk import of many mark files into one roster.
+
+Files are parsed in parallel, one per worker process, using the same
+streaming parser (and range checks) as a normal load. The results are
+then merged into the roster on the calling process, in the order the
+files were given, so the outcome never depends on which worker finished
+first.
+"""
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from student_loader import LoadReport, iter_student_batches
+
+MARK_FILE_EXTENSIONS = (".txt",)
+
+
+# ------------------ FINDING FILES ------------------
+
+def expand_paths(paths):
+    """Files as given, plus every mark file under any directory, in sorted order"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in sorted(os.walk(path)):
+                files += [os.path.join(folder, name) for name in sorted(names)
+                          if name.lower().endswith(MARK_FILE_EXTENSIONS)]
+        else:
+            files.append(path)
+    return files
+
+
+# ------------------ PARSING ------------------
+
+def parse_file(path):
+    """Worker: (path, line numbers, records, bad rows, error) for one mark file"""
+    report = LoadReport()
+    all_line_nos, all_records = array("i"), []
+    try:
+        for line_nos, records in iter_student_batches(path, report=report):
+            all_line_nos.extend(line_nos)
+            all_records += records
+    except OSError as e:
+        return path, array("i"), [], [], str(e)
+    return path, all_line_nos, all_records, report.bad_rows, None
+
+
+def parse_files(paths, jobs=None):
+    """Yield parse_file() results in the order of `paths`, parsed in parallel"""
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if len(paths) <= 1 or jobs <= 1:
+        yield from map(parse_file, paths)  # A pool would only add pickling overhead
+        return
+    # Spawned, not forked: the GUI starts this from a helper thread, and a
+    # forked child would inherit Tk/Tcl state and locks held by other threads
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=spawn) as pool:
+        yield from pool.map(parse_file, paths)
+
+
+# ------------------ MERGING ------------------
+
+class ImportReport:
+    """What a bulk import did, with every skipped row and why"""
+
+    def __init__(self):
+        self.files = 0
+        self.added = []       # ids added to the roster
+        self.replaced = []    # ids overwritten (only with replace=True)
+        self.identical = 0    # rows already in the roster exactly as imported
+        self.conflicts = []   # (path, line number, id, reason)
+        self.bad_rows = []    # (path, line number, reason)
+        self.errors = []      # (path, reason) for files that could not be read
+
+    @property
+    def changed(self):
+        return self.added + self.replaced
+
+    def summary(self, limit=10):
+        lines = [f"Files read: {self.files}",
+                 f"Added: {len(self.added)}   Replaced: {len(self.replaced)}   "
+                 f"Already present: {self.identical}",
+                 f"Conflicts: {len(self.conflicts)}   Invalid rows: {len(self.bad_rows)}   "
+                 f"Unreadable files: {len(self.errors)}"]
+        problems = ([f"{path}: {reason}" for path, reason in self.errors]
+                    + [f"{path}:{line_no}: {reason}" for path, line_no, _, reason in self.conflicts]
+                    + [f"{path}:{line_no}: {reason}" for path, line_no, reason in self.bad_rows])
+        lines += problems[:limit]
+        if len(problems) > limit:
+            lines.append(f"... and {len(problems) - limit} more")
+        return "\n".join(lines)
+
+
+def describe(record):
+    sid, name, c1, c2, c3, exam = record
+    return f"{name} {c1}/{c2}/{c3}/{exam}"
+
+
+def merge_results(students, results, replace=False):
+    """Merge parse_files() results into a StudentStore and return an ImportReport.
+
+    An id that is new to the roster is added, unless an earlier file in
+    this import already brought it in with different data (a conflict).
+    An id already in the roster with different data is a conflict too,
+    or overwrites the roster's copy when `replace` is set.
+    """
+    report = ImportReport()
+    imported = {}  # id -> (path, line_no, record) for ids brought in by this import
+
+    for path, line_nos, records, bad_rows, error in results:
+        report.files += 1
+        if error is not None:
+            report.errors.append((path, error))
+            continue
+        report.bad_rows += [(path, line_no, reason) for line_no, reason in bad_rows]
+
+        new_records = []
+        for line_no, record in zip(line_nos, records):
+            sid = record[0]
+            first = imported.get(sid)
+            if first is not None:
+                if first[2] != record:
+                    report.conflicts.append((path, line_no, sid,
+                                             f"student ID {sid} is {describe(record)} here but "
+                                             f"{describe(first[2])} in {first[0]}:{first[1]}"))
+                else:
+                    report.identical += 1
+                continue
+
+            if sid not in students:
+                imported[sid] = (path, line_no, record)
+                new_records.append(record)
+                continue
+
+            current = students.get(sid)
+            existing = (sid, current["name"], current["cw1"], current["cw2"],
+                        current["cw3"], current["exam"])
+            if existing == record:
+                report.identical += 1
+            elif replace:
+                imported[sid] = (path, line_no, record)
+                students.update(sid, name=record[1], cw=record[2:5], exam=record[5])
+                report.replaced.append(sid)
+            else:
+                report.conflicts.append((path, line_no, sid,
+                                         f"student ID {sid} is {describe(record)} here but "
+                                         f"{describe(existing)} in the roster"))
+
+        students.add_many(new_records)
+        report.added += [record[0] for record in new_records]
+
+    return report
+
+
+def import_files(students, paths, jobs=None, replace=False):
+    """Parse every file (or directory of files) in parallel and merge them into `students`"""
+    return merge_results(students, parse_files(expand_paths(paths), jobs), replace)
@@ -0,0 +1,314 @@
+"""Student storage on a background thread, so the Tk loop never waits for the disk.
+
+The app queues commands on a StorageWorker and goes straight back to the
+event loop. One worker thread opens the backend (a SQLite connection only
+works on the thread that made it), streams the roster back in batches and
+writes edits. Edits that pile up while a write is in progress are merged
+into the next write: only the latest version of each student is saved,
+with one fsync. Results come back as events that the Tk thread picks up
+with poll() from a root.after() loop:
+
+    ("batch", batch)        a loaded (positions, records) batch, for add_batch
+    ("edits", edits)        journalled edits to apply on top, for apply_edits
+    ("loaded", error)       loading finished; error is None or the exception
+    ("opened", error)       the backend is ready for edits
+    ("saving", changes)     a write of that many students started
+    ("saved", changes, s)   it finished after s seconds
+    ("error", message)      a write failed; it is retried with the next one
+    ("snapshot",)           the backend wants snapshot(columns) from the roster
+
+The worker never reads or changes the StudentStore the Tk thread owns.
+Loaded batches and journal edits are only parsed on the worker and
+applied by the Tk thread, edits carry a copy of the student
+(roster.get() returns a fresh dict), and snapshots are written from
+columns the Tk thread copied. Snapshots go to a temporary file that is
+fsynced and renamed over the old one, and journal appends are fsynced
+before "saved" is sent. Any exception from the backend becomes an
+"error" (or "loaded"/"opened") event; the worker itself keeps running.
+
+StoragePoller runs handle_events() from an after() loop while the worker
+is busy. Neither needs Tk, so the app and the benchmarks share them.
+"""
+import threading
+import time
+from collections import deque
+
+from student_journal import copy_columns
+
+POLL_MS = 50         # How often the Tk thread checks for events while the worker is busy
+LOST_IDS_SHOWN = 20  # Ids listed when edits could not be saved by close()
+
+
+class StorageWorker:
+    def __init__(self, open_storage):
+        self.open_storage = open_storage  # Called on the worker thread
+        self.storage = None
+        self.path = None
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        self.commands = deque()
+        self.events = deque()
+        self.unsaved = 0             # Edits queued or being written
+        self.failed = {}             # id -> record (None once deleted) whose write failed
+        self.snapshot_asked = False  # A ("snapshot",) event is out and not answered yet
+        self.loading = False
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="student-storage", daemon=True)
+        self.thread.start()
+
+    # ------------------ TK THREAD ------------------
+
+    def _queue(self, commands, edits=0):
+        with self.lock:
+            if self.closed:
+                raise ValueError("The storage worker is closed.")
+            self.commands.extend(commands)
+            self.unsaved += edits
+            self.wake.notify()
+
+    def load(self, report):
+        """Load the roster as "batch" and "edits" events, then open it for saving"""
+        self.loading = True
+        self._queue([("load", report)])
+
+    def put(self, record):
+        self._queue([("put", record)], edits=1)
+
+    def put_many(self, records):
+        self._queue([("put", record) for record in records], edits=len(records))
+
+    def delete(self, sid):
+        self._queue([("delete", sid)], edits=1)
+
+    def snapshot(self, columns):
+        """Answer a ("snapshot",) event with copied roster columns"""
+        self._queue([("snapshot", columns)])
+
+    def poll(self):
+        """Take the next event, or None"""
+        try:
+            return self.events.popleft()
+        except IndexError:
+            return None
+
+    def busy(self):
+        """True while there is work queued or events waiting for poll()"""
+        with self.lock:
+            return bool(self.commands or self.events or self.unsaved) or self.loading
+
+    def close(self, columns=None):
+        """Write everything queued and stop; `columns` is used if a snapshot is still wanted.
+
+        Errors from these last writes, and any edits that could not be saved
+        at all, are left as "error" events for poll().
+        """
+        with self.lock:
+            if not self.closed:
+                self.commands.append(("close", columns))
+                self.closed = True
+                self.wake.notify()
+        self.thread.join()
+
+    # ------------------ WORKER THREAD ------------------
+
+    def _post(self, *event):
+        self.events.append(event)
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while not self.commands:
+                    self.wake.wait()
+                commands = list(self.commands)
+                self.commands.clear()
+
+            last_snapshot = max((i for i, c in enumerate(commands) if c[0] == "snapshot"),
+                                default=-1)
+            changes = {}  # id -> latest record, or None once deleted
+            edits = 0
+            for i, command in enumerate(commands):
+                kind = command[0]
+                if kind == "put":
+                    changes[command[1]["id"]] = command[1]
+                    edits += 1
+                    continue
+                if kind == "delete":
+                    changes[command[1]] = None
+                    edits += 1
+                    continue
+
+                # Everything queued before a command has to be on disk before it runs
+                self._write(changes, edits)
+                changes, edits = {}, 0
+                if kind == "load":
+                    self._load(command[1])
+                elif kind == "snapshot" and i == last_snapshot:
+                    self._snapshot(command[1])
+                elif kind == "close":
+                    self._close(command[1])
+                    return
+            self._write(changes, edits)
+
+    def _load(self, report):
+        self.loading = True
+        error = None
+        try:
+            self.storage = self.open_storage()
+            self.path = self.storage.path
+            try:
+                for batch in self.storage.iter_batches(report):
+                    self._post("batch", batch)
+            except FileNotFoundError as e:
+                error = e  # Still opened, so new records can be saved
+            for edits in self.storage.iter_edits():
+                self._post("edits", edits)
+        except Exception as e:  # OSError, sqlite3.Error, struct.error, a bad file...
+            error = e
+            self._drop_storage()
+        self._post("loaded", error)
+
+        error = None
+        if self.storage is not None:
+            try:
+                self.storage.open(None)  # Edits are applied by the Tk thread, not replayed here
+            except Exception as e:
+                error = e
+                self._drop_storage()
+        self._post("opened", error)
+        if self.storage is not None:
+            self._ask_for_snapshot()  # An interrupted compaction is finished off this way
+        self.loading = False
+
+    def _drop_storage(self):
+        if self.storage is not None:
+            try:
+                self.storage.close()
+            except Exception:
+                pass  # Already failing; the first error is the one reported
+        self.storage = None
+
+    def _write(self, changes, edits):
+        if not edits and not self.failed:
+            return
+        try:
+            if self.storage is not None:
+                self._save(changes)
+        finally:
+            with self.lock:
+                self.unsaved -= edits
+
+    def _save(self, changes):
+        # Edits from a failed write go first, so newer ones win
+        changes = {**self.failed, **changes}
+        self._post("saving", len(changes))
+        start = time.perf_counter()
+        records = {sid: record for sid, record in changes.items() if record is not None}
+        try:
+            for sid, record in changes.items():
+                if record is None:
+                    self.storage.delete(records, sid)
+            if records:
+                self.storage.put_many(records, list(records))
+        except Exception as e:
+            self.failed = changes
+            self._post("error", f"{len(changes)} changed students could not be saved; "
+                                f"they will be tried again with the next save:\n{e}")
+        else:
+            self.failed = {}
+            self._post("saved", len(changes), time.perf_counter() - start)
+        self._ask_for_snapshot()
+
+    def _ask_for_snapshot(self):
+        try:
+            wanted = self.storage.needs_snapshot()
+        except Exception:
+            return
+        if wanted and not self.snapshot_asked:
+            self.snapshot_asked = True
+            self._post("snapshot",)
+
+    def _snapshot(self, columns):
+        self.snapshot_asked = False
+        if self.storage is None:
+            return
+        try:
+            if self.storage.needs_snapshot():
+                self.storage.snapshot(columns)
+        except Exception as e:
+            self._post("error", f"The student file could not be rewritten:\n{e}")
+
+    def _close(self, columns):
+        if self.storage is None:
+            return
+        if columns is not None:
+            self._snapshot(columns)
+        if self.failed:  # _run already tried them once more before this close
+            ids = ", ".join(map(str, sorted(self.failed)[:LOST_IDS_SHOWN]))
+            more = " ..." if len(self.failed) > LOST_IDS_SHOWN else ""
+            self._post("error", f"{len(self.failed)} changed students were never saved "
+                                f"and are lost (ids {ids}{more}).")
+        try:
+            self.storage.close()
+        except Exception as e:
+            self._post("error", f"The student records could not be closed:\n{e}")
+
+
+# ------------------ EVENT HANDLING ------------------
+
+def handle_events(io, app):
+    """Pass waiting events to `app`, which owns the roster, on the thread that owns it.
+
+    `app` has a `students` roster and add_loaded_batch(batch),
+    apply_loaded_edits(edits), finish_loading(error), finish_opening(error),
+    show_saving(changes), show_saved(changes, seconds) and
+    show_storage_error(message). Snapshot requests are answered here with a
+    copy of app.students. Returns after one batch of records or edits, so
+    a big load never holds the event loop for long.
+    """
+    while True:
+        event = io.poll()
+        if event is None:
+            return
+        kind = event[0]
+        if kind == "batch":
+            app.add_loaded_batch(event[1])
+            return
+        elif kind == "edits":
+            app.apply_loaded_edits(event[1])
+            return
+        elif kind == "loaded":
+            app.finish_loading(event[1])
+        elif kind == "opened":
+            app.finish_opening(event[1])
+        elif kind == "saving":
+            app.show_saving(event[1])
+        elif kind == "saved":
+            app.show_saved(event[1], event[2])
+        elif kind == "snapshot":
+            io.snapshot(copy_columns(app.students))
+        elif kind == "error":
+            app.show_storage_error(event[1])
+
+
+class StoragePoller:
+    """Calls handle_events from `after(ms, callback)` (root.after in the app) while `io` is busy"""
+
+    def __init__(self, io, app, after):
+        self.io = io
+        self.app = app
+        self.after = after
+        self.job = None
+
+    def watch(self):
+        """Start polling, after queueing work on the worker"""
+        if self.job is None:
+            self.job = self.after(1, self.poll)
+
+    def poll(self):
+        self.job = None
+        try:
+            handle_events(self.io, self.app)
+        finally:
+            # Even if an event handler fails, later events still get handled
+            if self.job is None and self.io.busy():
+                self.job = self.after(1 if self.io.events else POLL_MS, self.poll)
@@ -0,0 +1,252 @@
+import os
+import shutil
+import threading
+
+from student_loader import BATCH_SIZE
+
+COMPACT_BYTES = 1024 * 1024  # Journal size that triggers a compaction
+
+
+# ------------------ SNAPSHOT ------------------
+
+def write_snapshot(path, columns):
+    """Write a full marks file atomically from (ids, names, cw1, cw2, cw3, exam).
+
+    The rows go to a temporary file that is fsynced and then renamed over
+    the old snapshot, so a crash leaves either the old or the new file.
+    """
+    ids, names, cw1, cw2, cw3, exam = columns
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        file.write(str(len(ids)) + "\n")
+        for row in zip(ids, names, cw1, cw2, cw3, exam):
+            file.write("%d,%s,%d,%d,%d,%d\n" % row)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+    fsync_directory(path)
+
+
+def fsync_directory(path):
+    """Make a rename inside `path`'s folder durable; a no-op where folders can't be opened"""
+    try:
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return  # Windows
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# ------------------ JOURNAL ------------------
+
+class StudentJournal:
+    """Append-only log of student edits kept next to the marks file.
+
+    Every add, update or delete appends one short line, so an edit costs a
+    few bytes no matter how large the roster is. At load time the snapshot
+    is read first and the journal is replayed on top of it. Once the
+    journal grows past `threshold` bytes it is rotated out and a background
+    thread writes a fresh snapshot, then drops the rotated journal. If that
+    fails, the rotated journal stays, the next compaction adds to it rather
+    than replacing it, and the error is raised by compact() or close().
+
+    Records are replayed as "put" (insert or overwrite) and "delete", which
+    makes replaying the same journal twice harmless after a crash. The
+    journal never replays into a roster itself: whoever loads the snapshot
+    reads iter_edits() and applies them, then calls open() to append.
+    """
+
+    def __init__(self, snapshot_path, threshold=COMPACT_BYTES, durable=True):
+        self.snapshot_path = snapshot_path
+        self.path = snapshot_path + ".journal"
+        self.old_path = self.path + ".old"
+        self.threshold = threshold
+        self.durable = durable
+        self.file = None
+        self.size = 0
+        self.torn = False  # A failed append may have left half a line at the end
+        self.compactor = None
+        self.compact_error = None  # Raised by the background compaction, not reported yet
+        self.recovering = False    # An interrupted compaction left its rotated journal behind
+
+    def iter_edits(self):
+        """Lists of edits (see read_edits) not in the snapshot yet, oldest first"""
+        for path in (self.old_path, self.path):
+            yield from read_edits(path)
+
+    def open(self):
+        """Start appending; the roster must already hold the edits from iter_edits()"""
+        self.file = open(self.path, "ab")
+        self.size = self.file.tell()
+        # should_compact() then asks for a snapshot that folds everything in
+        self.recovering = os.path.exists(self.old_path)
+
+    def record_put(self, s):
+        self.append(put_line(s))
+
+    def record_puts(self, records):
+        """Record many puts with a single write and fsync"""
+        self.append("".join(map(put_line, records)))
+
+    def record_delete(self, sid):
+        self.append(f"D,{sid}\n")
+
+    def append(self, line):
+        data = line.encode("utf-8")
+        if self.torn:
+            data = b"\n" + data  # End the half line so it can't swallow this record
+        try:
+            self.file.write(data)
+            self.file.flush()
+            if self.durable:
+                os.fsync(self.file.fileno())
+        except OSError:
+            self.torn = True
+            raise
+        self.torn = False
+        self.size += len(data)
+
+    # ------------------ COMPACTION ------------------
+
+    def maybe_compact(self, students):
+        if not self.should_compact():
+            return False
+        self.compact(copy_columns(students))
+        return True
+
+    def should_compact(self):
+        if self.compactor is not None and self.compactor.is_alive():
+            return False
+        # A failed or interrupted compaction left its rotated journal behind: try again
+        return (self.size >= self.threshold or self.compact_error is not None
+                or self.recovering)
+
+    def compact(self, columns):
+        """Rotate the journal and write `columns` as the new snapshot in the background.
+
+        `columns` must hold every edit appended so far and none after.
+        """
+        if self.compactor is not None:
+            self.compactor.join()  # Its rotated journal is still needed
+        error, self.compact_error = self.compact_error, None
+
+        # Rotate on the calling thread so no edit can land in the old journal
+        self.file.close()
+        if os.path.exists(self.old_path):
+            # An earlier compaction failed; its journal still holds edits the
+            # snapshot lacks, so this journal is added to the end of it
+            with open(self.old_path, "rb+") as old, open(self.path, "rb") as new:
+                old.seek(0, os.SEEK_END)
+                if old.tell():
+                    old.seek(-1, os.SEEK_END)
+                    if old.read(1) != b"\n":
+                        old.write(b"\n")  # Keep a torn line from swallowing the next record
+                shutil.copyfileobj(new, old)
+                old.flush()
+                if self.durable:
+                    os.fsync(old.fileno())
+            self.file = open(self.path, "wb")
+        else:
+            os.replace(self.path, self.old_path)
+            self.file = open(self.path, "ab")
+        self.size = 0
+        self.torn = False
+        self.recovering = False
+
+        self.compactor = threading.Thread(
+            target=self._compact, args=(columns,), name="journal-compactor"
+        )
+        self.compactor.start()
+        if error is not None:
+            raise error
+
+    def _compact(self, columns):
+        try:
+            write_snapshot(self.snapshot_path, columns)
+            os.remove(self.old_path)
+        except Exception as e:
+            self.compact_error = e  # The rotated journal stays, so nothing is lost
+
+    def close(self):
+        if self.compactor is not None:
+            self.compactor.join()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        error, self.compact_error = self.compact_error, None
+        if error is not None:
+            raise error
+
+
+def put_line(s):
+    return f"P,{s['id']},{s['name']},{s['cw1']},{s['cw2']},{s['cw3']},{s['exam']}\n"
+
+
+# ------------------ REPLAY ------------------
+
+def read_edits(path, batch_size=BATCH_SIZE):
+    """A journal's records as lists of ("put", record) and ("delete", sid) edits.
+
+    Lines that do not parse are skipped. Reading only parses, so it can
+    run on another thread than the one that owns the roster.
+    """
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return
+
+    with file:
+        edits = []
+        for raw in file:
+            # A torn last line means the process died mid-append: ignore it
+            if not raw.endswith(b"\n"):
+                break
+            try:
+                edits.append(parse_record(raw.decode("utf-8").rstrip("\n")))
+            except ValueError:
+                continue
+            if len(edits) >= batch_size:
+                yield edits
+                edits = []
+        if edits:
+            yield edits
+
+
+def parse_record(line):
+    op, rest = line.split(",", 1)
+
+    if op == "D":
+        return "delete", int(rest)
+
+    elif op == "P":
+        sid, rest = rest.split(",", 1)
+        name, c1, c2, c3, exam = rest.rsplit(",", 4)
+        return "put", (int(sid), name, int(c1), int(c2), int(c3), int(exam))
+
+    else:
+        raise ValueError(f"Unknown journal record {op!r}")
+
+
+def apply_edits(students, edits):
+    """Apply edits from read_edits(); ones the store rejects are skipped"""
+    for op, value in edits:
+        try:
+            if op == "delete":
+                if value in students:
+                    students.delete(value)
+            else:
+                sid, name, c1, c2, c3, exam = value
+                if sid in students:
+                    students.update(sid, name=name, cw=(c1, c2, c3), exam=exam)
+                else:
+                    students.add(sid, name, c1, c2, c3, exam)
+        except ValueError:
+            continue
+
+
+def copy_columns(students):
+    return tuple(column[:] for column in students.columns())
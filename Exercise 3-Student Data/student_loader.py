@@ -0,0 +1,85 @@
+from student_store import CW_MAX, EXAM_MAX, check_id, check_marks
+
+BATCH_SIZE = 5000
+READ_BUFFER = 1024 * 1024
+
+
+# ------------------ LOAD REPORT ------------------
+
+class LoadReport:
+    """Counts of what a load read, plus every rejected line and why"""
+
+    def __init__(self):
+        self.rows = 0
+        self.bad_rows = []  # (line number, reason)
+
+    def reject(self, line_no, reason):
+        self.bad_rows.append((line_no, reason))
+
+    def summary(self, limit=10):
+        lines = [f"Line {line_no}: {reason}" for line_no, reason in self.bad_rows[:limit]]
+        if len(self.bad_rows) > limit:
+            lines.append(f"... and {len(self.bad_rows) - limit} more")
+        return "\n".join(lines)
+
+
+# ------------------ STREAMING PARSER ------------------
+
+def parse_line(line):
+    """Parse one 'id,name,cw1,cw2,cw3,exam' row; the name may contain commas"""
+    if line.count(b",") < 5:
+        raise ValueError("malformed row: expected id,name,cw1,cw2,cw3,exam")
+    sid, rest = line.split(b",", 1)
+    name, c1, c2, c3, exam = rest.rsplit(b",", 4)
+    sid, c1, c2, c3, exam = int(sid), int(c1), int(c2), int(c3), int(exam)
+    if not (0 <= c1 <= CW_MAX and 0 <= c2 <= CW_MAX and 0 <= c3 <= CW_MAX
+            and 0 <= exam <= EXAM_MAX):
+        check_marks(c1, c2, c3, exam)  # Raises with the right message
+    check_id(sid)
+    return sid, name.decode("utf-8").strip(), c1, c2, c3, exam
+
+
+def iter_student_batches(path, batch_size=BATCH_SIZE, report=None):
+    """Yield (line numbers, records) batches parsed from a marks file.
+
+    Each record is an (id, name, cw1, cw2, cw3, exam) tuple. The file is
+    read through a large buffer one line at a time, so only the current
+    batch is held in memory. The first non-empty line is the count header.
+    Rows that do not parse are recorded on `report` and skipped.
+    """
+    if report is None:
+        report = LoadReport()
+
+    line_nos, records = [], []
+    header_seen = False
+    with open(path, "rb", buffering=READ_BUFFER) as file:
+        for line_no, raw in enumerate(file, start=1):
+            line = raw.strip()
+            if not line:
+                continue
+            if not header_seen:
+                header_seen = True
+                continue
+
+            try:
+                records.append(parse_line(line))
+            except ValueError as e:
+                report.reject(line_no, str(e) or "malformed row")
+                continue
+
+            line_nos.append(line_no)
+            if len(records) >= batch_size:
+                report.rows += len(records)
+                yield line_nos, records
+                line_nos, records = [], []
+
+    if records:
+        report.rows += len(records)
+        yield line_nos, records
+
+
+def add_batch(students, batch, report):
+    """Add a parsed batch to a StudentStore, rejecting duplicate ids"""
+    line_nos, records = batch
+    for position in students.add_many(records):
+        report.reject(line_nos[position], f"Student ID {records[position][0]} already exists.")
@@ -0,0 +1,122 @@
+from itertools import islice
+
+MAX_TOTAL = 160  # Highest possible coursework + exam total
+
+
+# ------------------ RANKING INDEX ------------------
+
+class RankingIndex:
+    """Students ordered by overall mark, kept up to date as records change.
+
+    The overall percentage only depends on the integer total (0 to 160),
+    so students are grouped into one bucket per total and a Fenwick tree
+    counts how many students sit in each bucket. Adding, moving or removing
+    a student touches one bucket and O(log 161) tree nodes; rank and
+    percentile queries are prefix sums over the tree. Both ascending and
+    descending orders are read from the same buckets, so nothing is ever
+    re-sorted. Students with the same total keep the order they were added.
+    """
+
+    def __init__(self):
+        self.buckets = [{} for _ in range(MAX_TOTAL + 1)]
+        self.tree = [0] * (MAX_TOTAL + 2)
+        self.totals = {}
+
+    @classmethod
+    def from_store(cls, students):
+        index = cls()
+        for sid, c1, c2, c3, exam in zip(students.ids, students.cw1, students.cw2,
+                                         students.cw3, students.exam):
+            index.add(sid, c1 + c2 + c3 + exam)
+        return index
+
+    def __len__(self):
+        return len(self.totals)
+
+    # ------------------ UPDATES ------------------
+
+    def add(self, sid, total):
+        self.totals[sid] = total
+        self.buckets[total][sid] = None
+        self._change(total, 1)
+
+    def remove(self, sid):
+        total = self.totals.pop(sid)
+        del self.buckets[total][sid]
+        self._change(total, -1)
+
+    def update(self, sid, total):
+        if self.totals.get(sid) != total:
+            self.remove(sid)
+            self.add(sid, total)
+
+    # ------------------ QUERIES ------------------
+
+    def highest(self):
+        return self.at(0, descending=True) if self.totals else None
+
+    def lowest(self):
+        return self.at(0) if self.totals else None
+
+    def top(self, k, descending=True):
+        """The first k student ids in the chosen order"""
+        return list(islice(self.iter_order(descending=descending), k))
+
+    def rank_of(self, sid):
+        """1 for the best student; students on the same total share a rank"""
+        return len(self.totals) - self._count_upto(self.totals[sid]) + 1
+
+    def percentile(self, sid):
+        """Percentage of students whose total is at or below this student's"""
+        return round(self._count_upto(self.totals[sid]) / len(self.totals) * 100, 2)
+
+    def at(self, position, descending=False):
+        """Student id at a 0-based position in ascending or descending order"""
+        return next(self.iter_order(position, descending))
+
+    def iter_order(self, start=0, descending=False):
+        """Yield student ids from position `start` onwards without sorting"""
+        if descending:
+            # Find the bucket from the bottom, then skip the students above
+            # it; ties are read front to back in both directions.
+            total, _ = self._find(len(self.totals) - start)
+            skip = start - (len(self.totals) - self._count_upto(total))
+            totals = range(total, -1, -1)
+        else:
+            total, skip = self._find(start + 1)
+            totals = range(total, MAX_TOTAL + 1)
+
+        for t in totals:
+            yield from islice(self.buckets[t], skip, None)
+            skip = 0
+
+    # ------------------ FENWICK TREE ------------------
+
+    def _change(self, total, delta):
+        i = total + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _count_upto(self, total):
+        """Number of students with a total <= `total`"""
+        i = total + 1
+        count = 0
+        while i > 0:
+            count += self.tree[i]
+            i -= i & -i
+        return count
+
+    def _find(self, k):
+        """(total, offset in that bucket) of the k-th smallest student, 1-based"""
+        if not 1 <= k <= len(self.totals):
+            raise IndexError("rank position out of range")
+        i = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            j = i + step
+            if j < len(self.tree) and self.tree[j] < k:
+                i = j
+                k -= self.tree[j]
+            step >>= 1
+        return i, k - 1
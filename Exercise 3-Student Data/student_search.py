@@ -0,0 +1,202 @@
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+
+MIN_QUERY = 2          # Characters typed before searching starts
+FUZZY_SCAN = 25_000    # Most trigram-array entries read by one fuzzy search
+FUZZY_SCORED = 100     # Candidates that get a full similarity score
+MIN_SIMILARITY = 0.4   # Share of the query's trigrams a fuzzy match must have
+COMPACT_MIN = 10_000   # Removals tolerated before the trigram arrays are rebuilt
+
+
+def normalize(name):
+    """Lower-case the name and collapse its whitespace"""
+    return " ".join(name.lower().split())
+
+
+def trigrams(text):
+    """Trigrams of a normalized name, padded so word starts have their own"""
+    text = " " + text + " "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def word_keys(sid, text):
+    """One sort key per word of the name: the name from that word on, then the id"""
+    keys = []
+    start = 0
+    while True:
+        keys.append(f"{text[start:]}\0{sid}")
+        start = text.find(" ", start) + 1
+        if start == 0:
+            return keys
+
+
+def key_id(key):
+    return int(key[key.rindex("\0") + 1:])
+
+
+# ------------------ NAME INDEX ------------------
+
+class NameIndex:
+    """Prefix and typo-tolerant search over student names, for search-as-you-type.
+
+    Prefix matches come from a sorted list holding every name once per
+    word ("ann lee", "lee"), so a bisect finds every name with a word
+    starting with the query and they are read off in order.
+
+    Typos are handled with trigrams: each trigram maps to an array of the
+    ids whose name contains it. A fuzzy search counts hits over the
+    query's rarest trigrams and ranks the best candidates by how many of
+    the query's trigrams they share. Removed names are left in the arrays
+    and filtered out, then swept out in one rebuild once enough pile up.
+
+    add_many() defers sorting the new keys until the next search, so
+    loading a roster in batches stays cheap.
+    """
+
+    def __init__(self):
+        self.names = {}     # id -> normalized name
+        self.keys = []      # Sorted word keys, see word_keys()
+        self.pending = []   # Keys added by add_many() and not sorted in yet
+        self.postings = {}  # trigram -> array of ids, possibly with stale entries
+        self.stale = 0      # Removals not yet swept out of the trigram arrays
+
+    def __len__(self):
+        return len(self.names)
+
+    # ------------------ UPDATES ------------------
+
+    def _index(self, sid, text):
+        self.names[sid] = text
+        postings = self.postings
+        for gram in trigrams(text):
+            ids = postings.get(gram)
+            if ids is None:
+                ids = postings[gram] = array("i")
+            ids.append(sid)
+
+    def add(self, sid, name):
+        text = normalize(name)
+        self._index(sid, text)
+        self._settle()
+        for key in word_keys(sid, text):
+            insort(self.keys, key)
+
+    def add_many(self, records):
+        """Index (id, name, ...) records, as produced by the loaders.
+
+        Ids already indexed are skipped, as StudentStore.add_many does.
+        """
+        names = self.names
+        for record in records:
+            if record[0] in names:
+                continue
+            text = normalize(record[1])
+            self._index(record[0], text)
+            self.pending += word_keys(record[0], text)
+
+    def sync(self, students):
+        """Bring the index in line with a StudentStore changed behind its back"""
+        for sid, name in zip(students.ids, students.names):
+            text = self.names.get(sid)
+            if text is None:
+                self.add(sid, name)
+            elif text != normalize(name):
+                self.update(sid, name)
+        if len(self.names) != len(students):
+            for sid in [sid for sid in self.names if sid not in students]:
+                self.remove(sid)
+
+    def remove(self, sid):
+        text = self.names.pop(sid)
+        self._settle()
+        keys = self.keys
+        for key in word_keys(sid, text):
+            del keys[bisect_left(keys, key)]
+
+        # The id stays in the trigram arrays until enough removals pile up
+        self.stale += 1
+        if self.stale > max(COMPACT_MIN, len(self.names) // 2):
+            self._compact()
+
+    def update(self, sid, name):
+        if normalize(name) != self.names.get(sid):
+            self.remove(sid)
+            self.add(sid, name)
+
+    def _settle(self):
+        if self.pending:
+            self.keys += self.pending
+            self.keys.sort()
+            self.pending = []
+
+    def _compact(self):
+        names = self.names
+        self.postings, self.stale = {}, 0
+        for sid, text in names.items():
+            self._index(sid, text)
+
+    # ------------------ SEARCH ------------------
+
+    def search(self, query, limit=20):
+        """Ids of up to `limit` students matching `query`, best first.
+
+        Names with a word starting with the query come first, alphabetically
+        from that word; fuzzy matches by similarity fill any space left.
+        """
+        text = normalize(query)
+        if len(text) < MIN_QUERY:
+            return []
+
+        found = self._prefix(text, limit)
+        if len(found) < limit and len(text) > MIN_QUERY:
+            seen = set(found)
+            for sid in self._fuzzy(text, limit):
+                if sid not in seen:
+                    seen.add(sid)
+                    found.append(sid)
+                    if len(found) == limit:
+                        break
+        return found
+
+    def _prefix(self, text, limit):
+        self._settle()
+        keys = self.keys
+        found = []
+        seen = set()
+        position = bisect_left(keys, text)
+        while position < len(keys) and len(found) < limit:
+            key = keys[position]
+            if not key.startswith(text):
+                break
+            sid = key_id(key)
+            if sid not in seen:  # "ann ann" has two keys starting with "ann"
+                seen.add(sid)
+                found.append(sid)
+            position += 1
+        return found
+
+    def _fuzzy(self, text, limit):
+        grams = trigrams(text)
+        grams.discard(text[-2:] + " ")  # The last word may still be half typed
+        lists = sorted((ids for ids in map(self.postings.get, grams) if ids), key=len)
+        # Rare trigrams say the most about a name, so read those first
+        counts = Counter()
+        budget = FUZZY_SCAN
+        for ids in lists:
+            if len(ids) > budget:
+                break
+            counts.update(ids)
+            budget -= len(ids)
+
+        names = self.names
+        scored = []
+        for sid, _ in counts.most_common(FUZZY_SCORED):
+            name = names.get(sid)
+            if name is None:
+                continue
+            similarity = len(grams & trigrams(name)) / len(grams)
+            if similarity >= MIN_SIMILARITY:
+                scored.append((-similarity, sid))
+        scored.sort()
+        return [sid for _, sid in scored[:limit]]
@@ -0,0 +1,92 @@
+"""Whole-cohort statistics for a StudentStore, computed with NumPy.
+
+Nothing here depends on Tk, so report scripts can use it directly:
+
+    from student_stats import summarize
+    summary = summarize(students)
+    print(summary["mean"], summary["histogram"])
+"""
+import numpy as np
+
+MAX_TOTAL = 160  # 3 x 20 coursework + 100 exam
+GRADE_BOUNDS = np.array([40, 50, 60, 70])
+GRADE_LETTERS = np.array(["F", "D", "C", "B", "A"])
+
+
+# ------------------ COLUMN MATHS ------------------
+
+def totals(students):
+    """Coursework plus exam mark for every row, as an int16 array"""
+    total = np.array(students.cw1, dtype=np.int16)
+    total += np.array(students.cw2, dtype=np.int16)
+    total += np.array(students.cw3, dtype=np.int16)
+    total += np.array(students.exam, dtype=np.int16)
+    return total
+
+
+def percentages(total):
+    """Same values as calculate_percentage, for a whole column at once"""
+    return np.round(total / MAX_TOTAL * 100, 2)
+
+
+def grade_codes(percentage):
+    """0 (F) to 4 (A) for each percentage, matching grade_from_percentage"""
+    return np.searchsorted(GRADE_BOUNDS, percentage, side="right")
+
+
+def grades(percentage):
+    return GRADE_LETTERS[grade_codes(percentage)]
+
+
+def sort_order(students, ascending=True):
+    """Row order by overall percentage; ties keep their current order"""
+    total = totals(students)
+    key = total if ascending else -total
+    return np.argsort(key, kind="stable")
+
+
+def top_n(students, n, lowest=False):
+    """Row positions of the n best (or worst) students, best first (or worst first)"""
+    total = totals(students)
+    key = total if lowest else -total
+    n = min(n, len(key))
+    if n == 0:
+        return np.array([], dtype=np.intp)
+    candidates = np.argpartition(key, n - 1)[:n]
+    return candidates[np.argsort(key[candidates], kind="stable")]
+
+
+# ------------------ SUMMARY ------------------
+
+def summarize(students):
+    """Percentages, grades and cohort statistics in one pass over the columns.
+
+    Returns a dict with the per-row "percentages" and "grades" arrays, the
+    cohort "count", "mean", "median", "std", "min" and "max" percentages,
+    the "highest" and "lowest" row positions and a letter -> count
+    "histogram". An empty store gives a count of 0 and no statistics.
+    """
+    count = len(students)
+    if count == 0:
+        return {"count": 0, "histogram": {str(letter): 0 for letter in GRADE_LETTERS[::-1]}}
+
+    percentage = percentages(totals(students))
+    codes = grade_codes(percentage)
+    histogram = np.bincount(codes, minlength=len(GRADE_LETTERS))
+
+    highest = int(np.argmax(percentage))
+    lowest = int(np.argmin(percentage))
+    return {
+        "count": count,
+        "percentages": percentage,
+        "grades": GRADE_LETTERS[codes],
+        "mean": round(float(percentage.mean()), 2),
+        "median": round(float(np.median(percentage)), 2),
+        "std": round(float(percentage.std()), 2),
+        "min": float(percentage[lowest]),
+        "max": float(percentage[highest]),
+        "highest": highest,
+        "lowest": lowest,
+        "histogram": {str(GRADE_LETTERS[code]): int(histogram[code])
+                      for code in range(len(GRADE_LETTERS) - 1, -1, -1)},
+    }
@@ -0,0 +1,162 @@
+import sys
+from array import array
+
+CW_MAX = 20
+EXAM_MAX = 100
+ID_MAX = 2 ** 31 - 1  # Ids are 32-bit ints in the store and the binary format
+
+
+# ------------------ STUDENT STORE ------------------
+
+class StudentStore:
+    """Column-backed student records with an id -> row hash index.
+
+    Marks are kept in typed arrays (one per column) and names in a list of
+    interned strings, so a large roster costs a few bytes per mark instead
+    of a dict per student. Lookups, updates and deletes go through the id
+    index and are O(1); deletes move the last row into the freed slot.
+    """
+
+    def __init__(self):
+        self.ids = array("i")
+        self.names = []
+        self.cw1 = array("b")
+        self.cw2 = array("b")
+        self.cw3 = array("b")
+        self.exam = array("b")
+        self.index = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, sid):
+        return sid in self.index
+
+    def __iter__(self):
+        for row in range(len(self.ids)):
+            yield self.row(row)
+
+    # ------------------ ROW ACCESS ------------------
+
+    def row(self, row):
+        """Return the record at a row position as a plain dict"""
+        c1, c2, c3 = self.cw1[row], self.cw2[row], self.cw3[row]
+        return {
+            "id": self.ids[row],
+            "name": self.names[row],
+            "cw1": c1, "cw2": c2, "cw3": c3,
+            "cw": c1 + c2 + c3,
+            "exam": self.exam[row]
+        }
+
+    def get(self, sid):
+        """Return the record for an id, or None if it is not stored"""
+        row = self.index.get(sid)
+        if row is None:
+            return None
+        return self.row(row)
+
+    # ------------------ MUTATIONS ------------------
+
+    def add(self, sid, name, c1, c2, c3, exam):
+        if sid in self.index:
+            raise ValueError(f"Student ID {sid} already exists.")
+        check_id(sid)
+        check_marks(c1, c2, c3, exam)
+
+        self.ids.append(sid)
+        self.names.append(sys.intern(name))
+        self.cw1.append(c1)
+        self.cw2.append(c2)
+        self.cw3.append(c3)
+        self.exam.append(exam)
+        self.index[sid] = len(self.ids) - 1
+
+    def add_many(self, records):
+        """Append pre-validated (id, name, cw1, cw2, cw3, exam) records in bulk.
+
+        Returns the positions of records whose id was already stored; those
+        records are not added. An id outside 0-ID_MAX raises ValueError, with
+        the records before it already added.
+        """
+        index = self.index
+        ids, names = self.ids, self.names
+        cw1, cw2, cw3, exam = self.cw1, self.cw2, self.cw3, self.exam
+        intern = sys.intern
+        duplicates = []
+
+        for position, (sid, name, c1, c2, c3, e) in enumerate(records):
+            if sid in index:
+                duplicates.append(position)
+                continue
+            if not 0 <= sid <= ID_MAX:
+                check_id(sid)  # Raises with the right message
+            ids.append(sid)
+            names.append(intern(name))
+            cw1.append(c1)
+            cw2.append(c2)
+            cw3.append(c3)
+            exam.append(e)
+            index[sid] = len(ids) - 1
+
+        return duplicates
+
+    def update(self, sid, name=None, cw=None, exam=None):
+        """Change the name, the (c1, c2, c3) coursework marks or the exam mark"""
+        row = self.index[sid]
+        if cw is not None:
+            check_marks(*cw, self.exam[row])
+        if exam is not None:
+            check_marks(0, 0, 0, exam)
+
+        if name is not None:
+            self.names[row] = sys.intern(name)
+        if cw is not None:
+            self.cw1[row], self.cw2[row], self.cw3[row] = cw
+        if exam is not None:
+            self.exam[row] = exam
+
+    def delete(self, sid):
+        """Remove a student by moving the last row into its slot"""
+        row = self.index.pop(sid)
+        last = len(self.ids) - 1
+
+        if row != last:
+            self.ids[row] = self.ids[last]
+            self.names[row] = self.names[last]
+            self.cw1[row] = self.cw1[last]
+            self.cw2[row] = self.cw2[last]
+            self.cw3[row] = self.cw3[last]
+            self.exam[row] = self.exam[last]
+            self.index[self.ids[row]] = row
+
+        for column in self.columns():
+            column.pop()
+
+    def reorder(self, order):
+        """Rearrange every column so that row i becomes old row order[i]"""
+        self.ids = array("i", (self.ids[i] for i in order))
+        self.names = [self.names[i] for i in order]
+        self.cw1 = array("b", (self.cw1[i] for i in order))
+        self.cw2 = array("b", (self.cw2[i] for i in order))
+        self.cw3 = array("b", (self.cw3[i] for i in order))
+        self.exam = array("b", (self.exam[i] for i in order))
+        self.index = {sid: row for row, sid in enumerate(self.ids)}
+
+    def columns(self):
+        return self.ids, self.names, self.cw1, self.cw2, self.cw3, self.exam
+
+
+# ------------------ VALIDATION ------------------
+
+def check_id(sid):
+    if not 0 <= sid <= ID_MAX:
+        raise ValueError(f"Student IDs must be between 0 and {ID_MAX}.")
+
+
+def check_marks(c1, c2, c3, exam):
+    for mark in (c1, c2, c3):
+        if not 0 <= mark <= CW_MAX:
+            raise ValueError(f"Coursework marks must be between 0 and {CW_MAX}.")
+    if not 0 <= exam <= EXAM_MAX:
+        raise ValueError(f"Exam mark must be between 0 and {EXAM_MAX}.")
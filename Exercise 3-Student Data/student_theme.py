@@ -0,0 +1,123 @@
+"""Light and dark themes for the Student Manager.
+
+The menu's frame, label, search entry and buttons are ttk widgets, and
+each role has a named ttk style (see STYLES). Switching themes
+reconfigures those few styles, and Tk restyles every widget that uses
+them in one pass, however many there are. Hover is a style map on the
+button style (the "active" state), so nothing is bound per button. Only
+the widgets ttk has no style for are configured one by one: the window
+itself and the results view, a single Text widget however many rows it
+shows.
+"""
+from tkinter import ttk
+
+THEMES = {
+    "light": {
+        "bg_main": "#7034BC",
+        "bg_menu": "#A05CFF",
+        "text_bg": "#EDE3FF",
+        "button": "#8A47D6",
+        "button_hover": "#B56BFF",
+        "fg": "#1A001F"
+    },
+    "dark": {
+        "bg_main": "#2B0033",
+        "bg_menu": "#1A001F",
+        "text_bg": "#3A0B4A",
+        "button": "#4B0082",
+        "button_hover": "#FF3366",
+        "fg": "white"
+    },
+}
+
+STYLES = {
+    "menu": "Menu.TFrame",
+    "label": "Themed.TLabel",
+    "entry": "Themed.TEntry",
+    "button": "Themed.TButton",
+}
+BASE_THEME = "clam"  # A ttk theme that draws the colours it is given on every platform
+BUTTON_FONT = ("Segoe UI", 10, "bold")
+
+
+def style_options(theme):
+    """ttk style settings for each style in STYLES"""
+    return {
+        "Menu.TFrame": {"background": theme["bg_menu"]},
+        "Themed.TLabel": {"background": theme["bg_menu"], "foreground": theme["fg"]},
+        "Themed.TEntry": {"fieldbackground": theme["text_bg"], "foreground": theme["fg"],
+                          "insertcolor": theme["fg"]},
+        "Themed.TButton": {"background": theme["button"], "foreground": theme["fg"]},
+    }
+
+
+def style_maps(theme):
+    """State-dependent style settings: the hover colour of buttons"""
+    return {"Themed.TButton": {"background": [("active", theme["button_hover"])]}}
+
+
+def widget_options(theme):
+    """configure() options for roles that have no ttk style"""
+    return {"window": {"bg": theme["bg_main"]}}
+
+
+# ------------------ THEME MANAGER ------------------
+
+class ThemeManager:
+    """Keeps the styles, and the few widgets ttk does not style, in the current theme"""
+
+    def __init__(self, root, themes=THEMES, name="light"):
+        self.root = root
+        self.themes = themes
+        self.name = name
+        self.widgets = {role: [] for role in widget_options(self.theme)}
+        self.views = []  # Objects with set_colors(bg, fg, footer_bg), like ResultsView
+
+        self.style = ttk.Style(root)
+        self.style.theme_use(BASE_THEME)
+        self.style.configure("Themed.TButton", font=BUTTON_FONT)
+        self._style()
+
+    @property
+    def theme(self):
+        return self.themes[self.name]
+
+    def register(self, widget, role):
+        """A ttk widget gets the role's style; anything else is configured directly"""
+        if role in STYLES:
+            widget.configure(style=STYLES[role])
+        else:
+            self.widgets[role].append(widget)
+            widget.configure(widget_options(self.theme)[role])
+
+    def register_view(self, view):
+        self.views.append(view)
+        self._color_view(view)
+
+    def _color_view(self, view):
+        theme = self.theme
+        view.set_colors(theme["text_bg"], theme["fg"], theme["bg_main"])
+
+    # ------------------ SWITCHING ------------------
+
+    def _style(self):
+        theme = self.theme
+        for style, options in style_options(theme).items():
+            self.style.configure(style, **options)
+        for style, states in style_maps(theme).items():
+            self.style.map(style, **states)
+
+    def switch(self, name):
+        if name == self.name:
+            return
+        self.name = name
+        self._style()  # Every styled widget follows at once
+        options = widget_options(self.theme)
+        for role, widgets in self.widgets.items():
+            for widget in widgets:
+                widget.configure(options[role])
+        for view in self.views:
+            self._color_view(view)
+
+    def toggle(self):
+        self.switch("dark" if self.name == "light" else "light")
@@ -1,98 +1,79 @@
+import os
+import sys
+import time
 import tkinter as tk
-import random
-from PIL import Image, ImageTk, ImageSequence
-import winsound  # <- Windows sound library
-
-# --- JOKES LIST ---
-jokes = [
-    "Why did the chicken cross the road?To get to the other side.",
-    "What happens if you boil a clown?You get a laughing stock.",
-    "Why did the car get a flat tire?Because there was a fork in the road!",
-    "How did the hipster burn his mouth?He ate his pizza before it was cool.",
-    "What did the janitor say when he jumped out of the closet?SUPPLIES!!!!",
-    "Have you heard about the band 1023MB?It's probably because they haven't got a gig yet…",
-    "Why does the golfer wear two pants?Because he's afraid he might get a 'Hole-in-one.'",
-    "Why should you wear glasses to maths class?Because it helps with division.",
-    "Why does it take pirates so long to learn the alphabet?Because they could spend years at C.",
-    "Why did the woman go on the date with the mushroom?Because he was a fun-ghi.",
-    "Why do bananas never get lonely?Because they hang out in bunches.",
-    "What did the buffalo say when his kid went to college?Bison.",
-    "Why shouldn't you tell secrets in a cornfield?Too many ears.",
-    "What do you call someone who doesn't like carbs?Lack-Toast Intolerant.",
-    "Why did the can crusher quit his job?Because it was soda pressing.",
-    "Why did the birthday boy wrap himself in paper?He wanted to live in the present.",
-    "What does a house wear?A dress.",
-    "Why couldn't the toilet paper cross the road?Because it got stuck in a crack.",
-    "Why didn't the bike want to go anywhere?Because it was two-tired!",
-    "Want to hear a pizza joke?Nahhh, it's too cheesy!",
-    "Why are chemists great at solving problems?Because they have all of the solutions!",
-    "Why is it impossible to starve in the desert?Because of all the sand which is there!",
-    "What did the cheese say when it looked in the mirror?Halloumi!",
-    "Why did the developer go broke?Because he used up all his cache.",
-    "Did you know that ants are the only animals that don't get sick?It's true! It's because they have little antibodies.",
-    "Why did the donut go to the dentist?To get a filling.",
-    "What do you call a bear with no teeth?A gummy bear!",
-    "What does a vegan zombie like to eat?Graaains.",
-    "What do you call a dinosaur with only one eye?A Do-you-think-he-saw-us!",
-    "Why should you never fall in love with a tennis player?Because to them... love means NOTHING!",
-    "What did the full glass say to the empty glass?You look drunk.",
-    "What's a potato's favorite form of transportation?The gravy train.",
-    "What did one ocean say to the other?Nothing, they just waved.",
-    "What did the right eye say to the left eye?Honestly, between you and me something smells.",
-    "What do you call a dog that's been run over by a steamroller?Spot!",
-    "What's the difference between a hippo and a zippo?One's pretty heavy and the other's a little lighter.",
-    "Why don't scientists trust Atoms?They make up everything."
-]
-
-current_joke = ""
-animation_running = False  # Code to control animation
+
+# instrument.py lives in the repository root, one folder up
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import instrument
+from instrument import span
+from audio_player import AudioPlayer
+from joke_corpus import JokeCorpus
+from joke_scheduler import JokeScheduler
+from sticker_animator import StickerAnimator
+
+startup_begin = time.perf_counter()
+startup_ns = time.perf_counter_ns()
+
+# --- JOKES ---
+# Read from randomJokes.txt through an index, already split into setup and punchline
+with span("alexa.load_jokes"):
+    jokes = JokeCorpus("Exercise-2 Alexa Jokes/randomJokes.txt")
+
+current_joke = None  # Index of the joke on screen
+
+# Every joke is told once before any repeats, carrying on where the last run stopped
+scheduler = JokeScheduler(len(jokes), name="randomJokes")
 
 # --- SOUND FUNCTIONS ---
+# Decoded once and played on a worker thread; set ALEXA_AUDIO to pick a backend
+player = AudioPlayer("Exercise-2 Alexa Jokes/cat_laughing_meme_sound_effect.wav")
+
 def play_sound():
-    winsound.PlaySound(r"Exercise-2 Alexa Jokes/cat_laughing_meme_sound_effect.wav",
-                        winsound.SND_FILENAME | winsound.SND_ASYNC)
+    player.play()
 
 def stop_sound():
-    winsound.PlaySound(None, winsound.SND_PURGE)
+    player.stop()
 
 # --- JOKE FUNCTIONS ---
+def draw_joke():
+    with span("alexa.draw_joke"):
+        joke = scheduler.draw()
+        try:
+            scheduler.save()
+        except OSError:
+            pass  # Losing the place in the cycle is harmless
+    return joke
+
 def show_joke(joke):
-    if '?' in joke:
-        setup = joke.split('?', 1)[0] + '?'
-    else:
-        setup = joke
-    joke_label.config(text=setup)
-    punchline_label.config(text="")
+    with span("alexa.show_joke"):
+        setup, _ = jokes[joke]
+        joke_label.config(text=setup)
+        punchline_label.config(text="")
 
 def tell_joke():
-    global current_joke, animation_running
-    animation_running = False  # Stop animation
+    global current_joke
+    animator.stop()  # Stop animation
     stop_sound()  # Stop sound
-    current_joke = random.choice(jokes)
+    current_joke = draw_joke()
     show_joke(current_joke)
 
 def reveal_joke():
-    global animation_running
-    if current_joke:
-        if '?' in current_joke:
-            punchline = current_joke.split('?', 1)[1]
+    if current_joke is not None:
+        with span("alexa.reveal_joke"):
+            _, punchline = jokes[current_joke]
             punchline_label.config(text=punchline)
-        else:
-            punchline_label.config(text=current_joke)
-        animation_running = True
-        play_sound()  # Start sound
-        animate_sticker()
+            play_sound()  # Start sound
+            animator.start()
     else:
         punchline_label.config(text="Click 'Tell me a joke' first!")
 
 def next_joke():
-    global current_joke, animation_running
-    animation_running = False  # Stop animation
+    global current_joke
+    animator.stop()  # Stop animation
     stop_sound()  # Stop sound
-    new_joke = random.choice(jokes)
-    while new_joke == current_joke and len(jokes) > 1:
-        new_joke = random.choice(jokes)
-    current_joke = new_joke
+    current_joke = draw_joke()
     show_joke(current_joke)
 
 # --- ROOT WINDOW ---
@@ -132,26 +113,8 @@ tk.Button(button_frame, text="Next Joke", command=next_joke, **button_style).pac
 canvas = tk.Canvas(root, width=500, height=200)
 canvas.pack(pady=10)
 
-# LOAD GIF
-sticker_gif = Image.open("animated_cat.gif")
-frames = [ImageTk.PhotoImage(frame.copy().convert("RGBA")) for frame in ImageSequence.Iterator(sticker_gif)]
-gif_width, gif_height = sticker_gif.size
-frame_index = 0
-sticker = canvas.create_image(100, 100, image=frames[0])
-x_velocity = 5
-
-def animate_sticker():
-    global frame_index, x_velocity
-    if not animation_running:
-        return
-    frame_index = (frame_index + 1) % len(frames)
-    canvas.itemconfig(sticker, image=frames[frame_index])
-    canvas.move(sticker, x_velocity, 0)
-    pos = canvas.coords(sticker)
-    if pos[0] + gif_width/2 > 500 or pos[0] - gif_width/2 < 0:
-        x_velocity = -x_velocity
-    delay = sticker_gif.info.get('duration', 100)
-    root.after(delay, animate_sticker)
+# The GIF is decoded in the background the first time a joke is revealed
+animator = StickerAnimator(root, canvas, "animated_cat.gif", x=100, y=100, area_width=500)
 
 try:
     icon = tk.PhotoImage(file="Exercise-2 Alexa Jokes/laugh.png")
@@ -159,4 +122,20 @@ try:
 except Exception as e:
     print("Icon not loaded:", e)
 
-root.mainloop()
\ No newline at end of file
+# Set ALEXA_STATS=1 to print startup time, animation frame drops and sound latency
+if os.environ.get("ALEXA_STATS"):
+    root.after_idle(lambda: print(f"Startup: {(time.perf_counter() - startup_begin) * 1000:.1f} ms"))
+
+# Set APP_PROFILE=1 (or a .json / .trace.json path) to profile this run
+if instrument.ENABLED:
+    root.after_idle(lambda: instrument.record("alexa.startup", startup_ns,
+                                              time.perf_counter_ns() - startup_ns))
+instrument.install(root)
+
+root.mainloop()
+
+player.close()
+
+if os.environ.get("ALEXA_STATS"):
+    print("Animation:", animator.stats())
+    print("Sound:", player.stats())
\ No newline at end of file
@@ -0,0 +1,252 @@
+import io
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+from collections import deque, namedtuple
+
+CHUNK_MS = 20  # Audio handed to a streaming backend at a time; also how quickly it notices a stop
+
+Sound = namedtuple("Sound", "wav pcm channels sample_width rate")
+
+
+def load_wav(path):
+    """Read a WAV file once, keeping both the file bytes and the decoded PCM frames"""
+    with open(path, "rb") as file:
+        data = file.read()
+    with wave.open(io.BytesIO(data)) as reader:
+        pcm = reader.readframes(reader.getnframes())
+        return Sound(data, pcm, reader.getnchannels(), reader.getsampwidth(), reader.getframerate())
+
+
+def duration(sound):
+    return len(sound.pcm) / (sound.channels * sound.sample_width * sound.rate)
+
+
+def stream(sound, cancel, started, write, realtime=False):
+    """Feed the PCM to write() in CHUNK_MS pieces until it ends or cancel is set.
+
+    Backends that do not block like a sound card does pass realtime=True
+    to be held to the sound's own speed.
+    """
+    frame_bytes = sound.channels * sound.sample_width
+    chunk = max(frame_bytes, sound.rate * CHUNK_MS // 1000 * frame_bytes)
+    begin = time.perf_counter()
+    for offset in range(0, len(sound.pcm), chunk):
+        if cancel.is_set():
+            return
+        write(sound.pcm[offset:offset + chunk])
+        if offset == 0:
+            started()
+        if realtime:
+            ahead = (offset + chunk) / (frame_bytes * sound.rate) - (time.perf_counter() - begin)
+            if ahead > 0 and cancel.wait(ahead):
+                return
+
+
+# ------------------ BACKENDS ------------------
+# play() runs on the player's worker thread and blocks until the sound ends
+# or cancel is set. interrupt() may be called from any thread to cut it short.
+
+class NullBackend:
+    """No audio device: plays silence for as long as the sound lasts"""
+    name = "null"
+
+    def play(self, sound, cancel, started):
+        started()
+        cancel.wait(duration(sound))
+
+    def interrupt(self):
+        pass
+
+
+class FileSinkBackend:
+    """Writes whatever would have been played to a WAV file, for checking output without speakers"""
+    name = "file"
+
+    def __init__(self, path, realtime=False):
+        self.path = path
+        self.realtime = realtime
+        self.plays = 0
+
+    def play(self, sound, cancel, started):
+        with wave.open(self.path, "wb") as writer:
+            writer.setnchannels(sound.channels)
+            writer.setsampwidth(sound.sample_width)
+            writer.setframerate(sound.rate)
+            stream(sound, cancel, started, writer.writeframesraw, self.realtime)
+        self.plays += 1
+
+    def interrupt(self):
+        pass
+
+
+class WinsoundBackend:
+    """Windows: plays the WAV straight from memory instead of re-reading the file"""
+    name = "winsound"
+
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def play(self, sound, cancel, started):
+        if cancel.is_set():
+            return
+        started()
+        # SND_MEMORY cannot be combined with SND_ASYNC, which is why this runs on the worker
+        self.winsound.PlaySound(sound.wav, self.winsound.SND_MEMORY)
+
+    def interrupt(self):
+        self.winsound.PlaySound(None, 0)
+
+
+# WAV sample width in bytes -> aplay format; 8-bit WAV samples are unsigned
+APLAY_FORMATS = {1: "U8", 2: "S16_LE", 3: "S24_3LE", 4: "S32_LE"}
+
+
+class AplayBackend:
+    """Linux: streams raw PCM into a long-lived aplay process.
+
+    The process is kept between plays so a reveal doesn't wait for it to
+    start. Stopping while audio is still playing kills it, which also
+    throws away audio already buffered in the pipe, and the next play
+    starts a fresh one. Stopping when nothing is playing leaves it alone.
+    """
+    name = "aplay"
+
+    def __init__(self, command="aplay"):
+        self.command = command
+        self.process = None
+        self.format = None
+        self.playing_until = 0.0  # perf_counter() time the last audio written ends
+        self.lock = threading.Lock()
+
+    def _open(self, sound):
+        fmt = (sound.channels, sound.sample_width, sound.rate)
+        with self.lock:
+            if self.process is not None and (self.process.poll() is not None or self.format != fmt):
+                self._kill()
+            if self.process is None:
+                if sound.sample_width not in APLAY_FORMATS:
+                    raise ValueError(f"aplay cannot play {sound.sample_width * 8}-bit audio.")
+                self.process = subprocess.Popen(
+                    [self.command, "-q", "-t", "raw", "-f", APLAY_FORMATS[sound.sample_width],
+                     "-c", str(sound.channels), "-r", str(sound.rate), "-"],
+                    stdin=subprocess.PIPE, stderr=subprocess.DEVNULL)
+                self.format = fmt
+            return self.process
+
+    def play(self, sound, cancel, started):
+        process = self._open(sound)
+        with self.lock:
+            self.playing_until = time.perf_counter() + duration(sound)
+        try:
+            stream(sound, cancel, started, process.stdin.write)
+            process.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError):
+            pass  # Killed by interrupt(), or aplay gave up
+
+    def _kill(self):
+        self.process.kill()
+        self.process.wait()
+        self.process = None
+
+    def interrupt(self):
+        with self.lock:
+            # Once the audio has run out there is nothing to cut short
+            if self.process is not None and time.perf_counter() < self.playing_until:
+                self._kill()
+                self.playing_until = 0.0
+
+
+def has_audio_device():
+    if sys.platform.startswith("linux"):
+        return os.path.isdir("/dev/snd") and bool(os.listdir("/dev/snd"))
+    return True
+
+
+def choose_backend(setting=None):
+    """Backend from ALEXA_AUDIO (winsound, aplay, null or file:<path>), else the best available"""
+    setting = setting if setting is not None else os.environ.get("ALEXA_AUDIO", "")
+    if setting.startswith("file:"):
+        return FileSinkBackend(setting[5:])
+    if setting == "null":
+        return NullBackend()
+    if setting in ("", "winsound"):
+        try:
+            return WinsoundBackend()
+        except ImportError:
+            if setting:
+                raise
+    if setting == "aplay" or (not setting and shutil.which("aplay") and has_audio_device()):
+        return AplayBackend()
+    if setting:
+        raise ValueError(f"Unknown ALEXA_AUDIO backend: {setting}")
+    return NullBackend()
+
+
+# ------------------ PLAYER ------------------
+
+class AudioPlayer:
+    """Plays one sound on a worker thread; play() and stop() return immediately.
+
+    The WAV is decoded once, on the worker, into memory. Each play()
+    stops whatever is playing first. The time from play() to the first
+    audio reaching the backend is kept in `latencies` (seconds).
+    """
+
+    def __init__(self, path, backend=None):
+        self.path = path
+        self.backend = backend or choose_backend()
+        self.sound = None
+        self.error = None
+        self.cancel = threading.Event()
+        self.requests = queue.Queue()
+        self.latencies = deque(maxlen=100)
+        self.worker = threading.Thread(target=self._run, name="audio-player", daemon=True)
+        self.worker.start()
+
+    def play(self):
+        self.stop()
+        self.cancel = threading.Event()
+        self.requests.put((time.perf_counter(), self.cancel))
+
+    def stop(self):
+        self.cancel.set()
+        self.backend.interrupt()
+
+    def close(self):
+        self.stop()
+        self.requests.put(None)
+        self.worker.join()
+
+    def _run(self):
+        try:
+            self.sound = load_wav(self.path)
+        except (OSError, EOFError, wave.Error) as e:
+            self.error = e  # Keep draining requests so play() stays harmless
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            requested, cancel = request
+            if self.sound is None or cancel.is_set():
+                continue
+            try:
+                self.backend.play(self.sound, cancel,
+                                  lambda: self.latencies.append(time.perf_counter() - requested))
+            except (OSError, ValueError) as e:
+                self.error = e  # aplay missing or the format unsupported; later plays try again
+
+    def stats(self):
+        ms = sorted(seconds * 1000 for seconds in self.latencies)
+        return {
+            "backend": self.backend.name,
+            "plays": len(ms),
+            "latency_ms_median": round(ms[len(ms) // 2], 2) if ms else None,
+            "latency_ms_max": round(ms[-1], 2) if ms else None,
+        }
@@ -0,0 +1,133 @@
+import mmap
+import os
+import struct
+from array import array
+
+CACHE_DIR = ".cache"
+INDEX_MAGIC = b"JIX1"
+INDEX_HEADER = struct.Struct("<4sxxxxQQQ")  # magic, corpus size, corpus mtime, joke count
+NO_SPLIT = 0xFFFFFFFF  # Split offset stored for jokes without a '?'
+
+
+# ------------------ INDEX BUILDING ------------------
+
+def index_path(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{name}.idx")
+
+
+def build_index(path, corpus, source_stat):
+    """Scan the corpus once and save where every joke is.
+
+    For each non-blank line the index keeps its byte offset, its length
+    without the line ending, and the offset of the first '?' inside it,
+    so a joke can be read and split without scanning anything again.
+    """
+    starts, lengths, splits = array("Q"), array("I"), array("I")
+    size = len(corpus)
+    pos = 0
+    while pos < size:
+        end = corpus.find(b"\n", pos)
+        if end == -1:
+            end = size
+        line_end = end
+        if line_end > pos and corpus[line_end - 1] == 13:  # Drop a Windows '\r'
+            line_end -= 1
+        if line_end > pos:
+            question = corpus.find(b"?", pos, line_end)
+            starts.append(pos)
+            lengths.append(line_end - pos)
+            splits.append(NO_SPLIT if question == -1 else question - pos)
+        pos = end + 1
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = index_path(path) + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, source_stat.st_size,
+                                     source_stat.st_mtime_ns, len(starts)))
+        starts.tofile(file)
+        lengths.tofile(file)
+        splits.tofile(file)
+    os.replace(tmp_path, index_path(path))
+
+
+# ------------------ CORPUS ------------------
+
+def random_access(mapping):
+    """Tell the OS not to read ahead around each joke (not available everywhere)"""
+    if hasattr(mmap, "MADV_RANDOM"):
+        mapping.madvise(mmap.MADV_RANDOM)
+
+
+class JokeCorpus:
+    """Random access to a joke file of any size through mmap.
+
+    Neither the jokes nor the index are read into memory up front: both
+    files are memory-mapped and only the pages for the jokes actually
+    shown are touched. The index is built on first use and reused while
+    the corpus file is unchanged.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        source_stat = os.fstat(self.file.fileno())
+        self.corpus = b""
+        if source_stat.st_size:
+            self.corpus = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            random_access(self.corpus)
+
+        if not self._open_index(source_stat):
+            build_index(path, self.corpus, source_stat)
+            if not self._open_index(source_stat):
+                raise OSError(f"Could not read the joke index for {path}.")
+
+    def _open_index(self, source_stat):
+        try:
+            with open(index_path(self.path), "rb") as file:
+                magic, size, mtime, count = INDEX_HEADER.unpack(file.read(INDEX_HEADER.size))
+                if (magic != INDEX_MAGIC or size != source_stat.st_size
+                        or mtime != source_stat.st_mtime_ns):
+                    return False
+                index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, struct.error, ValueError):
+            return False
+
+        # A truncated or padded index would hand out offsets that aren't there
+        if len(index) != INDEX_HEADER.size + 16 * count:
+            index.close()
+            return False
+        random_access(index)
+        self.index = index
+        self.count = count
+        self.view = memoryview(index)
+        pos = INDEX_HEADER.size
+        self.starts = self.view[pos:pos + 8 * count].cast("Q")
+        pos += 8 * count
+        self.lengths = self.view[pos:pos + 4 * count].cast("I")
+        pos += 4 * count
+        self.splits = self.view[pos:pos + 4 * count].cast("I")
+        return True
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        """(setup, punchline) for joke i; a joke without '?' is both"""
+        if not 0 <= i < self.count:
+            raise IndexError("joke index out of range")
+        start = self.starts[i]
+        line = self.corpus[start:start + self.lengths[i]]
+        split = self.splits[i]
+        if split == NO_SPLIT:
+            text = line.decode("utf-8")
+            return text, text
+        return line[:split + 1].decode("utf-8"), line[split + 1:].decode("utf-8")
+
+    def close(self):
+        for view in (self.starts, self.lengths, self.splits, self.view):
+            view.release()
+        self.index.close()
+        if isinstance(self.corpus, mmap.mmap):
+            self.corpus.close()
+        self.file.close()
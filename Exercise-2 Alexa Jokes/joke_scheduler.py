@@ -0,0 +1,126 @@
+import os
+import random
+import struct
+
+CACHE_DIR = ".cache"
+STATE_MAGIC = b"JSC1"
+STATE = struct.Struct("<4sQQQQq")  # magic, joke count, seed, cycle, position, last joke (-1 = none)
+MASK64 = (1 << 64) - 1
+ROUNDS = 4
+
+
+# ------------------ PERMUTATION ------------------
+
+def mix64(value):
+    """splitmix64 finaliser: spreads every input bit over the whole 64-bit result"""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+class Permutation:
+    """A random ordering of range(n) that is computed, never stored.
+
+    A small Feistel network shuffles the bits of a number inside the
+    smallest power-of-4 range that holds n; results that land outside
+    range(n) are fed through again (cycle walking). Every value still
+    comes out exactly once and at most four rounds of walking are
+    expected, so any position is looked up in O(1). The round functions
+    are tables over half the bits, about 4 * sqrt(n) numbers in total.
+    """
+
+    def __init__(self, n, key):
+        self.n = n
+        half_bits = max(1, ((n - 1).bit_length() + 1) // 2)
+        self.shift = half_bits
+        self.half_mask = (1 << half_bits) - 1
+        self.tables = []
+        for r in range(ROUNDS):
+            round_key = mix64(key * ROUNDS + r)
+            self.tables.append([mix64(half ^ round_key) & self.half_mask
+                                for half in range(self.half_mask + 1)])
+
+    def _encrypt(self, value):
+        t0, t1, t2, t3 = self.tables
+        left, right = value >> self.shift, value & self.half_mask
+        left ^= t0[right]
+        right ^= t1[left]
+        left ^= t2[right]
+        right ^= t3[left]
+        return (left << self.shift) | right
+
+    def __getitem__(self, position):
+        value = self._encrypt(position)
+        while value >= self.n:
+            value = self._encrypt(value)
+        return value
+
+    def __len__(self):
+        return self.n
+
+
+# ------------------ SCHEDULER ------------------
+
+def state_path(name):
+    return os.path.join(CACHE_DIR, f"{name}.order")
+
+
+class JokeScheduler:
+    """Hands out joke numbers so each joke is told once before any repeats.
+
+    Each cycle walks a fresh Permutation, so a draw is a fixed amount of
+    work whatever the corpus size. The same joke is never drawn twice in
+    a row, not even across a cycle boundary. save() stores the few
+    numbers needed to carry on from the same place after a restart.
+    """
+
+    def __init__(self, count, name="jokes", seed=None):
+        self.count = count
+        self.path = state_path(name)
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.cycle = 0
+        self.position = 0
+        self.last = -1
+        if seed is None:
+            self._load()
+        self.order = Permutation(count, self._cycle_key())
+
+    def _cycle_key(self):
+        return mix64(self.seed ^ mix64(self.cycle))
+
+    def _load(self):
+        try:
+            with open(self.path, "rb") as file:
+                magic, count, seed, cycle, position, last = STATE.unpack(file.read(STATE.size))
+        except (OSError, struct.error):
+            return
+        if magic == STATE_MAGIC and count == self.count and position <= count:
+            self.seed, self.cycle, self.position, self.last = seed, cycle, position, last
+
+    def _next_cycle(self):
+        self.cycle += 1
+        self.position = 0
+        self.order = Permutation(self.count, self._cycle_key())
+        # A new cycle must not open with the joke that closed the last one
+        while self.count > 1 and self.order[0] == self.last:
+            self.cycle += 1
+            self.order = Permutation(self.count, self._cycle_key())
+
+    def draw(self):
+        """Number of the next joke to tell"""
+        if self.count == 0:
+            raise IndexError("no jokes to draw from")
+        if self.position >= self.count:
+            self._next_cycle()
+        self.last = self.order[self.position]
+        self.position += 1
+        return self.last
+
+    def save(self):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(STATE.pack(STATE_MAGIC, self.count, self.seed, self.cycle,
+                                  self.position, self.last))
+        os.replace(tmp_path, self.path)
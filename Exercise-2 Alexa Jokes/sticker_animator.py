@@ -0,0 +1,210 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right
+
+from PIL import Image, ImageSequence, ImageTk
+
+CACHE_DIR = ".cache"
+CACHE_MAGIC = b"FRM1"
+HEADER = struct.Struct("<4sQQHHH")  # magic, source size, source mtime, width, height, frames
+FRAME_HEADER = struct.Struct("<HI")  # duration in ms, compressed length
+DEFAULT_DURATION = 100
+POLL_MS = 15  # How often to check whether the decode worker has finished
+
+
+# ------------------ FRAME DECODING ------------------
+
+def decode_gif(path):
+    """Return (size, [(duration ms, RGBA bytes), ...]) for every frame of a GIF"""
+    with Image.open(path) as gif:
+        frames = [(frame.info.get("duration") or DEFAULT_DURATION,
+                   frame.convert("RGBA").tobytes())
+                  for frame in ImageSequence.Iterator(gif)]
+        return gif.size, frames
+
+
+def cache_path(path):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{name}.frames")
+
+
+def read_cache(path, source_stat):
+    """Frames from the on-disk cache, or None if it is missing or out of date"""
+    try:
+        with open(cache_path(path), "rb") as file:
+            magic, size, mtime, width, height, count = HEADER.unpack(file.read(HEADER.size))
+            if (magic != CACHE_MAGIC or size != source_stat.st_size
+                    or mtime != source_stat.st_mtime_ns):
+                return None
+            frames = []
+            for _ in range(count):
+                duration, length = FRAME_HEADER.unpack(file.read(FRAME_HEADER.size))
+                frames.append((duration, zlib.decompress(file.read(length))))
+            return (width, height), frames
+    except (OSError, struct.error, zlib.error):
+        return None
+
+
+def write_cache(path, source_stat, size, frames):
+    """Store decoded frames as zlib-compressed RGBA so later runs skip the GIF decode"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = cache_path(path) + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(CACHE_MAGIC, source_stat.st_size, source_stat.st_mtime_ns,
+                               size[0], size[1], len(frames)))
+        for duration, data in frames:
+            packed = zlib.compress(data, 1)
+            file.write(FRAME_HEADER.pack(duration, len(packed)))
+            file.write(packed)
+    os.replace(tmp_path, cache_path(path))
+
+
+class FrameSource:
+    """GIF frames decoded once, off the Tk thread, and turned into PhotoImages on demand"""
+
+    def __init__(self, path):
+        self.path = path
+        self.size = None
+        self.raw = None        # [(duration, RGBA bytes)] once the worker is done
+        self.photos = []
+        self.ends = []         # Cumulative end time of each frame in ms
+        self.from_cache = False
+        self.decode_seconds = None
+        self.worker = None
+        self.error = None
+
+    def load_async(self):
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._load, name="gif-decoder", daemon=True)
+            self.worker.start()
+
+    @property
+    def ready(self):
+        return self.raw is not None
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            source_stat = os.stat(self.path)
+            cached = read_cache(self.path, source_stat)
+            if cached is None:
+                size, frames = decode_gif(self.path)
+                try:
+                    write_cache(self.path, source_stat, size, frames)
+                except OSError:
+                    pass  # The cache is only a speed-up
+            else:
+                size, frames = cached
+                self.from_cache = True
+        except OSError as e:
+            self.error = e
+            return
+
+        total = 0
+        for duration, _ in frames:
+            total += duration
+            self.ends.append(total)
+        self.size = size
+        self.photos = [None] * len(frames)
+        self.decode_seconds = time.perf_counter() - start
+        self.raw = frames  # Set last: the Tk thread treats this as "ready"
+
+    def photo(self, index):
+        """PhotoImage for a frame; must be called on the Tk thread"""
+        photo = self.photos[index]
+        if photo is None:
+            image = Image.frombytes("RGBA", self.size, self.raw[index][1])
+            photo = self.photos[index] = ImageTk.PhotoImage(image)
+        return photo
+
+    def frame_at(self, ms):
+        """Index of the frame that should be showing `ms` into the loop"""
+        return bisect_right(self.ends, ms % self.ends[-1])
+
+
+# ------------------ ANIMATOR ------------------
+
+class StickerAnimator:
+    """Plays the sticker on a canvas, bouncing it left and right.
+
+    The frame shown is picked from the wall clock and each frame's own
+    duration, so when the Tk loop is busy late frames are skipped rather
+    than the whole animation slowing down. Skipped frames are counted.
+    """
+
+    def __init__(self, root, canvas, path, x, y, area_width, speed=83):
+        self.root = root
+        self.canvas = canvas
+        self.frames = FrameSource(path)
+        self.item = canvas.create_image(x, y)
+        self.area_width = area_width
+        self.velocity = speed  # Pixels per second
+        self.running = False
+        self.job = None
+        self.started = 0.0
+        self.last_tick = 0.0
+        self.last_frame = None
+        self.frames_shown = 0
+        self.frames_dropped = 0
+
+    def start(self):
+        self.stop()
+        self.running = True
+        self.frames.load_async()
+        self.started = self.last_tick = time.perf_counter()
+        self.last_frame = None
+        self._tick()
+
+    def stop(self):
+        self.running = False
+        if self.job is not None:
+            self.root.after_cancel(self.job)
+            self.job = None
+
+    def _tick(self):
+        self.job = None
+        if not self.running:
+            return
+        if not self.frames.ready:
+            if self.frames.error is None:
+                self.job = self.root.after(POLL_MS, self._tick)
+            return
+
+        now = time.perf_counter()
+        elapsed_ms = (now - self.started) * 1000
+        index = self.frames.frame_at(elapsed_ms)
+        count = len(self.frames.photos)
+
+        if index != self.last_frame:
+            if self.last_frame is not None:
+                self.frames_dropped += (index - self.last_frame - 1) % count
+            self.canvas.itemconfig(self.item, image=self.frames.photo(index))
+            self.last_frame = index
+            self.frames_shown += 1
+
+        self._move(now - self.last_tick)
+        self.last_tick = now
+
+        # Wake up when the current frame is due to end
+        loop_ms = elapsed_ms % self.frames.ends[-1]
+        delay = self.frames.ends[index] - loop_ms
+        self.job = self.root.after(max(1, int(delay)), self._tick)
+
+    def _move(self, seconds):
+        self.canvas.move(self.item, self.velocity * seconds, 0)
+        x = self.canvas.coords(self.item)[0]
+        half = self.frames.size[0] / 2
+        if (x + half > self.area_width and self.velocity > 0) or (x - half < 0 and self.velocity < 0):
+            self.velocity = -self.velocity
+
+    def stats(self):
+        return {
+            "decode_ms": None if self.frames.decode_seconds is None
+            else round(self.frames.decode_seconds * 1000, 1),
+            "from_cache": self.frames.from_cache,
+            "frames_shown": self.frames_shown,
+            "frames_dropped": self.frames_dropped,
+        }
@@ -1,30 +1,36 @@
+import getpass
+import os
+import threading
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
-import random
+
+import instrument
+from background import BackgroundRenderer
+from instrument import count, span
+from quiz_client import connect
 
 class MathQuizApp:
-    def __init__(self, root):
+    def __init__(self, root, client=None):
         self.root = root
         self.root.title("Math Quiz")
         self.root.geometry("800x600")
 
-        # Load original image
-        self.original_image = Image.open("chalkboard.png")
-        self.bg_image = ImageTk.PhotoImage(self.original_image)
-
-        # Background label
-        self.bg_label = tk.Label(root, image=self.bg_image)
+        # Background label, drawn by a cached, debounced renderer; the full
+        # image loads in the background while a cached copy stands in
+        self.bg_label = tk.Label(root)
         self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+        self.background = BackgroundRenderer(root, self.bg_label, "chalkboard.png")
+        self.background.show(800, 600)
 
         # Update background when window resizes
         self.root.bind("<Configure>", self.resize_bg)
 
-        # Variables
-        self.score = 0
-        self.question_count = 0
-        self.attempt = 1
+        # Quiz state lives in the engine; the app only shows it
+        self.client = client if client is not None else connect()
         self.difficulty = None  # Will store chosen difficulty
+        # Adaptive quizzes remember how well this player did last time
+        self.player = os.environ.get("MATHQUIZ_PLAYER") or getpass.getuser()
+        self.question = None
 
         # Create menu frame (shown first)
         self.menu_frame = tk.Frame(root, bg="white", bd=5)
@@ -32,14 +38,13 @@ class MathQuizApp:
 
         self.display_menu()
 
+        # Load the quiz engine once the menu is up, not before
+        self.root.after_idle(lambda: threading.Thread(
+            target=self.client.prepare, name="quiz-prepare", daemon=True).start())
+
     def resize_bg(self, event):
         """Dynamically resize background image when window changes size"""
-        new_width = event.width
-        new_height = event.height
-        resized = self.original_image.resize((new_width, new_height), Image.LANCZOS)
-        self.bg_image = ImageTk.PhotoImage(resized)
-        self.bg_label.config(image=self.bg_image)
-        self.bg_label.image = self.bg_image
+        self.background.on_configure(event)
 
     def display_menu(self):
         """Show difficulty selection menu"""
@@ -57,6 +62,9 @@ class MathQuizApp:
         tk.Button(self.menu_frame, text="3. Advanced", font=("Arial", 16),
                   command=lambda: self.start_quiz("Advanced")).pack(pady=10)
 
+        tk.Button(self.menu_frame, text="4. Adaptive", font=("Arial", 16),
+                  command=lambda: self.start_quiz("Adaptive")).pack(pady=10)
+
         # NEW: Instructions button
         tk.Button(self.menu_frame, text="Instructions", font=("Arial", 16),
                   command=self.show_instructions).pack(pady=10)
@@ -75,7 +83,8 @@ class MathQuizApp:
                  font=("Arial", 22, "bold"), bg="white").pack(pady=10)
 
         instructions = (
-            "1. Select a difficulty level (Easy, Moderate, Advanced).\n"
+            "1. Select a difficulty level (Easy, Moderate, Advanced),\n"
+            "   or Adaptive, which gets harder or easier as you answer.\n"
             "2. You will be given 10 math questions.\n"
             "3. Type your answer and click Submit.\n"
             "4. You get 2 attempts per question:\n"
@@ -105,14 +114,17 @@ class MathQuizApp:
 
     def start_quiz(self, difficulty):
         """Initialize quiz based on chosen difficulty"""
+        # New session: score 0, first question, first attempt
+        try:
+            with span("mathquiz.start_quiz"):
+                first_question = self.client.start(difficulty, self.player)["question"]
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Quiz", f"The quiz could not be started:\n{e}")
+            return  # The menu is still up, so the player can try again
+
         self.difficulty = difficulty
         self.menu_frame.destroy()  # Remove menu screen
 
-        # Reset values
-        self.score = 0
-        self.question_count = 0
-        self.attempt = 1
-
         # Create main content frame
         self.frame = tk.Frame(self.root, bg="white", bd=5)
         self.frame.place(relx=0.5, rely=0.5, anchor="center")
@@ -136,97 +148,62 @@ class MathQuizApp:
         self.result_label = tk.Label(self.frame, text="", font=("Arial", 14))
         self.result_label.pack(pady=10)
 
-        self.generate_question()
+        self.generate_question(first_question)
 
-    def generate_question(self):
-        """Generate a new math question based on difficulty"""
-        if self.difficulty == "Easy":
-            self.num1 = random.randint(1, 10)
-            self.num2 = random.randint(1, 10)
-            self.operator = random.choice(['+', '-'])
-
-        elif self.difficulty == "Moderate":
-            self.num1 = random.randint(10, 50)
-            self.num2 = random.randint(10, 50)
-            self.operator = random.choice(['+', '-'])
-
-        else:  # Advanced
-            self.num1 = random.randint(1000, 9999)
-            self.num2 = random.randint(1000, 9999)
-            self.operator = random.choice(['+', '-'])
-
-        self.attempt = 1
+    def generate_question(self, question):
+        """Show the next question handed out by the quiz engine"""
+        self.question = question
         self.update_question_label()
 
     def update_question_label(self):
         """Update the question label"""
-        question_number = self.question_count + 1
+        q = self.question
+        if "level" in q:
+            self.difficulty_label.config(text=f"Difficulty: {self.difficulty} (level {q['level']})")
         self.question_label.config(
-            text=f"{question_number}) {self.num1} {self.operator} {self.num2}?"
+            text=f"{q['number']}) {q['num1']} {q['operator']} {q['num2']}?"
         )
 
     def check_answer(self):
         try:
             user_answer = float(self.answer_entry.get())
-
-            if self.operator == '+':
-                correct_answer = self.num1 + self.num2
-            elif self.operator == '-':
-                correct_answer = self.num1 - self.num2
-
-            # Correct answer
-            if abs(user_answer - correct_answer) < 0.01:
-                points = 10 if self.attempt == 1 else 5
-                self.score += points
-                self.result_label.config(text=f"Correct! You earned {points} points.", fg="green")
-                self.score_label.config(text=f"Score: {self.score}")
-
-                self.question_count += 1
-                self.answer_entry.delete(0, tk.END)
-
-                if self.question_count < 10:
-                    self.generate_question()
-                else:
-                    self.end_quiz()
-
-            else:
-                if self.attempt == 1:
-                    self.attempt = 2
-                    self.result_label.config(text="Wrong! Try again for 5 points.", fg="orange")
-                    self.answer_entry.delete(0, tk.END)
-                else:
-                    self.result_label.config(
-                        text=f"Wrong again! The correct answer was {correct_answer}. Moving to next question.",
-                        fg="red"
-                    )
-                    self.answer_entry.delete(0, tk.END)
-                    self.question_count += 1
-                    if self.question_count < 10:
-                        self.generate_question()
-                    else:
-                        self.end_quiz()
-                    self.attempt = 1
-
         except ValueError:
             self.result_label.config(text="Please enter a valid number.", fg="red")
             self.answer_entry.delete(0, tk.END)
+            return
 
-    def end_quiz(self):
-        """End of quiz prompt with grade"""
-        if self.score >= 90:
-            grade = "A+"
-        elif self.score >= 80:
-            grade = "A"
-        elif self.score >= 70:
-            grade = "B"
-        elif self.score >= 60:
-            grade = "C"
-        elif self.score >= 50:
-            grade = "D"
+        try:
+            with span("mathquiz.answer"):
+                result = self.client.answer(user_answer)
+        except (ValueError, OSError) as e:
+            # A server error or a dropped connection; the answer can be sent again
+            messagebox.showerror("Quiz", f"The answer could not be checked:\n{e}")
+            return
+        count(f"mathquiz.answers.{result['outcome']}")
+        self.answer_entry.delete(0, tk.END)
+        self.score_label.config(text=f"Score: {result['score']}")
+
+        if result["outcome"] == "correct":
+            self.result_label.config(text=f"Correct! You earned {result['points']} points.", fg="green")
+        elif result["outcome"] == "retry":
+            self.result_label.config(text="Wrong! Try again for 5 points.", fg="orange")
         else:
-            grade = "F"
-
-        self.result_label.config(text=f"Quiz over! Final score: {self.score} | Grade: {grade}", fg="blue")
+            self.result_label.config(
+                text=f"Wrong again! The correct answer was {result['correct_answer']}. Moving to next question.",
+                fg="red"
+            )
+
+        if result["finished"]:
+            self.end_quiz(result["score"], result["grade"], result.get("rank"), result.get("players"))
+        elif result["outcome"] != "retry":
+            self.generate_question(result["question"])
+
+    def end_quiz(self, score, grade, rank=None, players=None):
+        """End of quiz prompt with grade, and leaderboard rank when results are kept"""
+        text = f"Quiz over! Final score: {score} | Grade: {grade}"
+        if rank is not None:
+            text += f" | Best score rank: #{rank} of {players}"
+        self.result_label.config(text=text, fg="blue")
         self.submit_button.config(state=tk.DISABLED)
 
         play_again = messagebox.askyesno("Play?", "Quiz over! Would you like to play again?")
@@ -241,5 +218,17 @@ class MathQuizApp:
 if __name__ == "__main__":
     root = tk.Tk()
     root.iconbitmap("logo.ico")
-    app = MathQuizApp(root)
-    root.mainloop()
\ No newline at end of file
+    # Set MATHQUIZ_SERVER=host:port to play against quiz_server.py
+    with span("mathquiz.startup"):
+        app = MathQuizApp(root, connect(os.environ.get("MATHQUIZ_SERVER")))
+    # Set APP_PROFILE=1 (or a .json / .trace.json path) to profile this run
+    instrument.install(root)
+    root.mainloop()
+    try:
+        app.client.close()  # Writes out results still waiting
+    except OSError as e:
+        print("Quiz results could not be saved:", e)
+
+    # Set MATHQUIZ_FRAME_STATS=1 to see how long background frames took
+    if os.environ.get("MATHQUIZ_FRAME_STATS"):
+        print("Background frames:", app.background.stats())
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""Adaptive difficulty for the maths quiz.
+
+Questions come from LEVELS, easiest first, each with a bucket of
+pre-generated questions. Every player has a skill rating, updated
+Elo-style after every question: a level's difficulty is its position
+times LEVEL_STEP, and the chance of a right answer is a logistic curve
+over skill minus difficulty. The next question comes from the level the
+player should get right about TARGET_SUCCESS of the time, so picking
+one is a little arithmetic and a list lookup whatever the bank size.
+
+Ratings are kept in SkillStore, 16 bytes per player. Answers only
+change them in memory; when a quiz ends the changed records are handed
+to a writer thread, so answering never waits for the disk.
+"""
+import hashlib
+import math
+import os
+import random
+import struct
+import threading
+
+import numpy as np
+
+from question_bank import Question
+
+# operator, range of the first number, range of the second number.
+# For "÷" the ranges are for the divisor and the answer, so it always divides exactly.
+LEVELS = [
+    ("+", (1, 10), (1, 10)),
+    ("-", (1, 10), (1, 10)),
+    ("+", (10, 50), (10, 50)),
+    ("×", (2, 9), (2, 9)),
+    ("-", (10, 50), (10, 50)),
+    ("÷", (2, 9), (2, 9)),
+    ("+", (100, 999), (100, 999)),
+    ("×", (2, 12), (10, 50)),
+    ("-", (100, 999), (100, 999)),
+    ("÷", (2, 12), (10, 50)),
+    ("+", (1000, 9999), (1000, 9999)),
+    ("-", (1000, 9999), (1000, 9999)),
+    ("×", (10, 99), (10, 99)),
+    ("÷", (10, 99), (10, 99)),
+]
+
+BUCKET_SIZE = 4096       # Questions pre-generated per level
+LEVEL_STEP = 100         # Rating points between neighbouring levels
+SCALE = 100              # Rating gap that turns even odds into about 73%
+TARGET_SUCCESS = 0.75    # How often a player should get the chosen level right
+START_SKILL = 150.0
+K_NEW = 120              # Rating change per question while a player is new
+K_SETTLED = 24           # ...and once SETTLE_AFTER questions have been answered
+SETTLE_AFTER = 20
+SKILLS_PATH = os.path.join(".cache", "skills.bin")
+
+TARGET_OFFSET = SCALE * math.log(TARGET_SUCCESS / (1 - TARGET_SUCCESS))
+
+
+# ------------------ QUESTION BUCKETS ------------------
+
+def generate_bucket(operator, first, second, size=BUCKET_SIZE, seed=None):
+    """`size` random questions for one level, as Question tuples"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(first[0], first[1] + 1, size=size, dtype=np.int64)
+    b = rng.integers(second[0], second[1] + 1, size=size, dtype=np.int64)
+    if operator == "+":
+        num1, num2, answer = a, b, a + b
+    elif operator == "-":
+        num1, num2, answer = a, b, a - b
+    elif operator == "×":
+        num1, num2, answer = a, b, a * b
+    else:  # "÷": divisor a, answer b
+        num1, num2, answer = a * b, a, b
+    return [Question(n1, n2, operator, ans)
+            for n1, n2, ans in zip(num1.tolist(), num2.tolist(), answer.tolist())]
+
+
+def key_for(player):
+    """8-byte hash of a player name; the name itself is never stored"""
+    return int.from_bytes(hashlib.blake2b(player.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# ------------------ SKILL STORE ------------------
+
+RECORD = struct.Struct("<QfI")  # player key, skill, questions answered
+
+
+class SkillStore:
+    """Fixed-size skill records in one file, updated in place.
+
+    The file is read into a dict the first time it is needed; after that
+    a lookup is a dict hit. put() only marks the player dirty and flush()
+    only wakes a writer thread, which rewrites the 16-byte record of each
+    dirty player, so neither ever waits for the disk. As in ResultsStore,
+    a write error is kept and raised by close(); the ratings in memory are
+    unaffected and the records are tried again at the next flush.
+    """
+
+    def __init__(self, path=SKILLS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)  # Tells the writer to write now
+        self.file = None
+        self.opened = False
+        self.ratings = {}  # key -> (skill, answered, slot)
+        self.dirty = set()  # Keys changed since the last flush
+        self.flush_requested = False
+        self.error = None
+        self.closed = False
+        self.writer = threading.Thread(target=self._write_loop, name="skills-writer", daemon=True)
+        self.writer.start()
+
+    def _open(self):
+        self.opened = True
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if not os.path.exists(self.path):
+                open(self.path, "wb").close()
+            self.file = open(self.path, "r+b")
+            data = self.file.read()
+        except OSError as e:
+            self.error = e  # Ratings are kept in memory only
+            return
+        usable = len(data) - len(data) % RECORD.size  # Ignore a torn last record
+        for slot, (key, skill, answered) in enumerate(RECORD.iter_unpack(data[:usable])):
+            self.ratings[key] = (skill, answered, slot)
+        if usable != len(data):
+            self.file.truncate(usable)
+
+    def get(self, player):
+        """(skill, questions answered) for a player, or the starting rating"""
+        with self.lock:
+            if not self.opened:
+                self._open()
+            rating = self.ratings.get(key_for(player))
+        return (START_SKILL, 0) if rating is None else rating[:2]
+
+    def put(self, player, skill, answered):
+        key = key_for(player)
+        with self.lock:
+            if not self.opened:
+                self._open()
+            rating = self.ratings.get(key)
+            slot = len(self.ratings) if rating is None else rating[2]
+            self.ratings[key] = (skill, answered, slot)
+            self.dirty.add(key)
+
+    def flush(self):
+        """Have the writer thread save every changed record; returns straight away"""
+        with self.lock:
+            if self.dirty:
+                self.flush_requested = True
+                self.wake.notify()
+
+    def _write_loop(self):
+        while True:
+            with self.lock:
+                while not (self.closed or self.flush_requested):
+                    self.wake.wait()
+                self.flush_requested = False
+                keys, self.dirty = self.dirty, set()
+                records = sorted((self.ratings[key][2], key) + self.ratings[key][:2] for key in keys)
+                closing = self.closed
+            if records and self.file is not None:
+                try:
+                    for slot, key, skill, answered in records:
+                        self.file.seek(slot * RECORD.size)
+                        self.file.write(RECORD.pack(key, skill, answered))
+                    self.file.flush()
+                except OSError as e:
+                    self.error = e  # Kept for close() to report
+                    with self.lock:
+                        self.dirty |= keys
+            if closing:
+                return
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.wake.notify()
+        self.writer.join()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.error is not None:
+            raise self.error
+
+
+# ------------------ SKILL MODEL ------------------
+
+def expected(skill, level):
+    """Chance that a player with `skill` gets a question at `level` right"""
+    return 1 / (1 + math.exp((level * LEVEL_STEP - skill) / SCALE))
+
+
+def level_for(skill):
+    """The level a player with `skill` should get right TARGET_SUCCESS of the time"""
+    level = round((skill - TARGET_OFFSET) / LEVEL_STEP)
+    return min(max(level, 0), len(LEVELS) - 1)
+
+
+def update(skill, answered, level, outcome):
+    """New (skill, answered) after one question.
+
+    `outcome` is 1 for a right answer, 0.5 for right at the second attempt
+    and 0 for wrong.
+    """
+    k = K_NEW if answered < SETTLE_AFTER else K_SETTLED
+    return skill + k * (outcome - expected(skill, level)), answered + 1
+
+
+class SkillModel:
+    """Question buckets, the player ratings and the picking rule, shared by all sessions"""
+
+    def __init__(self, store=None, seed=None):
+        self.rng = random.Random(seed)
+        seeds = np.random.SeedSequence(seed).spawn(len(LEVELS))
+        self.buckets = [generate_bucket(op, first, second, seed=level_seed)
+                        for (op, first, second), level_seed in zip(LEVELS, seeds)]
+        self.store = store
+
+    def rating(self, player):
+        if self.store is None or player is None:
+            return START_SKILL, 0
+        return self.store.get(player)
+
+    def save(self, player, skill, answered):
+        if self.store is not None and player is not None:
+            self.store.put(player, skill, answered)
+
+    def flush(self):
+        """Hand the ratings changed since the last flush to the writer; called when a quiz ends"""
+        if self.store is not None:
+            self.store.flush()
+
+    def pick(self, skill, asked=()):
+        """(level, Question) for the next question, never one in the set `asked`"""
+        level = level_for(skill)
+        bucket = self.buckets[level]
+        while True:
+            question = bucket[self.rng.randrange(len(bucket))]
+            if question not in asked:
+                return level, question
@@ -0,0 +1,302 @@
+"""Window backgrounds for the maths quiz: resized quickly, loaded off the Tk thread.
+
+PIL is only imported by the loader thread and the render code, so the
+menu can be shown before it is loaded. Until the full image is ready the
+window shows a pre-scaled copy from the disk cache (read by Tk itself),
+a tiny cached thumbnail blown up, or a plain colour, in that order.
+"""
+import hashlib
+import os
+import threading
+import time
+import tkinter as tk
+from collections import OrderedDict, deque
+
+from instrument import span
+
+SIZE_BUCKET = 32     # Fast frames during a drag are rendered at sizes rounded up to this
+CACHE_SIZE = 12      # Rendered backgrounds kept in memory
+SETTLE_MS = 150      # Quiet time after the last resize before the high quality pass
+MIN_LEVEL_SIZE = 64  # Smallest mipmap level
+CACHE_DIR = os.path.join(".cache", "backgrounds")
+DISK_VARIANTS = 16   # Pre-scaled backgrounds kept on disk, oldest removed first
+THUMB_SIZE = (100, 75)
+PLACEHOLDER_COLOR = "#4f473e"  # Average colour of chalkboard.png
+POLL_MS = 15         # How often to check whether the loader thread has finished
+
+
+# ------------------ MIPMAP PYRAMID ------------------
+
+class BackgroundPyramid:
+    """A source image plus pre-halved copies of it, for quick resizing.
+
+    Each resize starts from the smallest level that is still at least as
+    big as the target, so shrinking a large image to a small window only
+    resamples a little more than the pixels it needs.
+    """
+
+    def __init__(self, image):
+        self.levels = [image]
+        while min(image.size) // 2 >= MIN_LEVEL_SIZE:
+            image = image.reduce(2)
+            self.levels.append(image)
+
+    @classmethod
+    def open(cls, path):
+        from PIL import Image
+
+        with span("background.decode"), Image.open(path) as image:
+            image.load()
+            return cls(image.convert("RGB"))
+
+    def level_for(self, size):
+        width, height = size
+        for level in reversed(self.levels):
+            if level.width >= width and level.height >= height:
+                return level
+        return self.levels[0]
+
+    def render(self, size, fast=False):
+        from PIL import Image
+
+        resample = Image.BILINEAR if fast else Image.LANCZOS
+        return self.level_for(size).resize(size, resample)
+
+
+def bucket_size(width, height):
+    """Round a window size up to the cache bucket it belongs to"""
+    return (-(-max(width, 1) // SIZE_BUCKET) * SIZE_BUCKET,
+            -(-max(height, 1) // SIZE_BUCKET) * SIZE_BUCKET)
+
+
+# ------------------ DISK CACHE ------------------
+
+def source_key(path):
+    """Short hash of the image file, so an edited image never matches old variants"""
+    with open(path, "rb") as file:
+        return hashlib.blake2b(file.read(), digest_size=8).hexdigest()
+
+
+def variant_path(key, size):
+    return os.path.join(CACHE_DIR, f"{key}-{size[0]}x{size[1]}.ppm")
+
+
+def thumbnail_path(key):
+    return os.path.join(CACHE_DIR, f"{key}-thumb.ppm")
+
+
+def write_variant(path, image):
+    """Save as PPM, which Tk reads without PIL; older variants are pruned"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = path + ".tmp"
+    image.save(tmp_path, "PPM")
+    os.replace(tmp_path, path)
+
+    variants = [os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR)
+                if name.endswith(".ppm") and not name.endswith("-thumb.ppm")]
+    if len(variants) > DISK_VARIANTS:
+        variants.sort(key=os.path.getmtime)
+        for old in variants[:-DISK_VARIANTS]:
+            os.remove(old)
+
+
+# ------------------ TK RENDERER ------------------
+
+class BackgroundRenderer:
+    """Keeps a label's background image sized to its window.
+
+    Resize events are coalesced: while the window is being dragged, one
+    fast bilinear frame is drawn per batch of events, and a LANCZOS frame
+    is drawn once no resize has arrived for SETTLE_MS. Fast frames are
+    rendered per size bucket, so most drag events reuse one (the label
+    crops the few extra pixels); the settled frame is the exact window
+    size, so nothing is cut off at rest. Rendered frames are cached by
+    size and quality, least recently used first out.
+    Render times are kept so the cost per frame can be checked.
+
+    The image itself is decoded by a loader thread started from the event
+    loop; until it is ready, show() puts up the best stand-in it has.
+    """
+
+    def __init__(self, root, label, path):
+        self.root = root
+        self.label = label
+        self.path = path
+        self.pyramid = None
+        self.cache = OrderedDict()
+        self.size = None
+        self.fast_job = None
+        self.settle_job = None
+        self.frame_times = {"fast": deque(maxlen=500), "final": deque(maxlen=500)}
+        self.events = 0
+        self.placeholder = None  # What show() put up before the image loaded
+        self.loader = None
+        self.loaded = None       # (pyramid, size, frame) from the loader thread
+        self.error = None
+        try:
+            self.key = source_key(path)
+        except OSError:
+            self.key = None  # No disk cache; the loader reports the error
+
+    def on_configure(self, event):
+        # Child widgets send <Configure> through the root binding too
+        if event.widget is not self.root:
+            return
+        self.events += 1
+        size = (max(event.width, 1), max(event.height, 1))
+        if size == self.size and self.settle_job is None:
+            return
+        self.size = size
+
+        if self.fast_job is None:
+            self.fast_job = self.root.after_idle(self._draw_fast)
+        if self.settle_job is not None:
+            self.root.after_cancel(self.settle_job)
+        self.settle_job = self.root.after(SETTLE_MS, self._draw_final)
+
+    def show(self, width, height, fast=False):
+        self.size = (max(width, 1), max(height, 1))
+        if self.pyramid is not None:
+            self._draw(fast)
+            return
+        self._draw_placeholder()
+        if self.loader is None:
+            self.root.after_idle(self.load_async)
+
+    # ------------------ LOADING ------------------
+
+    def _draw_placeholder(self):
+        """A cached pre-scaled copy, else the thumbnail blown up, else a plain colour"""
+        with span("background.placeholder"):
+            photo = self.cache.get((self.size, False))
+            if photo is None:
+                photo = self._cached_photo(self.size)
+            if photo is not None:
+                self.placeholder = "variant"
+            else:
+                photo = self._thumbnail_photo(self.size)
+                self.placeholder = "thumbnail" if photo is not None else "color"
+        if photo is None:
+            self.label.config(image="", bg=PLACEHOLDER_COLOR)
+        else:
+            self.label.config(image=photo)
+        self.label.image = photo
+
+    def _cached_photo(self, size):
+        if self.key is None:
+            return None
+        try:
+            photo = tk.PhotoImage(file=variant_path(self.key, size))
+        except tk.TclError:
+            return None  # Not cached at this size yet, or unreadable
+        self._remember((size, False), photo)
+        return photo
+
+    def _thumbnail_photo(self, size):
+        if self.key is None:
+            return None
+        try:
+            thumb = tk.PhotoImage(file=thumbnail_path(self.key))
+        except tk.TclError:
+            return None
+        zoom = max(-(-size[0] // thumb.width()), -(-size[1] // thumb.height()))
+        return thumb.zoom(zoom)
+
+    def load_async(self):
+        if self.loader is None:
+            self.loader = threading.Thread(target=self._load, args=(self.size,),
+                                           name="background-loader", daemon=True)
+            self.loader.start()
+            self.root.after(POLL_MS, self._poll_loaded)
+
+    def _load(self, size):
+        """Loader thread: decode, pyramid and a final frame for the window size"""
+        cached = self.key is not None and size is not None and os.path.exists(variant_path(self.key, size))
+        try:
+            pyramid = BackgroundPyramid.open(self.path)
+            frame = pyramid.render(size) if size is not None and not cached else None
+        except Exception as e:  # OSError, or PIL failing on a corrupt image
+            self.error = e
+            return
+        if self.key is not None:
+            try:
+                if cached:
+                    os.utime(variant_path(self.key, size))  # Recently used, so pruned last
+                elif frame is not None:
+                    write_variant(variant_path(self.key, size), frame)
+                if not os.path.exists(thumbnail_path(self.key)):
+                    write_variant(thumbnail_path(self.key), pyramid.render(THUMB_SIZE))
+            except OSError:
+                pass  # The disk cache is only a speed-up
+        self.loaded = (pyramid, size, frame)  # Set last: the Tk thread treats this as "ready"
+
+    def _poll_loaded(self):
+        if self.loaded is None:
+            if self.error is None:
+                self.root.after(POLL_MS, self._poll_loaded)
+            else:
+                # Stop polling; the placeholder stays up
+                print("Background image could not be loaded:", self.error)
+            return
+
+        from PIL import ImageTk
+
+        self.pyramid, size, frame = self.loaded
+        if frame is not None and (size, False) not in self.cache:
+            self._remember((size, False), ImageTk.PhotoImage(frame))
+        if self.size is not None:
+            self._draw(fast=False)
+
+    def _draw_fast(self):
+        self.fast_job = None
+        self._draw(fast=True)
+
+    def _draw_final(self):
+        self.settle_job = None
+        self._draw(fast=False)
+
+    def _draw(self, fast):
+        if self.pyramid is None:
+            self._draw_placeholder()  # Drawn properly once the loader is done
+            return
+        start = time.perf_counter()
+        with span("background.draw_fast" if fast else "background.draw_final"):
+            photo = self._photo(bucket_size(*self.size) if fast else self.size, fast)
+        self.label.config(image=photo)
+        self.label.image = photo
+        self.frame_times["fast" if fast else "final"].append(time.perf_counter() - start)
+
+    def _photo(self, size, fast):
+        key = (size, fast)
+        photo = self.cache.get(key)
+        if photo is not None:
+            self.cache.move_to_end(key)
+            return photo
+
+        # A high quality frame is also good enough for the fast pass
+        photo = self.cache.get((size, False))
+        if photo is None:
+            from PIL import ImageTk
+
+            photo = ImageTk.PhotoImage(self.pyramid.render(size, fast))
+        self._remember(key, photo)
+        return photo
+
+    def _remember(self, key, photo):
+        """Every cache insert goes through here, so the cache never holds more than CACHE_SIZE"""
+        self.cache[key] = photo
+        self.cache.move_to_end(key)
+        while len(self.cache) > CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def stats(self):
+        """Frame count, mean and worst render time in ms for each quality"""
+        result = {"configure_events": self.events, "placeholder": self.placeholder}
+        for quality, times in self.frame_times.items():
+            if times:
+                result[quality] = {
+                    "frames": len(times),
+                    "mean_ms": round(sum(times) / len(times) * 1000, 2),
+                    "max_ms": round(max(times) * 1000, 2),
+                }
+        return result
@@ -0,0 +1,103 @@
+"""Simulation harness for the adaptive quiz: millions of synthetic answers.
+
+Makes up players with a hidden true skill on the same scale as the
+ratings, then plays adaptive quizzes through QuizEngine exactly as the
+server would. A player gets a question right at the first attempt with
+the model's own logistic chance for their true skill, and at the second
+attempt half as often. Reports answers/sec through the engine, the cost
+of picking one question, how close the ratings got to the true skills
+and how often players got their questions right (aim: TARGET_SUCCESS).
+
+Run from the repository root:
+    python benchmarks/bench_adaptive.py [answers] [players]
+"""
+import operator
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive import LEVEL_STEP, LEVELS, TARGET_SUCCESS, SkillStore, expected, level_for
+from quiz_engine import ADAPTIVE, QuizEngine
+
+DEFAULT_ANSWERS = 2_000_000
+DEFAULT_PLAYERS = 10_000
+PICKS = 1_000_000
+
+OPERATIONS = {"+": operator.add, "-": operator.sub, "×": operator.mul, "÷": operator.floordiv}
+
+
+def play_quiz(engine, rng, player, ability):
+    """Play one adaptive quiz; returns (answers given, questions right at the first attempt, questions)"""
+    reply = engine.start(ADAPTIVE, player)
+    session, question = reply["session"], reply["question"]
+    answers = first_right = questions = 0
+    attempt = 1
+    while True:
+        correct = OPERATIONS[question["operator"]](question["num1"], question["num2"])
+        chance = expected(ability, question["level"] - 1)
+        right = rng.random() < (chance if attempt == 1 else chance / 2)
+        result = engine.answer(session, correct if right else correct + 1)
+        answers += 1
+        if result["outcome"] == "retry":
+            attempt = 2
+            continue
+        first_right += right and attempt == 1
+        questions += 1
+        attempt = 1
+        if result["finished"]:
+            return answers, first_right, questions
+        question = result["question"]
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ANSWERS
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PLAYERS
+    rng = random.Random(1)
+    top = (len(LEVELS) - 1) * LEVEL_STEP
+    abilities = {f"player{i}": rng.uniform(0, top) for i in range(players)}
+    names = list(abilities)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        skills = SkillStore(os.path.join(tmp, "skills.bin"))
+        engine = QuizEngine(seed=1, skills=skills)
+        engine.start(ADAPTIVE)  # Builds the question buckets outside the timed part
+
+        answers = quizzes = 0
+        late_right = late_questions = 0
+        start = time.perf_counter()
+        while answers < total:
+            player = rng.choice(names)
+            given, right, questions = play_quiz(engine, rng, player, abilities[player])
+            answers += given
+            quizzes += 1
+            if answers > total // 2:  # Ratings have had time to settle
+                late_right += right
+                late_questions += questions
+        seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pick = engine.model.pick
+        for i in range(PICKS):
+            pick(i % top)
+        pick_us = (time.perf_counter() - start) / PICKS * 1e6
+
+        rated = [(skills.get(name), abilities[name]) for name in names]
+        errors = sorted(abs(skill - ability) for (skill, answered), ability in rated if answered)
+        level_off = sum(abs(level_for(skill) - level_for(ability)) > 1
+                        for (skill, answered), ability in rated if answered)
+        skills.close()  # Waits for the writer thread
+        file_size = os.path.getsize(skills.path)
+
+    print(f"{answers:,} answers in {quizzes:,} adaptive quizzes by {players:,} players")
+    print(f"  through QuizEngine   {answers / seconds:>10,.0f} answers/s   ({seconds:.1f} s)")
+    print(f"  picking a question   {pick_us:>10.2f} us")
+    print(f"  rating error         median {errors[len(errors) // 2]:.0f}   "
+          f"p90 {errors[int(len(errors) * 0.9)]:.0f}   (levels are {LEVEL_STEP} apart)")
+    print(f"  players served questions over a level off: {level_off / len(errors):.1%}")
+    print(f"  right at the first attempt, second half: {late_right / late_questions:.1%}"
+          f"   (target {TARGET_SUCCESS:.0%})")
+    print(f"  skill file {file_size:,} bytes ({file_size / len(errors):.0f} per player)")
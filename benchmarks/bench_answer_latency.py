@@ -0,0 +1,106 @@
+"""Cost of timing every submit, and of the answer-time report at scale.
+
+1. Plays quizzes through QuizEngine and reports answers/sec, plus what
+   the per-submit timing (clock read and three ring-buffer stores) costs
+   on its own.
+2. Copies the finished sessions into the LatencyLog, as a report would.
+3. Fills a LatencyLog with a million synthetic submits where division
+   and multiplication are slower, and times report() over all of them.
+   The slowest types it lists should be ÷ and ×.
+
+Run from the repository root:
+    python benchmarks/bench_answer_latency.py [sessions]
+"""
+import operator
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from quiz_analytics import DIFFICULTIES, OPERATORS, LatencyLog, format_report, report
+from quiz_engine import SUBMIT_SLOTS, QuizEngine
+
+DEFAULT_SESSIONS = 20_000
+SYNTHETIC = 1_000_000
+OPERATIONS = {"+": operator.add, "-": operator.sub, "×": operator.mul, "÷": operator.floordiv}
+MEDIAN_MS = {"+": 2500, "-": 3000, "×": 4500, "÷": 6500}  # Made-up typical answer times
+
+
+def play(engine, rng, sessions):
+    answers = 0
+    for _ in range(sessions):
+        reply = engine.start(rng.choice(DIFFICULTIES))
+        session, question = reply["session"], reply["question"]
+        while True:
+            correct = OPERATIONS[question["operator"]](question["num1"], question["num2"])
+            result = engine.answer(session, correct if rng.random() < 0.75 else correct + 1)
+            answers += 1
+            if result["finished"]:
+                break
+            question = result.get("question", question)
+    return answers
+
+
+def timing_cost(n=1_000_000):
+    """ns per submit for the timing statements alone"""
+    latencies = array("q", bytes(8 * SUBMIT_SLOTS))
+    questions = array("H", bytes(2 * SUBMIT_SLOTS))
+    flags = array("b", bytes(SUBMIT_SLOTS))
+    asked_at = time.perf_counter_ns()
+    clock = time.perf_counter_ns
+    start = clock()
+    for submits in range(n):
+        slot = submits & (SUBMIT_SLOTS - 1)
+        latencies[slot] = clock() - asked_at
+        questions[slot] = 3
+        flags[slot] = 1
+    return (clock() - start) / n
+
+
+def synthetic_log(rng):
+    log = LatencyLog(SYNTHETIC)
+    operator_codes = rng.integers(0, len(OPERATORS), SYNTHETIC)
+    medians = np.array([MEDIAN_MS[op] for op in OPERATORS])[operator_codes]
+    log.latency_us[:] = rng.lognormal(np.log(medians * 1000), 0.5).astype(np.int64)
+    log.operator[:] = operator_codes
+    log.difficulty[:] = rng.integers(0, len(DIFFICULTIES), SYNTHETIC)
+    log.attempt[:] = np.where(rng.random(SYNTHETIC) < 0.8, 1, 2)
+    log.correct[:] = rng.random(SYNTHETIC) < 0.75
+    log.total = SYNTHETIC
+    return log
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SESSIONS
+    engine = QuizEngine(seed=1)
+    rng = random.Random(1)
+    play(engine, rng, 100)  # Fills the question pools and buckets
+
+    start = time.perf_counter()
+    answers = play(engine, rng, sessions)
+    seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    stored = len(engine.latency)
+    drain = time.perf_counter() - start
+
+    log = synthetic_log(np.random.default_rng(1))
+    start = time.perf_counter()
+    rows = report(log.columns())
+    report_s = time.perf_counter() - start
+    start = time.perf_counter()
+    report(log.columns(), attempt=1)
+    first_s = time.perf_counter() - start
+
+    print(f"{sessions:,} sessions, {answers:,} answers through QuizEngine")
+    print(f"  {answers / seconds:,.0f} answers/s   timing per submit {timing_cost():.0f} ns")
+    print(f"  copying {stored:,} submits into the LatencyLog {drain * 1000:.0f} ms"
+          f" ({drain / stored * 1e6:.2f} us each)")
+    print(f"\nreport() over {SYNTHETIC:,} synthetic submits: {report_s * 1000:.0f} ms"
+          f" (first attempts only: {first_s * 1000:.0f} ms)")
+    print(format_report(rows[:5]))
+    assert {row["operator"] for row in rows[:4]} == {"÷"}, "÷ should be slowest everywhere"
@@ -0,0 +1,111 @@
+"""Click-to-sound latency for the joke reveal sound.
+
+"per-click reload" is what winsound.PlaySound(SND_FILENAME) does on every
+reveal: read and parse the WAV again before any audio goes out. The
+AudioPlayer rows time play() to the first PCM chunk reaching the backend
+on its worker thread, and stop() to the backend actually going quiet.
+On Windows the old winsound call itself is timed too (until it returns).
+
+Run from the repository root:
+    python benchmarks/bench_audio_latency.py [clicks]
+"""
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise-2 Alexa Jokes"))
+
+from audio_player import AudioPlayer, FileSinkBackend, NullBackend, choose_backend
+
+WAV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                   "Exercise-2 Alexa Jokes", "cat_laughing_meme_sound_effect.wav")
+DEFAULT_CLICKS = 200
+
+
+class TimedBackend:
+    """Wraps a backend to record when each play() actually finishes"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.name = backend.name
+        self.finished = threading.Event()
+
+    def play(self, sound, cancel, started):
+        self.finished.clear()
+        self.backend.play(sound, cancel, started)
+        self.finished.set()
+
+    def interrupt(self):
+        self.backend.interrupt()
+
+
+def per_click_reload(clicks):
+    sink = io.BytesIO()
+    times = []
+    for _ in range(clicks):
+        start = time.perf_counter()
+        with wave.open(WAV) as reader:
+            params = reader.getparams()
+            frames = reader.readframes(reader.getnframes())
+        chunk = params.framerate // 50 * params.nchannels * params.sampwidth
+        sink.write(frames[:chunk])
+        times.append(time.perf_counter() - start)
+        sink.seek(0)
+    return times
+
+
+def player_latency(backend, clicks):
+    timed = TimedBackend(backend)
+    player = AudioPlayer(WAV, timed)
+    player.latencies = []  # Keep every click, not just the last 100
+    stops = []
+    for click in range(clicks):
+        player.play()
+        while len(player.latencies) <= click:
+            time.sleep(0.0005)
+        time.sleep(0.005)  # Let it play a little before cutting it off
+        start = time.perf_counter()
+        player.stop()
+        timed.finished.wait()
+        stops.append(time.perf_counter() - start)
+    player.close()
+    return list(player.latencies), stops
+
+
+def winsound_call(clicks):
+    import winsound
+    times = []
+    for _ in range(clicks):
+        start = time.perf_counter()
+        winsound.PlaySound(WAV, winsound.SND_FILENAME | winsound.SND_ASYNC)
+        times.append(time.perf_counter() - start)
+        winsound.PlaySound(None, winsound.SND_PURGE)
+    return times
+
+
+def report(label, times):
+    ms = sorted(t * 1000 for t in times)
+    print(f"  {label:<28} median {ms[len(ms) // 2]:>7.3f} ms   max {ms[-1]:>7.3f} ms")
+
+
+if __name__ == "__main__":
+    clicks = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CLICKS
+    print(f"{clicks} reveals of {os.path.basename(WAV)}")
+    report("per-click reload", per_click_reload(clicks))
+    if sys.platform == "win32":
+        report("winsound SND_FILENAME call", winsound_call(clicks))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = [NullBackend(), FileSinkBackend(os.path.join(tmp, "out.wav"), realtime=True)]
+        device = choose_backend()
+        if device.name not in ("null", "file"):
+            backends.append(device)
+        for backend in backends:
+            starts, stops = player_latency(backend, clicks)
+            report(f"AudioPlayer[{backend.name}] play", starts)
+            report(f"AudioPlayer[{backend.name}] stop", stops)
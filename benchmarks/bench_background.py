@@ -0,0 +1,70 @@
+"""Cost of a simulated window drag: old per-event LANCZOS resize vs the background renderer.
+
+Only the PIL work is timed (PhotoImage creation needs a display). The new
+path draws one fast frame per size bucket reached during the drag, then a
+single LANCZOS frame at the exact window size once the drag settles.
+
+Run from the repository root:
+    python benchmarks/bench_background.py
+"""
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image
+
+from background import BackgroundPyramid, bucket_size
+
+EVENTS = 60
+
+
+def drag_sizes(start=(800, 600), end=(1400, 1000), steps=EVENTS):
+    return [(start[0] + (end[0] - start[0]) * i // steps,
+             start[1] + (end[1] - start[1]) * i // steps) for i in range(1, steps + 1)]
+
+
+def old_path(original, sizes):
+    times = []
+    for size in sizes:
+        start = time.perf_counter()
+        original.resize(size, Image.LANCZOS)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def new_path(pyramid, sizes):
+    times = []
+    drawn = set()
+    for size in sizes:
+        bucket = bucket_size(*size)
+        if bucket in drawn:
+            continue
+        drawn.add(bucket)
+        start = time.perf_counter()
+        pyramid.render(bucket, fast=True)
+        times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    pyramid.render(sizes[-1])
+    times.append(time.perf_counter() - start)
+    return times
+
+
+def describe(name, times):
+    total = sum(times) * 1000
+    worst = max(times) * 1000
+    print(f"  {name:<9} {len(times):>3} frames  total {total:>8.1f} ms  worst frame {worst:>6.1f} ms")
+
+
+if __name__ == "__main__":
+    original = Image.open(os.path.join(ROOT, "chalkboard.png"))
+    original.load()
+    pyramid = BackgroundPyramid.open(os.path.join(ROOT, "chalkboard.png"))
+    sizes = drag_sizes()
+
+    print(f"Drag with {EVENTS} <Configure> events, 800x600 -> 1400x1000")
+    describe("old", old_path(original, sizes))
+    describe("renderer", new_path(pyramid, sizes))
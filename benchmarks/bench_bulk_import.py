@@ -0,0 +1,76 @@
+"""Bulk import of many cohort files: sequential parsing against the process pool.
+
+parse_files() only starts a pool when there is more than one CPU, so the
+"4 workers" row forces one to show what it costs or saves on this machine.
+
+Writes cohort files where a few ids reappear from the previous file with
+other marks (conflicts) and a few exam marks are out of range, imports
+them into an empty roster each way and checks every way gives the same
+report.
+
+Run from the repository root:
+    python benchmarks/bench_bulk_import.py [files] [rows per file]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise 3-Student Data"))
+
+from student_import import merge_results, parse_file, parse_files
+from student_store import StudentStore
+
+DEFAULT_FILES = 40
+DEFAULT_ROWS = 25_000
+
+
+def write_cohorts(folder, files, rows, seed=1):
+    rng = random.Random(seed)
+    paths = []
+    for f in range(files):
+        path = os.path.join(folder, f"cohort{f:03}.txt")
+        with open(path, "w") as file:
+            file.write(f"{rows}\n")
+            for r in range(rows):
+                sid = f * rows + r + 1
+                marks = [rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 100)]
+                if r % 1000 == 1 and f:
+                    sid -= rows  # Same id as a student in the previous file
+                if r % 5000 == 7:
+                    marks[3] = 140  # Out of range
+                file.write(f"{sid},Student {sid},{marks[0]},{marks[1]},{marks[2]},{marks[3]}\n")
+        paths.append(path)
+    return paths
+
+
+def timed_import(results_fn):
+    students = StudentStore()
+    start = time.perf_counter()
+    results = list(results_fn())
+    parsed = time.perf_counter()
+    report = merge_results(students, results)
+    merged = time.perf_counter()
+    return parsed - start, merged - parsed, report
+
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FILES
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ROWS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_cohorts(tmp, files, rows)
+        print(f"{files} files x {rows:,} rows, {os.cpu_count()} CPUs")
+        outcomes = []
+        for label, results_fn in (("sequential", lambda: map(parse_file, paths)),
+                                  ("parse_files", lambda: parse_files(paths)),
+                                  ("4 workers", lambda: parse_files(paths, jobs=4))):
+            parse_s, merge_s, report = timed_import(results_fn)
+            outcomes.append((report.added, report.conflicts, report.bad_rows))
+            print(f"  {label:<13} parse {parse_s:>6.2f} s   merge {merge_s:>5.2f} s"
+                  f"   total {parse_s + merge_s:>6.2f} s")
+        assert all(outcome == outcomes[0] for outcome in outcomes)
+        print(f"  added {len(report.added):,}, identical {report.identical:,}, "
+              f"conflicts {len(report.conflicts):,}, invalid rows {len(report.bad_rows):,}")
@@ -0,0 +1,77 @@
+"""What the instrument.py hooks cost per call, with profiling off and on.
+
+APP_PROFILE is read once at import, so each setting runs in its own child
+process. Each child times a trivial function called bare, inside span(),
+through timed() and next to count(), and prints the extra nanoseconds
+each hook adds per call.
+
+Run from the repository root:
+    python benchmarks/bench_instrument.py [calls]
+"""
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_CALLS = 1_000_000
+
+
+def work(x):
+    return x + 1
+
+
+def per_call_ns(loop, calls):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter_ns()
+        loop(calls)
+        best = min(best, time.perf_counter_ns() - start)
+    return best / calls
+
+
+def measure(calls):
+    import instrument
+    from instrument import count, span, timed
+
+    wrapped = timed("bench.timed")(work)
+
+    def bare(n):
+        for i in range(n):
+            work(i)
+
+    def with_span(n):
+        for i in range(n):
+            with span("bench.span"):
+                work(i)
+
+    def with_timed(n):
+        for i in range(n):
+            wrapped(i)
+
+    def with_count(n):
+        for i in range(n):
+            work(i)
+            count("bench.count")
+
+    base = per_call_ns(bare, calls)
+    state = "on " if instrument.ENABLED else "off"
+    print(f"  profiling {state}  bare call {base:6.0f} ns", end="")
+    for label, loop in (("span", with_span), ("timed", with_timed), ("count", with_count)):
+        print(f"   {label} +{per_call_ns(loop, calls) - base:5.0f} ns", end="")
+    print()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        measure(int(sys.argv[2]))
+        sys.exit()
+
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CALLS
+    print(f"{calls:,} calls, best of 3")
+    for setting in ("", os.devnull):  # Off, then on with the export thrown away
+        env = dict(os.environ, APP_PROFILE=setting)
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--child", str(calls)],
+                       env=env, check=True)
@@ -0,0 +1,93 @@
+"""Joke corpus startup time and memory as the corpus grows.
+
+For each size, three subprocesses load a synthetic corpus and read 1000
+random jokes: the old way (every line in a Python list), JokeCorpus on
+first use (builds the index) and JokeCorpus afterwards (reuses it).
+Peak RSS includes mapped file pages the kernel maps around each read;
+"private" is memory the process itself owns (Linux only).
+
+Run from the repository root:
+    python benchmarks/bench_joke_corpus.py
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise-2 Alexa Jokes"))
+
+SIZES = [10_000, 1_000_000, 5_000_000]
+READS = 1000
+
+
+def write_corpus(path, n):
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(n):
+            file.write(f"Why did joke number {i} cross the road?To get to line {i + 1}.\n")
+
+
+def old_load(path):
+    with open(path, encoding="utf-8") as file:
+        jokes = [line.rstrip("\n") for line in file]
+    return jokes, len(jokes)
+
+
+def corpus_load(path):
+    from joke_corpus import JokeCorpus
+    jokes = JokeCorpus(path)
+    return jokes, len(jokes)
+
+
+def anon_kb():
+    """Private (non file-backed) memory in kB; mapped corpus pages are not counted"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return -1
+
+
+def child(mode, path, cache_dir):
+    import joke_corpus
+    joke_corpus.CACHE_DIR = cache_dir
+
+    start = time.perf_counter()
+    jokes, count = (old_load if mode == "list" else corpus_load)(path)
+    startup = time.perf_counter() - start
+
+    rng = random.Random(1)
+    for _ in range(READS):
+        joke = jokes[rng.randrange(count)]
+        if mode == "list":
+            joke.split('?', 1)
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(startup, peak_kb, anon_kb())
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            path = os.path.join(tmp, f"jokes{n}.txt")
+            write_corpus(path, n)
+            print(f"{n:,} jokes, {os.path.getsize(path) / 1e6:.0f} MB")
+            for label, mode in (("list", "list"), ("index build", "corpus"), ("index reuse", "corpus")):
+                out = subprocess.run([sys.executable, __file__, "--child", mode, path, tmp],
+                                     capture_output=True, text=True, check=True).stdout
+                startup, peak_kb, private_kb = out.split()
+                private = f"{int(private_kb) / 1024:>7.1f} MB" if int(private_kb) >= 0 else "      n/a"
+                print(f"  {label:<12} startup {float(startup) * 1000:>9.1f} ms"
+                      f"   peak RSS {int(peak_kb) / 1024:>7.1f} MB   private {private}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        child(*sys.argv[2:])
+    else:
+        main()
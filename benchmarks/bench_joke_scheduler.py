@@ -0,0 +1,72 @@
+"""No-repeat joke drawing at 10M jokes: JokeScheduler against a shuffled list.
+
+The shuffled list is the obvious way to tell every joke once per cycle,
+but it has to hold the whole order in memory and shuffle it up front.
+Both are checked for repeats over the first DRAWS draws.
+
+Run from the repository root:
+    python benchmarks/bench_joke_scheduler.py [jokes]
+"""
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise-2 Alexa Jokes"))
+
+from joke_scheduler import JokeScheduler
+
+DEFAULT_JOKES = 10_000_000
+DRAWS = 1_000_000
+
+
+def measure(setup, n, draws):
+    """(setup seconds, draws/sec, MB held by the drawing state)"""
+    gc.collect()  # Don't charge one run for collecting the previous run's garbage
+    start = time.perf_counter()
+    draw = setup()
+    setup_seconds = time.perf_counter() - start
+
+    seen = bytearray(n)
+    start = time.perf_counter()
+    for _ in range(draws):
+        joke = draw()
+        assert not seen[joke], "joke repeated within a cycle"
+        seen[joke] = 1
+    rate = draws / (time.perf_counter() - start)
+
+    # Memory is measured in a second, untimed pass since tracing slows everything down
+    del draw
+    tracemalloc.start()
+    draw = setup()
+    draw()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return setup_seconds, rate, held / 1e6
+
+
+def shuffled_list(n):
+    def setup():
+        order = list(range(n))
+        random.Random(1).shuffle(order)
+        return iter(order).__next__
+    return setup
+
+
+def scheduler(n):
+    def setup():
+        return JokeScheduler(n, seed=1).draw
+    return setup
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_JOKES
+    draws = min(DRAWS, n)
+    print(f"{n:,} jokes, {draws:,} draws")
+    for label, setup in (("JokeScheduler", scheduler(n)), ("shuffled list", shuffled_list(n))):
+        setup_seconds, rate, held_mb = measure(setup, n, draws)
+        print(f"  {label:<14} setup {setup_seconds * 1000:>8.1f} ms   {rate:>11,.0f} draws/s"
+              f"   holds {held_mb:>8.2f} MB")
@@ -0,0 +1,104 @@
+"""Time to an interactive MathQuiz menu: the old eager startup against the deferred one.
+
+The old startup imported PIL and NumPy, built the quiz engine and decoded
+and LANCZOS-resized chalkboard.png before the menu could take a click.
+The new one only hashes the image and puts up a stand-in from the disk
+cache; the image and the engine load after the menu is up. The time
+until both have finished in the background is shown too.
+
+Each run is a fresh process so imports are really paid. PhotoImage
+creation needs a display, so Tk's own work is not timed: the cached
+variant is read from disk, which is what Tk's PPM reader spends its
+time on.
+
+Run from the repository root:
+    python benchmarks/bench_mathquiz_startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 7
+SIZE = (800, 600)  # MathQuizApp's starting geometry
+
+
+def old_startup():
+    from PIL import Image, ImageTk  # noqa: F401 - imported at startup by the old app
+
+    from quiz_engine import QuizEngine
+
+    QuizEngine()
+    with Image.open(os.path.join(ROOT, "chalkboard.png")) as image:
+        image.load()
+        image.convert("RGB").resize((800, 608), Image.LANCZOS)  # First <Configure>
+
+
+def new_startup():
+    """Returns a function that finishes the background loading"""
+    import background
+    from quiz_client import connect
+
+    client = connect()
+    size = SIZE
+    key = background.source_key(os.path.join(ROOT, "chalkboard.png"))
+    try:
+        with open(background.variant_path(key, size), "rb") as file:
+            file.read()
+    except FileNotFoundError:
+        pass  # Plain colour placeholder
+
+    def finish():
+        renderer = background.BackgroundRenderer(None, None, os.path.join(ROOT, "chalkboard.png"))
+        renderer._load(size)
+        client.prepare()
+    return finish
+
+
+def child(mode, cache_dir):
+    start = time.perf_counter()
+    sys.path.insert(0, ROOT)
+    if mode == "old":
+        old_startup()
+        print(time.perf_counter() - start, 0.0)
+        return
+
+    import background
+    background.CACHE_DIR = cache_dir
+    finish = new_startup()
+    interactive = time.perf_counter() - start
+    finish()
+    print(interactive, time.perf_counter() - start)
+
+
+def run(mode, cache_dir):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode, cache_dir],
+                         capture_output=True, text=True, check=True, cwd=ROOT).stdout
+    return [float(value) for value in out.split()]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+        sys.exit()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = os.path.join(tmp, "shared")
+        run("new", shared)  # Fills the cache for the "cached" row
+        rows = []
+        for label, mode, fresh_cache in (("old (eager)", "old", False),
+                                         ("new, empty cache", "new", True),
+                                         ("new, cached", "new", False)):
+            results = [run(mode, tempfile.mkdtemp(dir=tmp) if fresh_cache else shared)
+                       for _ in range(RUNS)]
+            interactive = statistics.median(r[0] for r in results) * 1000
+            loaded = statistics.median(r[1] for r in results) * 1000
+            rows.append((label, interactive, loaded))
+
+    print(f"MathQuiz startup, median of {RUNS} fresh processes (interpreter start excluded)")
+    for label, interactive, loaded in rows:
+        background_note = f"   background load done {loaded:6.1f} ms" if loaded else ""
+        print(f"  {label:<17} menu interactive {interactive:6.1f} ms{background_note}")
@@ -0,0 +1,103 @@
+"""Search-as-you-type over student names with NameIndex.
+
+Builds a roster of realistic first/middle/last names, then "types" names
+one keystroke at a time, some spelled right and some with a typo, and
+times the search after every keystroke. The old way to find a name was
+a scan over every student, which is timed once per query for reference.
+
+Run from the repository root:
+    python benchmarks/bench_name_search.py [students]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise 3-Student Data"))
+
+from student_search import NameIndex
+
+DEFAULT_STUDENTS = 500_000
+QUERIES = 200
+BUDGET_MS = 10
+
+FIRST = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William",
+         "Elizabeth", "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah",
+         "Charles", "Karen", "Christopher", "Nancy", "Daniel", "Lisa", "Matthew", "Betty", "Anthony",
+         "Margaret", "Mark", "Sandra", "Donald", "Ashley", "Steven", "Kimberly", "Paul", "Emily",
+         "Andrew", "Donna", "Joshua", "Michelle", "Kenneth", "Dorothy", "Kevin", "Carol", "Brian",
+         "Amanda", "George", "Melissa", "Edward", "Deborah", "Joaquin", "Miguel", "Aisha", "Wei",
+         "Priya", "Olga", "Kwame", "Sofia", "Hiroshi", "Fatima"]
+LAST = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez",
+        "Martinez", "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor",
+        "Moore", "Jackson", "Martin", "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez",
+        "Clark", "Ramirez", "Lewis", "Robinson", "Walker", "Young", "Allen", "King", "Wright",
+        "Scott", "Torres", "Nguyen", "Hill", "Flores", "Green", "Adams", "Nelson", "Baker", "Hall",
+        "Rivera", "Campbell", "Mitchell", "Carter", "Roberts", "O'Brien", "Okafor", "Tanaka",
+        "Kowalski", "Haddad", "Petrov", "Mensah", "Chen", "Patel", "Fernandez"]
+
+
+def make_names(n, rng):
+    syllables = ["ka", "lo", "mi", "ren", "to", "sa", "vin", "dor", "el", "an", "ur", "bek"]
+    names = {}
+    for sid in range(1, n + 1):
+        # A made-up middle name keeps the roster from being 3600 names repeated
+        middle = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).title()
+        names[sid] = f"{rng.choice(FIRST)} {middle} {rng.choice(LAST)}"
+    return names
+
+
+def typo(name, rng):
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]  # Swap two letters
+
+
+def scan(names, query):
+    query = query.lower()
+    return [sid for sid, name in names.items() if query in name.lower()]
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS
+    rng = random.Random(1)
+    names = make_names(n, rng)
+
+    index = NameIndex()
+    start = time.perf_counter()
+    records = list(names.items())
+    for first in range(0, n, 5000):  # In loader-sized batches, as StudentManager does
+        index.add_many(records[first:first + 5000])
+    index.search("xx")  # Sorts the keys in
+    build = time.perf_counter() - start
+
+    targets = rng.sample(list(names), QUERIES)
+    keystrokes, hits = [], 0
+    for i, sid in enumerate(targets):
+        name = names[sid]
+        query = typo(name, rng) if i % 2 else name
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            found = index.search(query[:end])
+            keystrokes.append(time.perf_counter() - start)
+        # Several students can share a name, so a hit is the right name, not the right id
+        hits += any(names[found_id] == name for found_id in index.search(query, limit=20))
+
+    start = time.perf_counter()
+    for sid in targets[:20]:
+        scan(names, names[sid])
+    scan_ms = (time.perf_counter() - start) / 20 * 1000
+
+    start = time.perf_counter()
+    for sid in targets:
+        index.update(sid, names[sid] + " Jr")
+        index.remove(sid)
+        index.add(sid, names[sid])
+    edit_ms = (time.perf_counter() - start) / QUERIES * 1000
+
+    ms = sorted(t * 1000 for t in keystrokes)
+    print(f"{n:,} students: index built in {build:.1f} s, {len(index.keys):,} word keys")
+    print(f"  {len(ms):,} keystrokes   median {ms[len(ms) // 2]:.2f} ms"
+          f"   p99 {ms[int(len(ms) * 0.99)]:.2f} ms   max {ms[-1]:.2f} ms   (budget {BUDGET_MS} ms)")
+    print(f"  right name in the top 20: {hits}/{QUERIES} (half typed with a typo)")
+    print(f"  linear scan per query {scan_ms:.1f} ms   update+remove+add {edit_ms:.2f} ms")
@@ -0,0 +1,52 @@
+"""Question throughput: the old per-question random calls against batch generation.
+
+Run from the repository root:
+    python benchmarks/bench_question_bank.py [questions]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_bank import QUIZ_LENGTH, QuestionPool, generate_quizzes
+
+DEFAULT_QUESTIONS = 1_000_000
+
+
+def old_path(n):
+    """Three random calls per question, as MathQuizApp.generate_question did"""
+    questions = []
+    for _ in range(n):
+        num1 = random.randint(10, 50)
+        num2 = random.randint(10, 50)
+        operator = random.choice(['+', '-'])
+        questions.append((num1, num2, operator))
+    return questions
+
+
+def batch_path(n):
+    return generate_quizzes("Moderate", n // QUIZ_LENGTH, seed=1)
+
+
+def pool_path(n):
+    pool = QuestionPool("Moderate", quizzes=10_000, seed=1)
+    for _ in range(n // QUIZ_LENGTH):
+        pool.next_quiz()
+
+
+def rate(fn, n):
+    start = time.perf_counter()
+    fn(n)
+    return n / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_QUESTIONS
+    print(f"{n:,} questions")
+    old = rate(old_path, n)
+    print(f"  per-question random   {old:>14,.0f} questions/s")
+    for name, fn in (("generate_quizzes", batch_path), ("QuestionPool", pool_path)):
+        new = rate(fn, n)
+        print(f"  {name:<21} {new:>14,.0f} questions/s   x{new / old:,.1f}")
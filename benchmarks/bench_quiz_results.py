@@ -0,0 +1,95 @@
+"""Results log and leaderboard under load from many sessions at once.
+
+Several threads record finished quizzes as fast as they can, the way a
+busy quiz server's sessions would. Reports results/sec, how long one
+record() call takes (the part the Tk thread or a server session waits
+for), rank and top-10 query times, and how long reopening the log takes.
+
+Run from the repository root:
+    python benchmarks/bench_quiz_results.py [results] [threads] [players]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import grade_for_score
+from quiz_results import ResultsStore
+
+DEFAULT_RESULTS = 200_000
+DEFAULT_THREADS = 8
+DEFAULT_PLAYERS = 50_000
+DIFFICULTIES = ["Easy", "Moderate", "Advanced", "Adaptive"]
+QUERIES = 100_000
+
+
+def fake_quiz(rng):
+    attempts = [rng.choice((1, 1, 1, 2)) for _ in range(10)]
+    points = [10 if a == 1 else rng.choice((5, 0)) for a in attempts]
+    times_ms = [rng.randint(800, 9000) for _ in attempts]
+    return attempts, times_ms, points
+
+
+def writer(store, count, players, seed, latencies):
+    rng = random.Random(seed)
+    quizzes = [fake_quiz(rng) for _ in range(100)]
+    for i in range(count):
+        attempts, times_ms, points = quizzes[i % 100]
+        score = sum(points)
+        start = time.perf_counter()
+        store.record(f"player{rng.randrange(players)}", rng.choice(DIFFICULTIES),
+                     attempts, times_ms, points, score, grade_for_score(score))
+        latencies.append(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RESULTS
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_THREADS
+    players = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_PLAYERS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.jsonl")
+        store = ResultsStore(path)
+        latencies = [[] for _ in range(threads)]
+        workers = [threading.Thread(target=writer, args=(store, total // threads, players, n,
+                                                         latencies[n]))
+                   for n in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        recorded = time.perf_counter() - start
+        store.flush()
+        written = time.perf_counter() - start
+
+        rng = random.Random(2)
+        start = time.perf_counter()
+        for _ in range(QUERIES):
+            store.rank_of(f"player{rng.randrange(players)}", rng.choice(DIFFICULTIES))
+        rank_us = (time.perf_counter() - start) / QUERIES * 1e6
+        start = time.perf_counter()
+        for _ in range(QUERIES // 10):
+            store.top(rng.choice(DIFFICULTIES), 10)
+        top_us = (time.perf_counter() - start) / (QUERIES // 10) * 1e6
+        store.close()
+
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        reopened = ResultsStore(path)
+        replay = time.perf_counter() - start
+        assert reopened.count == store.count
+        reopened.close()
+
+    ms = sorted(t * 1000 for thread in latencies for t in thread)
+    count = len(ms)
+    print(f"{count:,} results from {threads} threads, {players:,} players")
+    print(f"  recorded {count / recorded:>10,.0f} results/s   all on disk after {written:.2f} s")
+    print(f"  record() p50 {ms[count // 2]:.3f} ms   p99 {ms[int(count * 0.99)]:.3f} ms"
+          f"   max {ms[-1]:.2f} ms")
+    print(f"  rank_of {rank_us:.2f} us   top(10) {top_us:.2f} us")
+    print(f"  log {size / 1e6:.1f} MB ({size / count:.0f} bytes per quiz), reopened in {replay:.2f} s")
@@ -0,0 +1,94 @@
+"""Load test for quiz_server.py: sessions/sec and answer latency percentiles.
+
+Starts the server in-process on a free port, then runs many simulated
+players at once. Each player opens a connection, plays a full quiz
+(getting some answers wrong on purpose) and disconnects. Results are
+recorded in a throwaway results log, as a real server would.
+
+Run from the repository root:
+    python benchmarks/bench_quiz_server.py [sessions] [concurrent players]
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quiz_engine import QuizEngine
+from quiz_results import ResultsStore
+from quiz_server import start_server
+
+DEFAULT_SESSIONS = 5000
+DEFAULT_CONCURRENCY = 400  # Client and server share this process, 2 sockets each
+
+
+async def request(reader, writer, latencies, **message):
+    start = time.perf_counter()
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    reply = json.loads(await reader.readline())
+    latencies.append(time.perf_counter() - start)
+    return reply
+
+
+async def play(port, rng, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    reply = await request(reader, writer, [], op="start", player=f"player{rng.randrange(1000)}",
+                          difficulty=rng.choice(["Easy", "Moderate", "Advanced"]))
+    session, question = reply["session"], reply["question"]
+
+    while True:
+        answer = question["num1"] + question["num2"] if question["operator"] == "+" \
+            else question["num1"] - question["num2"]
+        if rng.random() < 0.3:
+            answer += 1
+        result = await request(reader, writer, latencies, op="answer", session=session, answer=answer)
+        if result["finished"]:
+            break
+        question = result.get("question", question)
+
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(sessions, concurrency, results_path):
+    engine = QuizEngine(results=ResultsStore(results_path))
+    server = await start_server(engine, port=0)
+    port = server.sockets[0].getsockname()[1]
+    latencies = []
+    rng = random.Random(1)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def player():
+        async with limit:
+            await play(port, rng, latencies)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(player() for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+
+    server.close()
+    await server.wait_closed()
+    engine.close()
+    return elapsed, sorted(latencies)
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SESSIONS
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CONCURRENCY
+
+    with tempfile.TemporaryDirectory() as tmp:
+        elapsed, latencies = asyncio.run(run(sessions, concurrency,
+                                             os.path.join(tmp, "results.jsonl")))
+    print(f"{sessions:,} sessions, {concurrency:,} players at once, {len(latencies):,} answers")
+    print(f"  {sessions / elapsed:,.0f} sessions/s   {len(latencies) / elapsed:,.0f} answers/s")
+    print(f"  answer latency  p50 {percentile(latencies, 50) * 1000:.2f} ms"
+          f"   p99 {percentile(latencies, 99) * 1000:.2f} ms")
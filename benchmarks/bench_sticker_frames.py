@@ -0,0 +1,40 @@
+"""animated_cat.gif frame loading: full GIF decode against the pre-converted frame cache.
+
+PhotoImage creation needs a display, so only the decode work is timed.
+Run from the repository root:
+    python benchmarks/bench_sticker_frames.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Exercise-2 Alexa Jokes"))
+
+import sticker_animator
+from sticker_animator import FrameSource
+
+RUNS = 20
+
+
+def load_time(path):
+    start = time.perf_counter()
+    source = FrameSource(path)
+    source._load()
+    return time.perf_counter() - start, source.from_cache
+
+
+if __name__ == "__main__":
+    gif = os.path.join(ROOT, "animated_cat.gif")
+    with tempfile.TemporaryDirectory() as tmp:
+        sticker_animator.CACHE_DIR = tmp
+        cold, _ = load_time(gif)
+        warm = []
+        for _ in range(RUNS):
+            seconds, from_cache = load_time(gif)
+            assert from_cache
+            warm.append(seconds)
+
+    print(f"GIF decode (first launch)  {cold * 1000:>7.2f} ms")
+    print(f"frame cache (later runs)   {min(warm) * 1000:>7.2f} ms   best of {RUNS}")
@@ -0,0 +1,272 @@
+"""Event-loop lag while the student roster is saved to a slow disk.
+
+Stands in for the Tk loop with a small after()-style scheduler, since Tk
+needs a display. A 10 ms tick measures how late each callback runs, and
+"button presses" change a random student every few milliseconds. Every
+fsync sleeps SLOW_FSYNC_S and every loaded batch READ_DELAY_S, like a
+slow network home directory.
+
+Each backend runs twice: saving inline from the callback, as the app
+used to, and through the StorageWorker, polled by the same StoragePoller
+and handle_events that StudentManager uses. The worker run must keep the
+worst tick under MAX_LAG_MS, and after close() the file read back must
+match the roster in memory.
+
+Run from the repository root:
+    python benchmarks/bench_student_io.py [students]
+"""
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise 3-Student Data"))
+
+from student_backends import BinaryBackend, TextBackend
+from student_io import StoragePoller, StorageWorker
+from student_journal import apply_edits, copy_columns
+from student_loader import LoadReport, add_batch
+from student_store import StudentStore
+
+DEFAULT_STUDENTS = 100_000
+SLOW_FSYNC_S = 0.15
+READ_DELAY_S = 0.02
+TICK_MS = 10
+EDIT_EVERY_MS = 5
+EDIT_SECONDS = 2.0
+JOURNAL_THRESHOLD = 4 * 1024  # Small, so the run also rotates the journal a few times
+MAX_LAG_MS = 50
+
+real_fsync = os.fsync
+
+
+def slow_fsync(fd):
+    time.sleep(SLOW_FSYNC_S)
+    real_fsync(fd)
+
+
+class EventLoop:
+    """Just enough of Tk's after() to drive the app code without a display"""
+
+    def __init__(self):
+        self.queue = []
+        self.order = 0
+        self.lags = []
+
+    def after(self, ms, callback):
+        self.order += 1
+        heapq.heappush(self.queue, (time.perf_counter() + ms / 1000, self.order, callback))
+        return self.order
+
+    def run_until(self, done):
+        while not done():
+            due, _, callback = heapq.heappop(self.queue)
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            callback()
+
+    def tick(self):
+        due = time.perf_counter() + TICK_MS / 1000
+
+        def check():
+            self.lags.append(max(0.0, time.perf_counter() - due) * 1000)
+            self.tick()
+        self.after(TICK_MS, check)
+
+
+def make_store(n, seed=1):
+    rng = random.Random(seed)
+    students = StudentStore()
+    students.add_many((sid, f"Student {sid}", rng.randint(0, 20), rng.randint(0, 20),
+                       rng.randint(0, 20), rng.randint(0, 100))
+                      for sid in rng.sample(range(1, n * 10), n))
+    return students
+
+
+def edit(students, rng):
+    """Change one student like a button press would; returns ("put"|"delete", sid)"""
+    roll = rng.random()
+    if roll < 0.1:
+        sid = rng.randrange(10_000_000, 20_000_000)
+        if sid not in students:
+            students.add(sid, f"New {sid}", 10, 10, 10, 50)
+            return "put", sid
+    sid = students.ids[rng.randrange(len(students))]
+    if roll < 0.2:
+        students.delete(sid)
+        return "delete", sid
+    students.update(sid, exam=rng.randint(0, 100))
+    return "put", sid
+
+
+def slow_reader(make_backend):
+    def open_slowly():
+        backend = make_backend()
+        batches = backend.iter_batches
+
+        def iter_batches(report):
+            for batch in batches(report):
+                time.sleep(READ_DELAY_S)
+                yield batch
+        backend.iter_batches = iter_batches
+        return backend
+    return open_slowly
+
+
+def run_inline(make_backend):
+    """The old way: load and save from inside the callbacks"""
+    loop, rng = EventLoop(), random.Random(2)
+    students = StudentStore()
+    start = time.perf_counter()
+    backend = slow_reader(make_backend)()
+    report = LoadReport()
+    for batch in backend.iter_batches(report):
+        add_batch(students, batch, report)
+    for edits in backend.iter_edits():
+        apply_edits(students, edits)
+    backend.open(students)
+    loaded_s = time.perf_counter() - start
+
+    loop.tick()
+    stop = time.perf_counter() + EDIT_SECONDS
+    writes = [0]
+
+    def press():
+        kind, sid = edit(students, rng)
+        if kind == "put":
+            backend.put(students, sid)
+        else:
+            backend.delete(students, sid)
+        writes[0] += 1
+        if time.perf_counter() < stop:
+            loop.after(EDIT_EVERY_MS, press)
+    loop.after(EDIT_EVERY_MS, press)
+    loop.run_until(lambda: time.perf_counter() > stop)
+    backend.close()
+    return loaded_s, loop.lags, writes[0], writes[0]
+
+
+class BenchApp:
+    """The roster side of StudentManager, without Tk: what handle_events calls back"""
+
+    def __init__(self, io):
+        self.io = io
+        self.students = StudentStore()
+        self.report = LoadReport()
+        self.start = time.perf_counter()
+        self.loading = True
+        self.loaded_s = None
+        self.saves = 0
+        self.errors = []
+
+    def add_loaded_batch(self, batch):
+        add_batch(self.students, batch, self.report)
+
+    def apply_loaded_edits(self, edits):
+        apply_edits(self.students, edits)
+
+    def finish_loading(self, error):
+        if error is not None:
+            self.errors.append(str(error))
+
+    def finish_opening(self, error):
+        self.loading = False
+        self.loaded_s = time.perf_counter() - self.start
+        if error is not None:
+            self.errors.append(str(error))
+        journal = getattr(self.io.storage, "journal", None)
+        if journal is not None:
+            journal.threshold = JOURNAL_THRESHOLD
+
+    def show_saving(self, changes):
+        pass
+
+    def show_saved(self, changes, seconds):
+        self.saves += 1
+
+    def show_storage_error(self, message):
+        self.errors.append(message)
+
+
+def run_worker(make_backend):
+    """The StorageWorker way, with the StoragePoller and handle_events the app runs"""
+    loop, rng = EventLoop(), random.Random(2)
+    io = StorageWorker(slow_reader(make_backend))
+    app = BenchApp(io)
+    poller = StoragePoller(io, app, loop.after)
+    students = app.students
+
+    io.load(app.report)
+    poller.watch()
+    loop.tick()
+    loop.run_until(lambda: not app.loading)
+
+    stop = time.perf_counter() + EDIT_SECONDS
+    edits = [0]
+
+    def press():
+        kind, sid = edit(students, rng)
+        if kind == "put":
+            io.put(students.get(sid))
+        else:
+            io.delete(sid)
+        edits[0] += 1
+        poller.watch()
+        if time.perf_counter() < stop:
+            loop.after(EDIT_EVERY_MS, press)
+    loop.after(EDIT_EVERY_MS, press)
+    loop.run_until(lambda: time.perf_counter() > stop and not io.busy())
+    io.close(copy_columns(students))
+    errors = app.errors + [event[1] for event in iter(io.poll, None) if event[0] == "error"]
+    assert not errors, errors
+    return app.loaded_s, loop.lags, edits[0], app.saves, students
+
+
+def same_roster(a, b):
+    return sorted(zip(*a.columns())) == sorted(zip(*b.columns()))
+
+
+def summary(label, loaded_s, lags, edits, writes):
+    lags = sorted(lags)
+    print(f"  {label:<8} loaded in {loaded_s:5.2f} s   lag p50 {lags[len(lags) // 2]:6.1f} ms"
+          f"   p99 {lags[int(len(lags) * 0.99)]:6.1f} ms   max {lags[-1]:6.1f} ms"
+          f"   {edits:>4} edits in {writes:>4} writes")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS
+    roster = make_store(n)
+    os.fsync = slow_fsync
+    print(f"{n:,} students, fsync {SLOW_FSYNC_S * 1000:.0f} ms, "
+          f"{READ_DELAY_S * 1000:.0f} ms per loaded batch, an edit every {EDIT_EVERY_MS} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kinds = {
+            "journal": lambda path: TextBackend(path, defer_snapshots=True),
+            "rewrite": lambda path: TextBackend(path, journal=False, defer_snapshots=True),
+            "binary": BinaryBackend,
+        }
+        for kind, make in kinds.items():
+            path = os.path.join(tmp, f"{kind}.{'bin' if kind == 'binary' else 'txt'}")
+            os.fsync = real_fsync
+            make(path).save(roster)
+            os.fsync = slow_fsync
+            print(kind)
+            if kind != "rewrite":  # Inline rewrites of the whole file on every edit take minutes
+                inline_path = path + ".inline"
+                os.fsync = real_fsync
+                make(inline_path).save(roster)
+                os.fsync = slow_fsync
+                summary("inline", *run_inline(lambda: make(inline_path)))
+
+            loaded_s, lags, edits, saves, students = run_worker(lambda: make(path))
+            summary("worker", loaded_s, lags, edits, saves)
+            os.fsync = real_fsync
+            assert same_roster(make(path).load(), students), "saved roster differs from memory"
+            os.fsync = slow_fsync
+            assert max(lags) < MAX_LAG_MS, f"worst tick {max(lags):.0f} ms"
+    print("saved rosters match memory; worker lag stayed under", MAX_LAG_MS, "ms")
@@ -0,0 +1,104 @@
+"""Peak memory and rows/sec of the streaming loader against the old readlines() loader.
+
+Each loader runs in its own subprocess so peak RSS is measured separately.
+Run from the repository root:
+    python benchmarks/bench_student_loader.py [rows]
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+EXERCISE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "Exercise 3-Student Data")
+sys.path.insert(0, EXERCISE_DIR)
+
+DEFAULT_ROWS = 1_000_000
+
+
+def write_marks_file(path, n, seed=1):
+    rng = random.Random(seed)
+    with open(path, "w") as file:
+        file.write(f"{n}\n")
+        for sid in range(1, n + 1):
+            file.write(f"{sid},Student {sid},{rng.randint(0, 20)},{rng.randint(0, 20)},"
+                       f"{rng.randint(0, 20)},{rng.randint(0, 100)}\n")
+
+
+# ------------------ LOADERS ------------------
+
+def old_loader(path):
+    students = []
+    with open(path, "r") as file:
+        lines = [line.strip() for line in file.readlines() if line.strip()]
+        for line in lines[1:]:
+            parts = line.split(",")
+            if len(parts) != 6:
+                continue
+            try:
+                sid = int(parts[0])
+                c1, c2, c3 = map(int, parts[2:5])
+                exam = int(parts[5])
+            except:
+                continue
+            students.append({"id": sid, "name": parts[1], "cw": c1 + c2 + c3, "exam": exam})
+    return len(students)
+
+
+def streaming_loader(path):
+    from student_loader import LoadReport, add_batch, iter_student_batches
+    from student_store import StudentStore
+
+    students = StudentStore()
+    report = LoadReport()
+    for batch in iter_student_batches(path, report=report):
+        add_batch(students, batch, report)
+    return len(students)
+
+
+def streaming_parse_only(path):
+    from student_loader import iter_student_batches
+
+    return sum(len(records) for _, records in iter_student_batches(path))
+
+
+LOADERS = {
+    "readlines": old_loader,
+    "streaming": streaming_loader,
+    "parse-only": streaming_parse_only,
+}
+
+
+# ------------------ DRIVER ------------------
+
+def child(name, path):
+    start = time.perf_counter()
+    rows = LOADERS[name](path)
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{rows} {elapsed} {peak_kb}")
+
+
+def main(n):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "marks.txt")
+        write_marks_file(path, n)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"{n:,} rows, {size_mb:.1f} MB file")
+
+        for name in LOADERS:
+            out = subprocess.run([sys.executable, __file__, "--child", name, path],
+                                 capture_output=True, text=True, check=True).stdout
+            rows, elapsed, peak_kb = out.split()
+            print(f"  {name:<10} {int(rows) / float(elapsed):>12,.0f} rows/s"
+                  f"   peak RSS {int(peak_kb) / 1024:>8.1f} MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS)
@@ -0,0 +1,82 @@
+"""Whole-cohort statistics: per-student Python loops against student_stats.
+
+Run from the repository root:
+    python benchmarks/bench_student_stats.py [students]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise 3-Student Data"))
+
+from student_stats import sort_order, summarize
+from student_store import StudentStore
+
+DEFAULT_STUDENTS = 1_000_000
+
+
+def make_store(n, seed=1):
+    rng = random.Random(seed)
+    store = StudentStore()
+    store.add_many((sid, f"Student {sid}", rng.randint(0, 20), rng.randint(0, 20),
+                    rng.randint(0, 20), rng.randint(0, 100)) for sid in range(n))
+    return store
+
+
+# ------------------ OLD PER-STUDENT PATH ------------------
+
+def calculate_percentage(cw, exam):
+    return round((cw + exam) / 160 * 100, 2)
+
+
+def grade_from_percentage(p):
+    if p >= 70: return "A"
+    if p >= 60: return "B"
+    if p >= 50: return "C"
+    if p >= 40: return "D"
+    return "F"
+
+
+def python_loops(students):
+    rows = list(students)
+    total = 0
+    grades = []
+    for s in rows:
+        p = calculate_percentage(s["cw"], s["exam"])
+        grades.append(grade_from_percentage(p))
+        total += p
+    best = max(rows, key=lambda s: calculate_percentage(s["cw"], s["exam"]))
+    worst = min(rows, key=lambda s: calculate_percentage(s["cw"], s["exam"]))
+    rows.sort(key=lambda s: calculate_percentage(s["cw"], s["exam"]))
+    return round(total / len(rows), 2), grades, best["id"], worst["id"], rows
+
+
+def vectorized(students):
+    summary = summarize(students)
+    order = sort_order(students)
+    return summary, order
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS
+    store = make_store(n)
+
+    old_time, (avg, grades, best, worst, rows) = timed(python_loops, store)
+    new_time, (summary, order) = timed(vectorized, store)
+
+    assert abs(avg - summary["mean"]) <= 0.01
+    assert grades == summary["grades"].tolist()
+    assert best == store.ids[summary["highest"]] and worst == store.ids[summary["lowest"]]
+    assert [s["id"] for s in rows] == [store.ids[i] for i in order]
+
+    print(f"{n:,} students")
+    print(f"  python loops {old_time * 1000:>9.1f} ms")
+    print(f"  numpy        {new_time * 1000:>9.1f} ms   x{old_time / new_time:,.0f}")
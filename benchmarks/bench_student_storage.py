@@ -0,0 +1,99 @@
+"""Student storage backends with a 1M-student roster.
+
+For each backend: the one-off full save, a full load, single-student
+lookups, and single-student saves (an update, then a delete plus an add).
+Text lookups go through the loaded StudentStore because the text file
+has no index; SQLite and binary lookups read the file.
+
+Durability differs: the text journal and the binary file fsync every
+save, SQLite runs WAL with synchronous=NORMAL (synced at checkpoints).
+
+Run from the repository root:
+    python benchmarks/bench_student_storage.py [students]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise 3-Student Data"))
+
+from student_backends import BinaryBackend, SqliteBackend, TextBackend
+from student_store import StudentStore
+
+DEFAULT_STUDENTS = 1_000_000
+LOOKUPS = 2000
+EDITS = 200
+
+
+def make_store(n, seed=1):
+    rng = random.Random(seed)
+    students = StudentStore()
+    students.add_many((sid, f"Student {sid}, Jr", rng.randint(0, 20), rng.randint(0, 20),
+                       rng.randint(0, 20), rng.randint(0, 100))
+                      for sid in rng.sample(range(1, n * 10), n))
+    return students
+
+
+def median_us(times):
+    times = sorted(times)
+    return times[len(times) // 2] * 1e6, times[int(len(times) * 0.99)] * 1e6
+
+
+def run(label, backend_class, path, students, rng):
+    backend = backend_class(path)
+    start = time.perf_counter()
+    backend.save(students)
+    save_s = time.perf_counter() - start
+    backend.close()
+
+    backend = backend_class(path)
+    start = time.perf_counter()
+    loaded = backend.load()
+    load_s = time.perf_counter() - start
+    backend.open(loaded)
+    assert len(loaded) == len(students)
+
+    ids = rng.sample(list(students.ids[:100_000]), LOOKUPS)
+    times = []
+    for sid in ids:
+        start = time.perf_counter()
+        s = backend.get(sid)
+        times.append(time.perf_counter() - start)
+        assert s["id"] == sid
+    get_us = median_us(times)
+
+    updates, replaces = [], []
+    for sid in ids[:EDITS]:
+        start = time.perf_counter()
+        loaded.update(sid, exam=(loaded.get(sid)["exam"] + 1) % 101)
+        backend.put(loaded, sid)
+        updates.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        s = loaded.get(sid)
+        loaded.delete(sid)
+        backend.delete(loaded, sid)
+        loaded.add(s["id"], s["name"], s["cw1"], s["cw2"], s["cw3"], s["exam"])
+        backend.put(loaded, sid)
+        replaces.append(time.perf_counter() - start)
+    assert backend.get(ids[0])["exam"] == loaded.get(ids[0])["exam"]
+    backend.close()
+
+    print(f"  {label:<7} save {save_s:>6.2f} s   load {load_s:>6.2f} s"
+          f"   get {get_us[0]:>6.1f} us (p99 {get_us[1]:>6.1f})"
+          f"   update {median_us(updates)[0] / 1000:>6.2f} ms"
+          f"   delete+add {median_us(replaces)[0] / 1000:>6.2f} ms")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS
+    students = make_store(n)
+    print(f"{n:,} students, {LOOKUPS} lookups, {EDITS} edits (medians)")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, backend_class, name in (("text", TextBackend, "roster.txt"),
+                                           ("sqlite", SqliteBackend, "roster.db"),
+                                           ("binary", BinaryBackend, "roster.bin")):
+            run(label, backend_class, os.path.join(tmp, name), students, random.Random(2))
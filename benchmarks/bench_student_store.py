@@ -0,0 +1,83 @@
+"""Compare StudentStore lookups, deletes and updates with the old list scan.
+
+Run from the repository root:
+    python benchmarks/bench_student_store.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise 3-Student Data"))
+
+from student_store import StudentStore
+
+SIZES = [10_000, 100_000, 1_000_000]
+OPERATIONS = 200
+
+
+def make_rows(n, seed=1):
+    rng = random.Random(seed)
+    ids = rng.sample(range(1, n * 10), n)
+    return [(sid, f"Student {sid}", rng.randint(0, 20), rng.randint(0, 20),
+             rng.randint(0, 20), rng.randint(0, 100)) for sid in ids]
+
+
+# ------------------ OLD LIST-OF-DICTS PATH ------------------
+
+def list_lookup(students, sid):
+    for s in students:
+        if s["id"] == sid:
+            return s
+    return None
+
+
+def list_delete(students, sid):
+    for s in students:
+        if s["id"] == sid:
+            students.remove(s)
+            return
+
+
+def list_update(students, sid, exam):
+    for s in students:
+        if s["id"] == sid:
+            s["exam"] = exam
+            return
+
+
+# ------------------ BENCHMARK ------------------
+
+def timed(fn, keys):
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def run(n):
+    rows = make_rows(n)
+    students = [{"id": r[0], "name": r[1], "cw": r[2] + r[3] + r[4], "exam": r[5]} for r in rows]
+    store = StudentStore()
+    for r in rows:
+        store.add(*r)
+
+    keys = [r[0] for r in random.Random(2).sample(rows, OPERATIONS)]
+    results = {
+        "lookup": (timed(lambda k: list_lookup(students, k), keys),
+                   timed(store.get, keys)),
+        "update": (timed(lambda k: list_update(students, k, 50), keys),
+                   timed(lambda k: store.update(k, exam=50), keys)),
+        "delete": (timed(lambda k: list_delete(students, k), keys),
+                   timed(store.delete, keys)),
+    }
+
+    for op, (old, new) in results.items():
+        print(f"{n:>9,} rows  {op:<7} list {old:>12.2f} us/op   store {new:>8.2f} us/op"
+              f"   x{old / new:,.0f}")
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        run(size)
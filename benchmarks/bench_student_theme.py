@@ -0,0 +1,166 @@
+"""Theme toggle cost and what repeated toggles leave behind: old apply_theme against ThemeManager.
+
+The old apply_theme reconfigured every button and bound two new
+<Enter>/<Leave> lambdas on each one. Every bind() registers a new Tcl
+command that lives as long as the widget. ThemeManager gives each
+button a named ttk style once; a toggle reconfigures the styles, not
+the buttons, and hover is a style map, so nothing is ever bound.
+
+For the app's 10 buttons and for thousands of themed widgets, reports
+the time per toggle over TOGGLES toggles, then the Tcl commands
+registered and the Python memory still allocated after TOGGLES more.
+
+Uses real Tk widgets (ttk buttons for ThemeManager) when there is a
+display. Otherwise it uses a Tcl-only interpreter in which every widget
+command, and ttk::style, is an empty proc: tkinter's Python side and the
+Tcl calls are real, but nothing is drawn or restyled.
+
+Run from the repository root:
+    python benchmarks/bench_student_theme.py
+"""
+import os
+import sys
+import time
+import tkinter as tk
+import tracemalloc
+from tkinter import ttk
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "Exercise 3-Student Data"))
+
+from student_theme import THEMES, ThemeManager
+
+SIZES = (10, 500, 2000)
+TOGGLES = 100
+
+
+class HeadlessWidget(tk.Misc):
+    """A widget whose Tk commands are empty Tcl procs"""
+
+    made = 0
+
+    def __init__(self, interp):
+        HeadlessWidget.made += 1
+        self.tk = interp.tk
+        self._w = f".w{HeadlessWidget.made}"
+        self.master = None
+        self._tclCommands = None
+        self.tk.eval(f"proc {self._w} args {{}}")
+
+    def destroy(self):
+        for name in self._tclCommands or ():
+            self.tk.deletecommand(name)
+        self._tclCommands = None
+
+
+def headless_root():
+    interp = tk.Tcl()
+    interp.eval("namespace eval ttk {}")
+    for command in ("bind", "bindtags", "ttk::style", "ttk::setTheme"):
+        interp.eval(f"proc {command} args {{}}")
+    root = HeadlessWidget(interp)
+    make = lambda: HeadlessWidget(interp)
+    return root, make, make
+
+
+def display_root():
+    root = tk.Tk()
+    root.withdraw()
+    frame = tk.Frame(root)
+    return root, lambda: tk.Button(frame), lambda: ttk.Button(frame)
+
+
+class View:
+    """Colours three widgets the way ResultsView.set_colors does"""
+
+    def __init__(self, make):
+        self.frame, self.text, self.footer = make(), make(), make()
+
+    def set_colors(self, bg, fg, footer_bg):
+        self.frame.configure(bg=footer_bg)
+        self.text.configure(bg=bg, fg=fg, insertbackground=fg)
+        self.footer.configure(bg=footer_bg, fg=fg)
+
+
+class OldThemes:
+    """The old StudentManager.apply_theme, on the same widgets"""
+
+    def __init__(self, root, label, entry, buttons, view):
+        self.root, self.label, self.entry, self.buttons, self.view = root, label, entry, buttons, view
+        self.menu_frame = root
+        self.current_theme = "light"
+
+    def apply_theme(self):
+        theme = THEMES[self.current_theme]
+        self.root.configure(bg=theme["bg_main"])
+        self.menu_frame.configure(bg=theme["bg_menu"])
+        self.label.configure(bg=theme["bg_menu"], fg=theme["fg"])
+        self.entry.configure(bg=theme["text_bg"], fg=theme["fg"], insertbackground=theme["fg"])
+        self.view.set_colors(theme["text_bg"], theme["fg"], theme["bg_main"])
+        for button in self.buttons:
+            button.configure(bg=theme["button"], fg=theme["fg"],
+                             activebackground=theme["button_hover"])
+            button.bind("<Enter>", lambda e, b=button, t=theme: b.config(bg=t["button_hover"]))
+            button.bind("<Leave>", lambda e, b=button, t=theme: b.config(bg=t["button"]))
+
+    def toggle(self):
+        self.current_theme = "dark" if self.current_theme == "light" else "light"
+        self.apply_theme()
+
+
+def commands(widgets):
+    return sum(len(widget._tclCommands or ()) for widget in widgets)
+
+
+if __name__ == "__main__":
+    try:
+        root, make, make_ttk = display_root()
+        kind = "Tk"
+    except tk.TclError:
+        root, make, make_ttk = headless_root()
+        kind = "headless Tcl"
+    print(f"{TOGGLES} toggles each, {kind} widgets")
+
+    for size in SIZES:
+        def widgets(make_button):
+            label, entry, view = make(), make(), View(make)
+            buttons = [make_button() for _ in range(size)]
+            return label, entry, view, buttons
+
+        def old():
+            label, entry, view, buttons = widgets(make)
+            themes = OldThemes(root, label, entry, buttons, view)
+            themes.apply_theme()
+            return themes.toggle, buttons
+
+        def new():
+            label, entry, view, buttons = widgets(make_ttk)
+            themes = ThemeManager(root)
+            themes.register(root, "window")
+            themes.register(label, "label")
+            themes.register(entry, "entry")
+            themes.register_view(view)
+            for button in buttons:
+                themes.register(button, "button")
+            return themes.toggle, buttons
+
+        print(f"{size:,} buttons")
+        for label, setup in (("old", old), ("new", new)):
+            toggle, buttons = setup()
+            start_commands = commands(buttons)
+            start = time.perf_counter()
+            for _ in range(TOGGLES):
+                toggle()
+            per_toggle = (time.perf_counter() - start) / TOGGLES * 1e6
+
+            tracemalloc.start()  # A second round, traced, as tracing slows everything down
+            before = tracemalloc.get_traced_memory()[0]
+            for _ in range(TOGGLES):
+                toggle()
+            grown_kb = (tracemalloc.get_traced_memory()[0] - before) / 1024
+            tracemalloc.stop()
+            new_commands = commands(buttons) - start_commands
+            for button in buttons:
+                button.destroy()
+            print(f"  {label}  {per_toggle / 1000:8.2f} ms per toggle   "
+                  f"{new_commands:>9,} Tcl commands added   {grown_kb:>9,.0f} KB more Python memory")
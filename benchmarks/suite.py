@@ -0,0 +1,299 @@
+"""Benchmark suite over the hot paths of all three apps, with a saved baseline.
+
+Runs without a display. Every case is timed a few times and the best run
+is kept. Results are written as JSON and compared case by case with a
+baseline from an earlier run, so a change that makes something slower
+shows up as a regression:
+
+    python benchmarks/suite.py --save-baseline     # on the commit to compare against
+    python benchmarks/suite.py                     # after a change: prints the comparison
+    python benchmarks/suite.py --check             # same, but exits 1 on a regression
+
+--quick stops the roster sizes at 100k rows. Baselines are only
+comparable on the same machine and with the same --quick setting.
+
+Run from the repository root.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for folder in (ROOT, os.path.join(ROOT, "Exercise 3-Student Data"),
+               os.path.join(ROOT, "Exercise-2 Alexa Jokes")):
+    sys.path.insert(0, folder)
+
+import joke_corpus
+import joke_scheduler
+import sticker_animator
+from background import BackgroundPyramid
+from joke_corpus import JokeCorpus
+from joke_scheduler import JokeScheduler
+from question_bank import generate_quizzes
+from quiz_engine import QuizEngine
+from sticker_animator import FrameSource, decode_gif
+from student_core import calculate_percentage, grade_from_percentage, load_students, save_students
+from student_stats import summarize
+
+RESULTS_PATH = os.path.join(".cache", "bench_results.json")
+BASELINE_PATH = os.path.join(".cache", "bench_baseline.json")
+ROSTER_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_SIZES = (1_000, 10_000, 100_000)
+COHORT = 100_000        # Students graded one at a time in the percentage cases
+QUIZZES = 10_000        # Quizzes generated in one batch
+ANSWERS = 100_000       # Answers scored through QuizEngine
+DRAWS = 100_000         # Jokes drawn and split
+RESIZES = 20            # Background renders per case
+REPEAT = 5              # Runs per case; the best one counts
+TOLERANCE = 0.25        # Slower than baseline by more than this is a regression
+
+
+# ------------------ CASES ------------------
+# Each case runs once and returns (seconds, items processed)
+
+def write_roster(path, n, seed=1):
+    rng = random.Random(seed)
+    with open(path, "w") as file:
+        file.write(f"{n}\n")
+        for sid in range(1, n + 1):
+            file.write(f"{sid},Student {sid},{rng.randint(0, 20)},{rng.randint(0, 20)},"
+                       f"{rng.randint(0, 20)},{rng.randint(0, 100)}\n")
+
+
+def student_cases(tmp, sizes):
+    cases = {}
+    for n in sizes:
+        source = os.path.join(tmp, f"roster{n}.txt")
+        target = os.path.join(tmp, f"saved{n}.txt")
+        write_roster(source, n)
+
+        def load(source=source, n=n):
+            start = time.perf_counter()
+            load_students(source)
+            return time.perf_counter() - start, n
+
+        def save(source=source, target=target, n=n):
+            students = load_students(source)
+            start = time.perf_counter()
+            save_students(students, target)
+            return time.perf_counter() - start, n
+
+        cases[f"students.load.{n}"] = load
+        cases[f"students.save.{n}"] = save
+
+    cohort = os.path.join(tmp, "cohort.txt")
+    write_roster(cohort, COHORT)
+
+    def grade_each():
+        students = load_students(cohort)
+        start = time.perf_counter()
+        for row in range(len(students)):
+            s = students.row(row)
+            grade_from_percentage(calculate_percentage(s["cw"], s["exam"]))
+        return time.perf_counter() - start, len(students)
+
+    def grade_cohort():
+        students = load_students(cohort)
+        start = time.perf_counter()
+        summarize(students)
+        return time.perf_counter() - start, len(students)
+
+    cases["students.grade_each"] = grade_each
+    cases["students.grade_cohort"] = grade_cohort
+    return cases
+
+
+def quiz_cases():
+    def generate():
+        start = time.perf_counter()
+        batch = generate_quizzes("Moderate", QUIZZES, seed=1)
+        return time.perf_counter() - start, len(batch)
+
+    def answer():
+        engine = QuizEngine(seed=1)
+        engine.start("Easy")  # Fills the Easy pool outside the timed part
+        rng = random.Random(1)
+        start = time.perf_counter()
+        session = None
+        for _ in range(ANSWERS):
+            if session is None:
+                started = engine.start("Easy")
+                session, question = started["session"], started["question"]
+            value = question["num1"] + question["num2"] if question["operator"] == "+" \
+                else question["num1"] - question["num2"]
+            result = engine.answer(session, value if rng.random() < 0.8 else value + 1)
+            if result["finished"]:
+                session = None
+            elif "question" in result:
+                question = result["question"]
+        return time.perf_counter() - start, ANSWERS
+
+    return {"quiz.generate": generate, "quiz.answer": answer}
+
+
+def joke_cases():
+    path = os.path.join(ROOT, "Exercise-2 Alexa Jokes", "randomJokes.txt")
+
+    def draw_and_split():
+        jokes = JokeCorpus(path)
+        scheduler = JokeScheduler(len(jokes), name="suite", seed=1)
+        start = time.perf_counter()
+        for _ in range(DRAWS):
+            setup, punchline = jokes[scheduler.draw()]
+        seconds = time.perf_counter() - start
+        jokes.close()
+        return seconds, DRAWS
+
+    return {"jokes.draw_and_split": draw_and_split}
+
+
+def image_cases():
+    chalkboard = os.path.join(ROOT, "chalkboard.png")
+    gif = os.path.join(ROOT, "animated_cat.gif")
+    sizes = [(640 + 37 * i, 480 + 23 * i) for i in range(RESIZES)]
+
+    def resize(fast):
+        pyramid = BackgroundPyramid.open(chalkboard)
+        start = time.perf_counter()
+        for size in sizes:
+            pyramid.render(size, fast)
+        return time.perf_counter() - start, RESIZES
+
+    def decode():
+        start = time.perf_counter()
+        _, frames = decode_gif(gif)
+        return time.perf_counter() - start, len(frames)
+
+    def cached_frames():
+        FrameSource(gif)._load()  # Makes sure the cache exists
+        source = FrameSource(gif)
+        start = time.perf_counter()
+        source._load()
+        return time.perf_counter() - start, len(source.raw)
+
+    return {
+        "background.decode": lambda: timed_call(BackgroundPyramid.open, chalkboard),
+        "background.resize_fast": lambda: resize(True),
+        "background.resize_final": lambda: resize(False),
+        "sticker.decode_gif": decode,
+        "sticker.cached_frames": cached_frames,
+    }
+
+
+def timed_call(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start, 1
+
+
+# ------------------ RUNNING ------------------
+
+def run(cases, repeat=REPEAT, pattern=None):
+    results = {}
+    for name, case in cases.items():
+        if pattern and pattern not in name:
+            continue
+        runs = []
+        for _ in range(repeat):
+            gc.collect()  # Garbage left by the last run would otherwise be collected mid-run
+            runs.append(case())
+        seconds, items = min(runs)
+        results[name] = {"seconds": round(seconds, 6), "items": items,
+                         "per_second": round(items / seconds, 1) if seconds else None}
+        print(f"  {name:<28} {seconds * 1000:>10.2f} ms   {items:>9,} items", flush=True)
+    return results
+
+
+def machine():
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "date": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Print current against baseline time for every case; returns the regressed names"""
+    regressions = []
+    print(f"\nAgainst baseline from {baseline['machine']['date']} "
+          f"(regression = over {tolerance:.0%} slower):")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"  {name:<28} new case")
+            continue
+        ratio = result["seconds"] / before["seconds"] if before["seconds"] else 1.0
+        if ratio > 1 + tolerance:
+            verdict = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - tolerance:
+            verdict = "faster"
+        else:
+            verdict = ""
+        print(f"  {name:<28} {before['seconds'] * 1000:>10.2f} -> "
+              f"{result['seconds'] * 1000:>10.2f} ms   x{ratio:5.2f}  {verdict}")
+    return regressions
+
+
+def write_json(path, data):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the portfolio's hot paths.")
+    parser.add_argument("--quick", action="store_true", help="rosters up to 100k rows only")
+    parser.add_argument("--only", metavar="TEXT", help="run only cases whose name contains TEXT")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per case (best counts)")
+    parser.add_argument("--out", default=RESULTS_PATH, help="where to write this run's JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="slowdown allowed before a case counts as a regression")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the apps' real caches out of it
+        joke_corpus.CACHE_DIR = joke_scheduler.CACHE_DIR = sticker_animator.CACHE_DIR = tmp
+        cases = {}
+        cases.update(student_cases(tmp, QUICK_SIZES if args.quick else ROSTER_SIZES))
+        cases.update(quiz_cases())
+        cases.update(joke_cases())
+        cases.update(image_cases())
+        print(f"Benchmark suite, best of {args.repeat}")
+        results = run(cases, args.repeat, args.only)
+
+    data = {"machine": machine(), "quick": args.quick, "results": results}
+    write_json(args.out, data)
+    print(f"\nResults written to {args.out}")
+
+    if args.save_baseline:
+        write_json(args.baseline, data)
+        print(f"Saved as the baseline in {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+    if baseline.get("quick") != args.quick:
+        print("The baseline was run with a different --quick setting; not comparing.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+    return 1 if regressions and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Timing spans, counters and Tk event-loop lag for the three apps.
+
+Off unless APP_PROFILE is set:
+
+    APP_PROFILE=1                  print a summary when the app exits
+    APP_PROFILE=profile.json       write the summary as JSON
+    APP_PROFILE=run.trace.json     write a Chrome trace (chrome://tracing or Perfetto)
+
+When it is off, span() hands back one shared do-nothing object, timed()
+returns the function unchanged and count() returns straight away, so the
+hooks cost next to nothing.
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+
+SETTING = os.environ.get("APP_PROFILE", "")
+ENABLED = bool(SETTING) and SETTING != "0"
+MAX_EVENTS = 200_000    # Trace events kept; summaries keep counting past this
+MAX_SAMPLES = 10_000    # Durations kept per span name for percentiles
+LAG_INTERVAL_MS = 50    # How often the Tk lag sampler asks to be called back
+
+_start_ns = time.perf_counter_ns()
+_lock = threading.Lock()
+_events = deque(maxlen=MAX_EVENTS)                      # (name, start ns, duration ns, thread id)
+_totals = defaultdict(lambda: [0, 0, 0])                # name -> [count, total ns, max ns]
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_counters = defaultdict(int)
+
+
+# ------------------ RECORDING ------------------
+
+def record(name, start_ns, duration_ns):
+    """Add a finished span; start_ns is from time.perf_counter_ns()"""
+    with _lock:
+        _events.append((name, start_ns, duration_ns, threading.get_ident()))
+        totals = _totals[name]
+        totals[0] += 1
+        totals[1] += duration_ns
+        if duration_ns > totals[2]:
+            totals[2] = duration_ns
+        _samples[name].append(duration_ns)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """`with span("load"):` times the block"""
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def timed(name):
+    """Decorator form of span(); leaves the function untouched when profiling is off"""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, start, time.perf_counter_ns() - start)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return decorate
+
+
+def count(name, n=1):
+    if ENABLED:
+        with _lock:
+            _counters[name] += n
+
+
+# ------------------ TK LAG ------------------
+
+class LagSampler:
+    """Asks Tk for a callback every `interval_ms` and records how late it fires.
+
+    A late callback means the event loop was busy with something else,
+    which is exactly the freeze a user sees.
+    """
+
+    def __init__(self, root, interval_ms=LAG_INTERVAL_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.due = 0
+        self.job = None
+
+    def start(self):
+        self.due = time.perf_counter_ns() + self.interval_ms * 1_000_000
+        self.job = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        now = time.perf_counter_ns()
+        lag = max(0, now - self.due)
+        record("tk.lag", self.due, lag)
+        self.due = now + self.interval_ms * 1_000_000
+        self.job = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self.job is not None:
+            try:
+                self.root.after_cancel(self.job)
+            except Exception:
+                pass  # The window is already gone
+            self.job = None
+
+
+# ------------------ EXPORT ------------------
+
+def summary():
+    """Per-span count, total, mean, p50, p95 and max in ms, plus counters"""
+    with _lock:
+        spans = {}
+        for name, (calls, total, worst) in sorted(_totals.items()):
+            durations = sorted(_samples[name])
+            spans[name] = {
+                "count": calls,
+                "total_ms": round(total / 1e6, 3),
+                "mean_ms": round(total / calls / 1e6, 3),
+                "p50_ms": round(durations[len(durations) // 2] / 1e6, 3),
+                "p95_ms": round(durations[int(len(durations) * 0.95)] / 1e6, 3),
+                "max_ms": round(worst / 1e6, 3),
+            }
+        return {"spans": spans, "counters": dict(_counters)}
+
+
+def chrome_trace():
+    """Spans as Chrome trace 'complete' events, counters as one final 'C' event"""
+    pid = os.getpid()
+    with _lock:
+        events = [{"name": name, "ph": "X", "pid": pid, "tid": tid,
+                   "ts": (start - _start_ns) / 1000, "dur": duration / 1000}
+                  for name, start, duration, tid in _events]
+        now = (time.perf_counter_ns() - _start_ns) / 1000
+        events += [{"name": name, "ph": "C", "pid": pid, "ts": now, "args": {"value": value}}
+                   for name, value in _counters.items()]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export(path=None):
+    """Write the summary (or a Chrome trace for *.trace.json); print it if no path"""
+    path = path if path is not None else SETTING
+    if path == "1":
+        json.dump(summary(), sys.stderr, indent=2)
+        sys.stderr.write("\n")
+        return
+    data = chrome_trace() if path.endswith(".trace.json") else summary()
+    with open(path, "w") as file:
+        json.dump(data, file)
+
+
+def install(root=None):
+    """Start lag sampling on a Tk root and export when the process exits.
+
+    Does nothing unless APP_PROFILE is set. Safe to call more than once.
+    """
+    if not ENABLED:
+        return
+    if root is not None:
+        LagSampler(root).start()
+    if not getattr(install, "registered", False):
+        atexit.register(export)
+        install.registered = True
@@ -0,0 +1,121 @@
+"""Batch question generation for the maths quiz.
+
+Questions are generated with NumPy many at a time and stored as parallel
+arrays, so a server can keep millions of them ready for quiz sessions.
+Pass a seed to get the same quiz again.
+"""
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+QUIZ_LENGTH = 10
+
+DIFFICULTY_RANGES = {
+    "Easy": (1, 10),
+    "Moderate": (10, 50),
+    "Advanced": (1000, 9999),
+}
+
+OPERATORS = ("+", "-")
+
+Question = namedtuple("Question", ["num1", "num2", "operator", "answer"])
+
+
+# ------------------ QUESTION BATCH ------------------
+
+class QuestionBatch:
+    """Questions stored column-wise: operands, operator code and answer"""
+
+    __slots__ = ("num1", "num2", "op", "answer")
+
+    def __init__(self, num1, num2, op):
+        self.num1 = num1
+        self.num2 = num2
+        self.op = op
+        self.answer = np.where(op == 0, num1 + num2, num1 - num2)
+
+    def __len__(self):
+        return len(self.num1)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            batch = QuestionBatch.__new__(QuestionBatch)
+            batch.num1, batch.num2 = self.num1[i], self.num2[i]
+            batch.op, batch.answer = self.op[i], self.answer[i]
+            return batch
+        return Question(int(self.num1[i]), int(self.num2[i]),
+                        OPERATORS[self.op[i]], int(self.answer[i]))
+
+
+# ------------------ GENERATION ------------------
+
+def question_keys(num1, num2, op, low, high):
+    """A unique integer for every possible question in a range"""
+    span = high - low + 1
+    return ((num1 - low) * span + (num2 - low)) * len(OPERATORS) + op
+
+
+def generate_quizzes(difficulty, quizzes, length=QUIZ_LENGTH, seed=None):
+    """Generate `quizzes` quizzes back to back in one QuestionBatch.
+
+    Every block of `length` questions is one quiz with no repeated
+    question. Duplicates are redrawn in bulk until none are left, which
+    takes only a few rounds because the question space is large compared
+    to a quiz.
+    """
+    low, high = DIFFICULTY_RANGES[difficulty]
+    space = (high - low + 1) ** 2 * len(OPERATORS)
+    if length > space:
+        raise ValueError(f"{difficulty} only has {space} different questions.")
+
+    rng = np.random.default_rng(seed)
+    shape = (quizzes, length)
+    num1 = rng.integers(low, high + 1, size=shape, dtype=np.int32)
+    num2 = rng.integers(low, high + 1, size=shape, dtype=np.int32)
+    op = rng.integers(0, len(OPERATORS), size=shape, dtype=np.int8)
+
+    while True:
+        keys = question_keys(num1.astype(np.int64), num2, op, low, high)
+        order = np.argsort(keys, axis=1, kind="stable")
+        sorted_keys = np.take_along_axis(keys, order, axis=1)
+        repeated = np.zeros(shape, dtype=bool)
+        # Mark the later copy of each repeated question for a redraw
+        np.put_along_axis(repeated, order[:, 1:], sorted_keys[:, 1:] == sorted_keys[:, :-1], axis=1)
+        count = int(repeated.sum())
+        if count == 0:
+            break
+        num1[repeated] = rng.integers(low, high + 1, size=count, dtype=np.int32)
+        num2[repeated] = rng.integers(low, high + 1, size=count, dtype=np.int32)
+        op[repeated] = rng.integers(0, len(OPERATORS), size=count, dtype=np.int8)
+
+    return QuestionBatch(num1.ravel(), num2.ravel(), op.ravel())
+
+
+def generate_quiz(difficulty, length=QUIZ_LENGTH, seed=None):
+    return generate_quizzes(difficulty, 1, length, seed)
+
+
+# ------------------ QUESTION POOL ------------------
+
+class QuestionPool:
+    """Pre-generated quizzes handed out to sessions, refilled in bulk when used up"""
+
+    def __init__(self, difficulty, quizzes=10_000, length=QUIZ_LENGTH, seed=None):
+        self.difficulty = difficulty
+        self.quizzes = quizzes
+        self.length = length
+        self.rng = np.random.default_rng(seed)
+        self.lock = threading.Lock()
+        self.batch = None
+        self.next = quizzes  # Forces a fill on first use
+
+    def next_quiz(self):
+        with self.lock:
+            if self.next >= self.quizzes:
+                seed = int(self.rng.integers(2 ** 63))
+                self.batch = generate_quizzes(self.difficulty, self.quizzes, self.length, seed)
+                self.next = 0
+            start = self.next * self.length
+            self.next += 1
+            return self.batch[start:start + self.length]
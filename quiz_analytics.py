@@ -0,0 +1,148 @@
+"""Answer-time analytics for the maths quiz, computed with NumPy.
+
+Every session times each submit from the moment its question was handed
+out (see QuizSession). Finished sessions are passed to a LatencyLog,
+which only queues them; their submits are copied into preallocated
+NumPy columns when a report is asked for, so the answer path pays
+nothing extra. report() groups the submits by difficulty and operator
+and gives percentiles, a histogram and the share answered correctly,
+slowest question types first:
+
+    from quiz_analytics import report
+    for row in report(engine.latency.columns())[:3]:
+        print(row["difficulty"], row["operator"], row["p90_ms"])
+"""
+import numpy as np
+
+OPERATORS = ("+", "-", "×", "÷")
+DIFFICULTIES = ("Easy", "Moderate", "Advanced", "Adaptive")
+HISTOGRAM_EDGES_MS = (0, 1000, 2000, 3000, 5000, 8000, 13000, 21000, 34000)  # Last bin is open
+CAPACITY = 1 << 20  # Submits kept; the oldest are overwritten after this
+DRAIN_SESSIONS = 4096  # Queued sessions that get copied in without waiting for a report
+
+OPERATOR_CODES = {op: code for code, op in enumerate(OPERATORS)}
+DIFFICULTY_CODES = {difficulty: code for code, difficulty in enumerate(DIFFICULTIES)}
+
+
+# ------------------ LATENCY LOG ------------------
+
+class LatencyLog:
+    """The last CAPACITY submits from finished sessions, column-wise in a ring"""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.latency_us = np.zeros(capacity, dtype=np.int64)
+        self.difficulty = np.zeros(capacity, dtype=np.int8)
+        self.operator = np.zeros(capacity, dtype=np.int8)
+        self.attempt = np.zeros(capacity, dtype=np.int8)
+        self.correct = np.zeros(capacity, dtype=bool)
+        self.total = 0      # Submits ever stored; total % capacity is the next row
+        self.pending = []   # Sessions not copied in yet
+
+    def add(self, session):
+        """Queue a finished (or abandoned) session; O(1)"""
+        if session.submits:
+            self.pending.append(session)
+            if len(self.pending) >= DRAIN_SESSIONS:
+                self._drain()
+
+    def _drain(self):
+        pending, self.pending = self.pending, []
+        rows = []
+        for session in pending:
+            difficulty = DIFFICULTY_CODES.get(session.difficulty, -1)
+            for latency_ns, index, flag in session.iter_submits():
+                rows.append((latency_ns // 1000, difficulty,
+                             OPERATOR_CODES[session.questions[index].operator], abs(flag), flag > 0))
+        if not rows:
+            return
+        rows = rows[-self.capacity:]
+        start = self.total % self.capacity
+        positions = (start + np.arange(len(rows))) % self.capacity
+        latency, difficulty, operator, attempt, correct = zip(*rows)
+        self.latency_us[positions] = latency
+        self.difficulty[positions] = difficulty
+        self.operator[positions] = operator
+        self.attempt[positions] = attempt
+        self.correct[positions] = correct
+        self.total += len(rows)
+
+    def __len__(self):
+        self._drain()
+        return min(self.total, self.capacity)
+
+    def columns(self):
+        """The stored columns as a dict of NumPy views, in ring order"""
+        count = len(self)
+        return {"latency_us": self.latency_us[:count], "difficulty": self.difficulty[:count],
+                "operator": self.operator[:count], "attempt": self.attempt[:count],
+                "correct": self.correct[:count]}
+
+
+# ------------------ REPORTS ------------------
+
+def histogram_labels():
+    edges = [f"{edge / 1000:g}s" for edge in HISTOGRAM_EDGES_MS]
+    return [f"{low}-{high}" for low, high in zip(edges, edges[1:])] + [f"{edges[-1]}+"]
+
+
+def report(columns, attempt=None):
+    """Per (difficulty, operator) answer-time statistics, slowest p90 first.
+
+    Pass attempt=1 to only look at first attempts. Each row has "count",
+    "mean_ms", "p50_ms", "p90_ms", "p99_ms", "correct" (share right) and
+    "histogram" (counts per HISTOGRAM_EDGES_MS bin, see histogram_labels()).
+    """
+    latency_ms = columns["latency_us"] / 1000
+    difficulty = columns["difficulty"].astype(np.int64)
+    operator = columns["operator"].astype(np.int64)
+    correct = columns["correct"]
+    if attempt is not None:
+        keep = columns["attempt"] == attempt
+        latency_ms, difficulty, operator, correct = (latency_ms[keep], difficulty[keep],
+                                                     operator[keep], correct[keep])
+    if len(latency_ms) == 0:
+        return []
+
+    # One group per (difficulty, operator): sort once, then cut at the boundaries
+    group = difficulty * len(OPERATORS) + operator
+    order = np.argsort(group, kind="stable")
+    group, latency_ms, correct = group[order], latency_ms[order], correct[order]
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    ends = np.r_[starts[1:], len(group)]
+
+    n_bins = len(HISTOGRAM_EDGES_MS)
+    bins = np.searchsorted(HISTOGRAM_EDGES_MS, latency_ms, side="right") - 1
+    histograms = np.bincount(np.repeat(np.arange(len(starts)), ends - starts) * n_bins + bins,
+                             minlength=len(starts) * n_bins).reshape(len(starts), n_bins)
+
+    rows = []
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        times = latency_ms[start:end]
+        p50, p90, p99 = np.percentile(times, (50, 90, 99))
+        code = int(group[start])
+        difficulty_code = code // len(OPERATORS)
+        rows.append({
+            "difficulty": DIFFICULTIES[difficulty_code] if difficulty_code >= 0 else "Other",
+            "operator": OPERATORS[code % len(OPERATORS)],
+            "count": int(end - start),
+            "mean_ms": round(float(times.mean()), 1),
+            "p50_ms": round(float(p50), 1),
+            "p90_ms": round(float(p90), 1),
+            "p99_ms": round(float(p99), 1),
+            "correct": round(float(correct[start:end].mean()), 3),
+            "histogram": histograms[i].tolist(),
+        })
+    rows.sort(key=lambda row: -row["p90_ms"])
+    return rows
+
+
+def format_report(rows):
+    """The report as a text table"""
+    lines = [f"{'difficulty':<10} {'op':<2} {'count':>9} {'p50 ms':>8} {'p90 ms':>8} "
+             f"{'p99 ms':>8} {'right':>6}"]
+    for row in rows:
+        lines.append(f"{row['difficulty']:<10} {row['operator']:<2} {row['count']:>9,} "
+                     f"{row['p50_ms']:>8.0f} {row['p90_ms']:>8.0f} {row['p99_ms']:>8.0f} "
+                     f"{row['correct']:>6.0%}")
+    return "\n".join(lines)
@@ -0,0 +1,111 @@
+"""Ways for the Tk app to talk to the quiz engine.
+
+LocalQuizClient runs the engine in the same process; RemoteQuizClient
+talks to quiz_server.py. Both return the same dicts, so MathQuizApp does
+not care which one it has.
+"""
+import json
+import socket
+import threading
+
+
+class LocalQuizClient:
+    """Runs the engine in-process.
+
+    The engine (and NumPy with it) is only imported when first needed, so
+    the app can show its menu first; prepare() builds it ahead of time
+    and is safe to call from a background thread. Unless an engine is
+    given, finished quizzes are recorded in the default ResultsStore.
+    """
+
+    def __init__(self, engine=None):
+        self._engine = engine
+        self.lock = threading.Lock()
+        self.session = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            self.prepare()
+        return self._engine
+
+    def prepare(self):
+        with self.lock:
+            if self._engine is None:
+                from quiz_engine import QuizEngine
+                from quiz_results import ResultsStore
+
+                self._engine = QuizEngine(results=ResultsStore())
+
+    def start(self, difficulty, player=None):
+        reply = self.engine.start(difficulty, player)
+        self.session = reply["session"]
+        return reply
+
+    def answer(self, value):
+        return self.engine.answer(self.session, value)
+
+    def end(self):
+        if self.session is not None:
+            self.engine.end(self.session)
+            self.session = None
+
+    def leaderboard(self, difficulty, k=10):
+        return self.engine.leaderboard(difficulty, k)
+
+    def close(self):
+        """Write out any results still waiting"""
+        with self.lock:
+            if self._engine is not None:
+                self._engine.close()
+
+
+class RemoteQuizClient:
+    """Blocking JSON-lines client; each call is one short request on a local socket"""
+
+    def __init__(self, host, port, timeout=5):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.file = self.sock.makefile("rwb")
+        self.session = None
+
+    def prepare(self):
+        pass  # Connected already; nothing to load
+
+    def request(self, **request):
+        self.file.write(json.dumps(request).encode() + b"\n")
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("Quiz server closed the connection.")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        return reply
+
+    def start(self, difficulty, player=None):
+        reply = self.request(op="start", difficulty=difficulty, player=player)
+        self.session = reply["session"]
+        return reply
+
+    def answer(self, value):
+        return self.request(op="answer", session=self.session, answer=value)
+
+    def end(self):
+        if self.session is not None:
+            self.request(op="end", session=self.session)
+            self.session = None
+
+    def leaderboard(self, difficulty, k=10):
+        return [tuple(entry) for entry in self.request(op="leaderboard", difficulty=difficulty, k=k)["top"]]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def connect(address=None):
+    """A remote client for "host:port", or a local one when no address is given"""
+    if not address:
+        return LocalQuizClient()
+    host, port = address.rsplit(":", 1)
+    return RemoteQuizClient(host, int(port))
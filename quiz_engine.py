@@ -0,0 +1,274 @@
+"""Quiz rules without any GUI, shared by the Tk app and the quiz server.
+
+Each player gets a QuizSession; a QuizEngine keeps many of them by id.
+Scoring follows the original game: 10 points for a correct first
+attempt, 5 for a correct second attempt, then the answer is shown and
+the quiz moves on.
+
+Every submit is timed from the moment its question was handed out, into
+a small preallocated ring buffer per session; finished sessions go to
+the engine's LatencyLog for quiz_analytics reports.
+
+Sessions keep the attempts, points and answer time of every question;
+when a quiz finishes the engine hands them to its ResultsStore, if it
+has one, and adds the player's leaderboard rank to the final result.
+
+Besides the fixed difficulties there is "Adaptive": each next question
+is picked from the player's skill rating (see adaptive.py), which is
+updated after every question and saved when the quiz ends.
+"""
+import itertools
+import time
+from array import array
+
+import adaptive
+from question_bank import DIFFICULTY_RANGES, QUIZ_LENGTH, QuestionPool
+from quiz_analytics import LatencyLog, report
+
+FIRST_ATTEMPT_POINTS = 10
+SECOND_ATTEMPT_POINTS = 5
+ADAPTIVE = "Adaptive"
+SUBMIT_SLOTS = 32  # Submits timed per session (a power of two); a 10-question quiz has at most 20
+
+
+def grade_for_score(score):
+    if score >= 90: return "A+"
+    if score >= 80: return "A"
+    if score >= 70: return "B"
+    if score >= 60: return "C"
+    if score >= 50: return "D"
+    return "F"
+
+
+# ------------------ SESSION ------------------
+
+class QuizSession:
+    """One player's progress through one quiz"""
+
+    __slots__ = ("difficulty", "questions", "player", "index", "attempt", "score",
+                 "attempts", "points", "times_ms", "asked_at",
+                 "latencies", "submit_questions", "submit_flags", "submits")
+
+    def __init__(self, difficulty, questions, player=None):
+        self.difficulty = difficulty
+        self.questions = questions
+        self.player = player
+        self.index = 0
+        self.attempt = 1
+        self.score = 0
+        self.attempts = []  # Per question: attempts used, points and ms to the final answer
+        self.points = []
+        self.times_ms = []
+        # Ring buffers, one slot per submit: ns since the question was handed
+        # out, question index, and attempt number (negative when wrong)
+        self.latencies = array("q", bytes(8 * SUBMIT_SLOTS))
+        self.submit_questions = array("H", bytes(2 * SUBMIT_SLOTS))
+        self.submit_flags = array("b", bytes(SUBMIT_SLOTS))
+        self.submits = 0
+        self.asked_at = time.perf_counter_ns()
+
+    @property
+    def finished(self):
+        return self.index >= len(self.questions)
+
+    def question(self):
+        """The current question as a dict, or None once the quiz is over"""
+        if self.finished:
+            return None
+        q = self.questions[self.index]
+        return {"number": self.index + 1, "num1": q.num1, "num2": q.num2, "operator": q.operator}
+
+    def answer(self, value):
+        """Score an answer and move on; returns what happened as a dict.
+
+        "outcome" is "correct", "retry" (first wrong attempt) or "wrong"
+        (second wrong attempt, the quiz moves to the next question).
+        """
+        if self.finished:
+            raise ValueError("The quiz is already over.")
+
+        slot = self.submits & (SUBMIT_SLOTS - 1)
+        self.latencies[slot] = time.perf_counter_ns() - self.asked_at
+        self.submit_questions[slot] = self.index
+        self.submits += 1
+
+        correct_answer = self._correct_answer()
+        result = {"correct_answer": correct_answer, "points": 0}
+
+        right = abs(value - correct_answer) < 0.01
+        self.submit_flags[slot] = self.attempt if right else -self.attempt
+        if right:
+            points = FIRST_ATTEMPT_POINTS if self.attempt == 1 else SECOND_ATTEMPT_POINTS
+            self.score += points
+            result.update(outcome="correct", points=points)
+            self._advance(points)
+        elif self.attempt == 1:
+            self.attempt = 2
+            result["outcome"] = "retry"
+        else:
+            result["outcome"] = "wrong"
+            self._advance(0)
+
+        result["score"] = self.score
+        result["finished"] = self.finished
+        if self.finished:
+            result["grade"] = grade_for_score(self.score)
+        else:
+            result["question"] = self.question()
+        return result
+
+    def _correct_answer(self):
+        return int(self.questions.answer[self.index])
+
+    def iter_submits(self):
+        """Submits still in the ring, oldest first.
+
+        Each is (ns since the question was handed out, question index,
+        attempt number, negative when the answer was wrong).
+        """
+        first = max(0, self.submits - SUBMIT_SLOTS)
+        for n in range(first, self.submits):
+            slot = n & (SUBMIT_SLOTS - 1)
+            yield self.latencies[slot], self.submit_questions[slot], self.submit_flags[slot]
+
+    def _advance(self, points):
+        latency = self.latencies[(self.submits - 1) & (SUBMIT_SLOTS - 1)]
+        self.attempts.append(self.attempt)
+        self.points.append(points)
+        self.times_ms.append(latency // 1_000_000)
+        self.asked_at += latency  # The next question is handed out with this reply
+        self.index += 1
+        self.attempt = 1
+
+
+class AdaptiveSession(QuizSession):
+    """A quiz that picks each question from the player's current skill rating.
+
+    `questions` holds the questions asked so far; the next one is only
+    chosen once the last has been scored and the rating updated.
+    """
+
+    __slots__ = ("model", "skill", "answered", "length", "level", "asked")
+
+    def __init__(self, model, player=None, length=QUIZ_LENGTH):
+        super().__init__(ADAPTIVE, [], player)
+        self.model = model
+        self.skill, self.answered = model.rating(player)
+        self.length = length
+        self.asked = set()  # The questions again, for a quick "asked already?"
+        self._pick()
+
+    @property
+    def finished(self):
+        return self.index >= self.length
+
+    def question(self):
+        question = super().question()
+        if question is not None:
+            question["level"] = self.level + 1
+        return question
+
+    def _pick(self):
+        self.level, question = self.model.pick(self.skill, self.asked)
+        self.questions.append(question)
+        self.asked.add(question)
+
+    def _correct_answer(self):
+        return self.questions[self.index].answer
+
+    def _advance(self, points):
+        self.skill, self.answered = adaptive.update(self.skill, self.answered, self.level,
+                                                    points / FIRST_ATTEMPT_POINTS)
+        self.model.save(self.player, self.skill, self.answered)
+        super()._advance(points)
+        if self.finished:
+            self.model.flush()
+        else:
+            self._pick()
+
+
+# ------------------ ENGINE ------------------
+
+class QuizEngine:
+    """Creates sessions from shared question pools and looks them up by id.
+
+    Adaptive ratings are saved to `skills` (a SkillStore, created on the
+    first adaptive quiz if not given). Finished quizzes are recorded in
+    `results` (a ResultsStore) when one is given.
+    """
+
+    def __init__(self, seed=None, skills=None, results=None):
+        self.seed = seed
+        self.pools = {difficulty: QuestionPool(difficulty, seed=seed)
+                      for difficulty in DIFFICULTY_RANGES}
+        self.skills = skills
+        self.model = None  # Built on the first adaptive quiz
+        self.results = results
+        self.latency = LatencyLog()
+        self.sessions = {}
+        self.ids = itertools.count(1)
+
+    def start(self, difficulty, player=None):
+        """Start a quiz; `player` names whose rating an adaptive quiz uses and updates"""
+        if difficulty == ADAPTIVE:
+            if self.model is None:
+                store = self.skills if self.skills is not None else adaptive.SkillStore()
+                self.model = adaptive.SkillModel(store, seed=self.seed)
+            session = AdaptiveSession(self.model, player)
+        elif difficulty in self.pools:
+            session = QuizSession(difficulty, self.pools[difficulty].next_quiz(), player)
+        else:
+            raise ValueError(f"Unknown difficulty {difficulty!r}.")
+        session_id = next(self.ids)
+        self.sessions[session_id] = session
+        return {"session": session_id, "difficulty": difficulty, "question": session.question()}
+
+    def answer(self, session_id, value):
+        session = self._session(session_id)
+        result = session.answer(value)
+        if session.finished:
+            del self.sessions[session_id]
+            self.latency.add(session)
+            if self.results is not None:
+                result["rank"], result["players"] = self.results.record(
+                    session.player, session.difficulty, session.attempts, session.times_ms,
+                    session.points, session.score, result["grade"])
+        return result
+
+    def leaderboard(self, difficulty, k=10):
+        """[(player, best score)] for the k best players on a difficulty"""
+        if self.results is None:
+            return []
+        return self.results.top(difficulty, k)
+
+    def end(self, session_id):
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self.latency.add(session)
+            if isinstance(session, AdaptiveSession):
+                self.model.flush()  # Keep the ratings from the questions answered
+        return {"ended": session is not None}
+
+    def latency_report(self, attempt=None):
+        """Answer times by difficulty and operator, slowest first (see quiz_analytics.report)"""
+        return report(self.latency.columns(), attempt)
+
+    def close(self):
+        """Close the results and skill stores; a write error from either is raised after both"""
+        error = None
+        stores = [self.results, self.model.store if self.model is not None else None]
+        for store in stores:
+            if store is None:
+                continue
+            try:
+                store.close()
+            except OSError as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def _session(self, session_id):
+        try:
+            return self.sessions[session_id]
+        except KeyError:
+            raise ValueError(f"Unknown session {session_id}.") from None
@@ -0,0 +1,219 @@
+"""Finished quiz results: an append-only log plus a leaderboard per difficulty.
+
+record() only queues the result and updates the leaderboard in memory,
+so it is safe (and quick) to call from the Tk thread or from many
+server sessions at once. A writer thread appends queued results to the
+log as JSON lines, in batches, every FLUSH_SECONDS or as soon as
+FLUSH_BATCH results are waiting. Opening a store replays the log to
+rebuild the leaderboards; lines that are torn or do not hold a valid
+result are skipped and counted in bad_records.
+"""
+import json
+import os
+import threading
+import time
+from itertools import islice
+
+RESULTS_PATH = os.path.join(".cache", "quiz_results.jsonl")
+FLUSH_SECONDS = 0.5   # Longest a recorded result waits before it is written
+FLUSH_BATCH = 1000    # Results waiting that trigger an early write
+MAX_SCORE = 100       # 10 questions x 10 points
+
+
+# ------------------ LEADERBOARD ------------------
+
+class Leaderboard:
+    """Each player's best score, ranked.
+
+    Scores are small integers, so players are grouped into one bucket per
+    score and a Fenwick tree counts the players in each bucket, as the
+    student RankingIndex does. Recording a score and finding a player's
+    rank are O(log MAX_SCORE); top(k) reads buckets from the top down.
+    Players on the same score share a rank and are listed in the order
+    they reached it.
+    """
+
+    def __init__(self, max_score=MAX_SCORE):
+        self.max_score = max_score
+        self.buckets = [{} for _ in range(max_score + 1)]
+        self.tree = [0] * (max_score + 2)
+        self.best = {}
+
+    def __len__(self):
+        return len(self.best)
+
+    def add(self, player, score):
+        """Keep `score` if it beats the player's best; returns True if it did"""
+        if not isinstance(score, int) or not 0 <= score <= self.max_score:
+            raise ValueError(f"Score {score!r} is not a whole number from 0-{self.max_score}.")
+        old = self.best.get(player)
+        if old is not None:
+            if score <= old:
+                return False
+            del self.buckets[old][player]
+            self._change(old, -1)
+        self.best[player] = score
+        self.buckets[score][player] = None
+        self._change(score, 1)
+        return True
+
+    def rank_of(self, player):
+        """1 for the best player, or None for a player with no result"""
+        score = self.best.get(player)
+        if score is None:
+            return None
+        return len(self.best) - self._count_upto(score) + 1
+
+    def top(self, k):
+        """[(player, best score)] for the k best players"""
+        found = []
+        for score in range(self.max_score, -1, -1):
+            found += [(player, score) for player in islice(self.buckets[score], k - len(found))]
+            if len(found) >= k:
+                break
+        return found
+
+    def _change(self, score, delta):
+        i = score + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def _count_upto(self, score):
+        """Number of players whose best is <= `score`"""
+        i = score + 1
+        count = 0
+        while i > 0:
+            count += self.tree[i]
+            i -= i & -i
+        return count
+
+
+# ------------------ RESULTS STORE ------------------
+
+class ResultsStore:
+    """The results log and the leaderboards built from it"""
+
+    def __init__(self, path=RESULTS_PATH, flush_seconds=FLUSH_SECONDS):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)     # Tells the writer to write now
+        self.flushed = threading.Condition(self.lock)  # Tells flush() a batch is written
+        self.flush_requested = False
+        self.pending = []
+        self.boards = {}  # difficulty -> Leaderboard
+        self.count = 0
+        self.written = 0
+        self.bad_records = 0  # Log lines skipped by the replay
+        self.error = None
+        self.closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._replay()
+        self.file = open(path, "a", encoding="utf-8")
+        self.writer = threading.Thread(target=self._write_loop, name="results-writer", daemon=True)
+        self.writer.start()
+
+    def _replay(self):
+        try:
+            file = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with file:
+            for line in file:
+                try:
+                    self._rank(json.loads(line))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    self.bad_records += 1  # A line torn by a crash, or not a valid result
+                    continue
+                self.count += 1
+        self.written = self.count
+
+    def _rank(self, result):
+        player = result.get("player")
+        if player is not None:
+            board = self.boards.get(result["difficulty"])
+            if board is None:
+                board = self.boards[result["difficulty"]] = Leaderboard()
+            board.add(player, result["score"])
+
+    # ------------------ RECORDING ------------------
+
+    def record(self, player, difficulty, attempts, times_ms, points, score, grade):
+        """Queue one finished quiz; returns (rank, players on the board) for the player.
+
+        attempts, times_ms and points have one entry per question: the
+        attempts used, the milliseconds from question to final answer and
+        the points scored.
+        """
+        result = {"player": player, "difficulty": difficulty, "score": score, "grade": grade,
+                  "attempts": attempts, "times_ms": times_ms, "points": points,
+                  "finished_at": round(time.time(), 3)}
+        with self.lock:
+            if self.closed:
+                raise ValueError("The results store is closed.")
+            self._rank(result)
+            self.pending.append(result)
+            self.count += 1
+            if len(self.pending) >= FLUSH_BATCH:
+                self.wake.notify()
+            board = self.boards.get(difficulty)
+            if player is None or board is None:
+                return None, len(board) if board is not None else 0
+            return board.rank_of(player), len(board)
+
+    def top(self, difficulty, k=10):
+        with self.lock:
+            board = self.boards.get(difficulty)
+            return board.top(k) if board is not None else []
+
+    def rank_of(self, player, difficulty):
+        with self.lock:
+            board = self.boards.get(difficulty)
+            return board.rank_of(player) if board is not None else None
+
+    # ------------------ WRITING ------------------
+
+    def _write_loop(self):
+        while True:
+            with self.lock:
+                if not (self.closed or self.flush_requested or len(self.pending) >= FLUSH_BATCH):
+                    self.wake.wait(self.flush_seconds)
+                self.flush_requested = False
+                batch, self.pending = self.pending, []
+                closing = self.closed
+            if batch:
+                try:
+                    self.file.write("".join(json.dumps(result, separators=(",", ":")) + "\n"
+                                            for result in batch))
+                    self.file.flush()
+                except OSError as e:
+                    self.error = e  # Kept for close() to report; the leaderboard is unaffected
+            with self.lock:
+                self.written += len(batch)
+                self.flushed.notify_all()
+            if closing:
+                return
+
+    def flush(self):
+        """Wait until everything recorded so far has been written to the log"""
+        with self.lock:
+            target = self.count
+            self.flush_requested = True
+            self.wake.notify()
+            while self.written < target and self.writer.is_alive():
+                self.flushed.wait(self.flush_seconds)
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.wake.notify()
+        self.writer.join()
+        self.file.close()
+        if self.error is not None:
+            raise self.error
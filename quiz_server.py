@@ -0,0 +1,117 @@
+"""Serve the quiz engine to many players over a local TCP socket.
+
+The protocol is one JSON object per line in each direction:
+
+    {"op": "start", "difficulty": "Easy"}
+    {"op": "start", "difficulty": "Adaptive", "player": "ana"}
+    {"op": "answer", "session": 1, "answer": 12}
+    {"op": "end", "session": 1}
+    {"op": "leaderboard", "difficulty": "Easy", "k": 10}
+    {"op": "latency_report", "attempt": 1}
+
+Replies are the engine's result dicts, or {"error": "..."}. Finished
+quizzes are recorded in the results log, and the last answer's reply
+carries the player's leaderboard "rank".
+
+Run from the repository root:
+    python quiz_server.py [--host 127.0.0.1] [--port 8765]
+"""
+import argparse
+import asyncio
+import json
+import math
+
+from quiz_engine import QuizEngine
+from quiz_results import ResultsStore
+
+HOST = "127.0.0.1"
+PORT = 8765
+
+
+def answer_value(value):
+    """The submitted answer as a float, or a ValueError a player can read"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError("The answer must be a number.")
+    return float(value)
+
+
+def handle_request(engine, request):
+    if not isinstance(request, dict):
+        raise ValueError("Requests must be JSON objects.")
+    op = request.get("op")
+    if op == "start":
+        return engine.start(request["difficulty"], request.get("player"))
+    if op == "answer":
+        return engine.answer(request["session"], answer_value(request["answer"]))
+    if op == "end":
+        return engine.end(request["session"])
+    if op == "leaderboard":
+        return {"top": engine.leaderboard(request["difficulty"], int(request.get("k", 10)))}
+    if op == "latency_report":
+        attempt = request.get("attempt")
+        return {"rows": engine.latency_report(int(attempt) if attempt is not None else None)}
+    raise ValueError(f"Unknown op {op!r}.")
+
+
+async def serve_client(engine, reader, writer):
+    opened = set()  # Sessions this client started and has not finished or ended
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+                reply = handle_request(engine, request)
+            except KeyError as e:
+                reply = {"error": f"The request is missing {e.args[0]!r}."}
+            except (TypeError, ValueError) as e:
+                reply = {"error": str(e)}
+            else:
+                op = request["op"]
+                if op == "start":
+                    opened.add(reply["session"])
+                elif op == "end" or (op == "answer" and reply.get("finished")):
+                    opened.discard(request["session"])
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        # A client that drops mid-quiz leaves nothing behind in the engine
+        for session in opened:
+            engine.end(session)
+        writer.close()
+
+
+async def start_server(engine=None, host=HOST, port=PORT):
+    """Start listening and return the asyncio server (port 0 picks a free port)"""
+    if engine is None:
+        engine = QuizEngine(results=ResultsStore())
+    return await asyncio.start_server(
+        lambda reader, writer: serve_client(engine, reader, writer), host, port
+    )
+
+
+async def main(engine, host, port):
+    server = await start_server(engine, host, port)
+    print(f"Quiz server listening on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maths quiz server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    args = parser.parse_args()
+    engine = QuizEngine(results=ResultsStore())
+    try:
+        asyncio.run(main(engine, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        try:
+            engine.close()  # Writes out results still waiting
+        except OSError as e:
+            print("Quiz results could not be saved:", e)